@@ -0,0 +1,186 @@
+"""
+Backtest: replay a date range through the serving feature pipeline
+
+For every zone and hour with a recorded outcome between --start and --end,
+rebuilds the features the API would serve at that hour, scores them and
+compares the predictions with what happened:
+
+    occupancy     predicted count vs occupancy_count in occupancy_history_2025.csv (MAE, RMSE)
+    enforcement   ticket probability vs tickets_issued > 0 in enforcement_full_extended.csv
+                  (ROC-AUC, Brier score)
+
+Rows are scored by parking_api.score_rows_bulk, whose features have the same
+values as the per-request path but are built a zone at a time. Rows are
+sorted by zone and split into chunks of --chunk-size, and the chunks are
+scored across --workers processes that each load the models and data once
+(each chunk is one batched model call). A full year of every zone takes
+minutes rather than the hours of replaying it request by request.
+
+The history features read the same files the outcomes come from, exactly as
+the API does, so this measures the serving pipeline end to end rather than
+an out-of-sample forecast.
+
+Usage:
+    python scripts/backtest.py --start 2025-01-01 --end 2025-12-31 [--kind occupancy|enforcement|both]
+                               [--zones "Zone A" "Zone B"] [--workers 4] [--chunk-size 20000]
+                               [--output backtest.json] [--predictions predictions.csv]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+from process_backend import scorer_api, add_scorer_arguments, apply_scorer_arguments
+
+KINDS = ['occupancy', 'enforcement']
+
+def score_chunk(kind, zones, timestamps_ns):
+    """Build the features of one chunk of (zone, hour) rows and score them in one model call"""
+    return scorer_api().score_rows_bulk(kind, zones, pd.to_datetime(timestamps_ns))
+
+
+def load_actuals(kind, data_dir, start, end, zones=None):
+    """Recorded outcome per (Zone, datetime) in [start, end], sorted by zone and time"""
+    if kind == 'occupancy':
+        path, column = f'{data_dir}/processed/occupancy_history_2025.csv', 'occupancy_count'
+    else:
+        path, column = f'{data_dir}/processed/enforcement_full_extended.csv', 'tickets_issued'
+    frame = pd.read_csv(path, usecols=['Zone', 'datetime', column], parse_dates=['datetime'])
+
+    frame = frame[(frame['datetime'] >= start) & (frame['datetime'] < end)]
+    if zones:
+        frame = frame[frame['Zone'].isin(zones)]
+    frame = frame.dropna(subset=['Zone', 'datetime', column])
+
+    if kind == 'occupancy':
+        actuals = frame.groupby(['Zone', 'datetime'], sort=True)[column].mean()
+    else:
+        actuals = (frame.groupby(['Zone', 'datetime'], sort=True)[column].sum() > 0).astype(np.int64)
+    return actuals.rename('actual').reset_index()
+
+
+def score_actuals(kind, actuals, workers, chunk_size):
+    """Predictions for every row of actuals, scored in chunks across the worker processes"""
+    zones = actuals['Zone'].to_numpy(dtype=object)
+    timestamps_ns = actuals['datetime'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    chunks = [(kind, zones[start:start + chunk_size], timestamps_ns[start:start + chunk_size])
+              for start in range(0, len(actuals), chunk_size)]
+    if not chunks:
+        return np.empty(0)
+
+    if workers <= 1:
+        scorer_api()
+        return np.concatenate([score_chunk(*chunk) for chunk in chunks])
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=scorer_api) as executor:
+        return np.concatenate(list(executor.map(score_chunk, *zip(*chunks))))
+
+
+def roc_auc(actual, predicted):
+    """ROC-AUC, or None when only one class occurs"""
+    from sklearn.metrics import roc_auc_score
+    if len(np.unique(actual)) < 2:
+        return None
+    return float(roc_auc_score(actual, predicted))
+
+
+def summarize(kind, actual, predicted):
+    """Accuracy metrics of one set of rows"""
+    stats = {'rows': int(len(actual))}
+    if len(actual) == 0:
+        return stats
+    if kind == 'occupancy':
+        error = predicted - actual
+        stats.update({
+            'mae': float(np.mean(np.abs(error))),
+            'rmse': float(np.sqrt(np.mean(error ** 2))),
+            'mean_actual': float(np.mean(actual)),
+            'mean_predicted': float(np.mean(predicted))
+        })
+    else:
+        stats.update({
+            'roc_auc': roc_auc(actual, predicted),
+            'brier': float(np.mean((predicted - actual) ** 2)),
+            'ticket_rate': float(np.mean(actual)),
+            'mean_predicted': float(np.mean(predicted))
+        })
+    return stats
+
+
+def report(kind, results):
+    metric, label = ('mae', 'MAE') if kind == 'occupancy' else ('roc_auc', 'ROC-AUC')
+    print(f"\n{kind}: {results['overall']['rows']:,} rows scored in {results['seconds']:.1f}s "
+          f"({results['rows_per_second']:,.0f} rows/s)")
+    print(f"{'zone':<45} {'rows':>8} {label:>10}")
+    print("-" * 65)
+    for zone, stats in list(results['zones'].items()) + [('overall', results['overall'])]:
+        value = stats.get(metric)
+        print(f"{str(zone)[:45]:<45} {stats['rows']:>8,} {'-' if value is None else f'{value:.4f}':>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a date range through the serving features and score it')
+    parser.add_argument('--start', required=True, help='First date to replay (YYYY-MM-DD)')
+    parser.add_argument('--end', required=True, help='Last date to replay, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--kind', choices=KINDS + ['both'], default='both')
+    parser.add_argument('--zones', nargs='*', default=None, help='Zones to replay (default: every zone with outcomes)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Scoring processes')
+    parser.add_argument('--chunk-size', type=int, default=20000, help='Rows per chunk (one model call each)')
+    add_scorer_arguments(parser)
+    parser.add_argument('--output', default=None, help='Write the metrics JSON here')
+    parser.add_argument('--predictions', default=None, help='Write every scored row as CSV here')
+    args = parser.parse_args()
+
+    apply_scorer_arguments(args)
+    data_dir = os.environ.get('COUGARPARK_DATA_DIR', os.path.join(PROJECT_ROOT, 'data'))
+
+    start = pd.Timestamp(args.start).normalize()
+    end = pd.Timestamp(args.end).normalize() + pd.Timedelta(days=1)
+    kinds = KINDS if args.kind == 'both' else [args.kind]
+
+    results = {'start': str(start.date()), 'end': args.end, 'workers': args.workers, 'chunk_size': args.chunk_size}
+    scored = []
+    for kind in kinds:
+        actuals = load_actuals(kind, data_dir, start, end, args.zones)
+        print(f"Scoring {len(actuals):,} {kind} rows ({actuals['Zone'].nunique()} zones) "
+              f"with {args.workers} worker(s)...")
+        started = time.perf_counter()
+        predicted = score_actuals(kind, actuals, args.workers, max(1, args.chunk_size))
+        seconds = time.perf_counter() - started
+
+        actual = actuals['actual'].to_numpy(dtype=np.float64)
+        zones = actuals['Zone'].to_numpy(dtype=object)
+        results[kind] = {
+            'seconds': round(seconds, 2),
+            'rows_per_second': round(len(actuals) / seconds, 1) if seconds > 0 else None,
+            'overall': summarize(kind, actual, predicted),
+            'zones': {zone: summarize(kind, actual[zones == zone], predicted[zones == zone])
+                      for zone in dict.fromkeys(zones)}
+        }
+        report(kind, results[kind])
+        scored.append(actuals.assign(kind=kind, predicted=predicted))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved metrics to: {args.output}")
+    if args.predictions and scored:
+        os.makedirs(os.path.dirname(os.path.abspath(args.predictions)), exist_ok=True)
+        pd.concat(scored, ignore_index=True).to_csv(args.predictions, index=False)
+        print(f"Saved predictions to: {args.predictions}")
+
+
+if __name__ == '__main__':
+    main()
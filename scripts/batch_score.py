@@ -0,0 +1,216 @@
+"""
+Offline batch scorer: occupancy and ticket-risk forecasts for a file of visits
+
+Reads a CSV or Parquet file with one planned visit per row: 'zone' or
+'lot_number', 'datetime' and optionally 'duration_hours' (other columns, such
+as an event name, are copied to the output). The file is streamed in chunks
+of --chunk-size rows. Each chunk goes through parking_api.forecast_rows, the
+API's feature and model pipeline with every distinct zone-hour scored once,
+and is written out as soon as it is done. Up to --workers chunks are scored
+at once in separate processes that each load the models and data once, and
+at most twice that many chunks are held in memory.
+
+After every chunk written, progress is saved next to the output
+(<output>.progress.json); --resume continues an interrupted job after the
+last chunk it wrote. Parquet input and output need pyarrow; Parquet output
+is a directory with one file per chunk.
+
+Usage:
+    python scripts/batch_score.py --input visits.csv --output forecasts.csv [--workers 4]
+                                  [--chunk-size 5000] [--resume]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+from process_backend import scorer_api, add_scorer_arguments, apply_scorer_arguments
+
+def score_chunk(frame):
+    """Input rows followed by their forecast columns"""
+    frame = frame.reset_index(drop=True)
+    forecasts = scorer_api().forecast_rows(frame)
+    return pd.concat([frame.drop(columns=forecasts.columns, errors='ignore'), forecasts], axis=1)
+
+
+def is_parquet(path):
+    return path.endswith('.parquet') or path.endswith('.pq')
+
+
+def parquet_module():
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow.parquet
+
+
+def read_chunks(path, chunk_size, skip_rows):
+    """DataFrames of up to chunk_size input rows, after the first skip_rows"""
+    if is_parquet(path):
+        skipped = 0
+        for batch in parquet_module().ParquetFile(path).iter_batches(batch_size=chunk_size):
+            if skipped < skip_rows:
+                skipped += batch.num_rows
+                continue
+            yield batch.to_pandas()
+    else:
+        # Skipped lines are not parsed into rows, so resuming a large CSV is cheap
+        yield from pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1))
+
+
+class CSVOutput:
+    """Forecasts appended to one CSV file; progress records its length after each chunk"""
+
+    def __init__(self, path, resume_bytes=None):
+        self.path = path
+        if resume_bytes is None:
+            open(path, 'wb').close()
+        else:
+            # Drop anything written after the last recorded chunk
+            with open(path, 'r+b') as f:
+                f.truncate(resume_bytes)
+        self.header = resume_bytes is None or resume_bytes == 0
+
+    def write(self, frame, chunk_index):
+        with open(self.path, 'ab') as f:
+            f.write(frame.to_csv(index=False, header=self.header).encode())
+            f.flush()
+            os.fsync(f.fileno())
+            self.header = False
+            return {'output_bytes': f.tell()}
+
+
+class ParquetOutput:
+    """Forecasts as a directory of part-NNNNNN.parquet files, one per chunk"""
+
+    def __init__(self, path, resume_bytes=None):
+        self.path = path
+        self.parquet = parquet_module()
+        import pyarrow
+        self.pyarrow = pyarrow
+        if resume_bytes is None and os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, frame, chunk_index):
+        # Text columns as strings even when a chunk has none, so every part has the same schema
+        frame = frame.astype({column: 'string' for column in frame.columns if frame[column].dtype == object})
+        name = f'part-{chunk_index:06d}.parquet'
+        tmp_path = os.path.join(self.path, f'.{name}.tmp')
+        self.parquet.write_table(self.pyarrow.Table.from_pandas(frame, preserve_index=False), tmp_path)
+        os.replace(tmp_path, os.path.join(self.path, name))
+        return {}
+
+
+def input_fingerprint(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def save_progress(path, progress):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(progress, indent=2) + '\n')
+    os.replace(tmp_path, path)
+
+
+def load_resume_state(progress_path, args):
+    """Progress of the job being resumed, or None to start from the beginning"""
+    if not args.resume or not os.path.exists(progress_path):
+        if args.resume:
+            print(f"No progress file at {progress_path}, starting from the beginning")
+        return None
+    with open(progress_path) as f:
+        progress = json.load(f)
+    if progress['input'] != input_fingerprint(args.input):
+        sys.exit(f"{args.input} changed since the job started; run without --resume to start over")
+    if progress['chunk_size'] != args.chunk_size:
+        print(f"Resuming with the job's chunk size of {progress['chunk_size']} rows")
+    return progress
+
+
+def scored_chunks(chunks, workers):
+    """Scored chunks in input order, scoring up to workers at once and holding at most 2 * workers"""
+    if workers <= 1:
+        scorer_api()
+        for chunk in chunks:
+            yield score_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=scorer_api) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forecast occupancy and ticket risk for a file of planned visits')
+    parser.add_argument('--input', required=True, help='CSV or Parquet file of zone/lot_number, datetime, duration_hours')
+    parser.add_argument('--output', required=True, help='CSV file, or .parquet directory, to write forecasts to')
+    parser.add_argument('--workers', type=int, default=1, help='Scoring processes')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Input rows per chunk')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted job from its progress file')
+    add_scorer_arguments(parser)
+    args = parser.parse_args()
+    args.chunk_size = max(1, args.chunk_size)
+
+    apply_scorer_arguments(args)
+
+    output = args.output.rstrip(os.sep)
+    progress_path = f'{output}.progress.json'
+    progress = load_resume_state(progress_path, args)
+    if progress is not None and progress.get('complete'):
+        print(f"{output} is already complete ({progress['rows_done']:,} rows)")
+        return
+    if progress is None:
+        progress = {'input': input_fingerprint(args.input), 'output': os.path.abspath(output),
+                    'chunk_size': args.chunk_size, 'chunks_done': 0, 'rows_done': 0, 'errors': 0,
+                    'output_bytes': 0, 'complete': False}
+        resume_bytes = None
+    else:
+        resume_bytes = progress['output_bytes']
+        print(f"Resuming after {progress['chunks_done']} chunks ({progress['rows_done']:,} rows)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    writer = (ParquetOutput if is_parquet(output) else CSVOutput)(output, resume_bytes)
+    chunks = read_chunks(args.input, progress['chunk_size'], progress['rows_done'])
+
+    start = time.perf_counter()
+    rows_this_run = 0
+    for frame in scored_chunks(chunks, args.workers):
+        progress.update(writer.write(frame, progress['chunks_done']))
+        progress['chunks_done'] += 1
+        progress['rows_done'] += len(frame)
+        progress['errors'] += int(frame['error'].notna().sum())
+        progress['updated_at'] = pd.Timestamp.now().isoformat()
+        save_progress(progress_path, progress)
+
+        rows_this_run += len(frame)
+        elapsed = time.perf_counter() - start
+        print(f"  chunk {progress['chunks_done']}: {progress['rows_done']:,} rows written "
+              f"({rows_this_run / elapsed:,.0f} rows/s)")
+
+    progress['complete'] = True
+    save_progress(progress_path, progress)
+    print(f"Wrote {progress['rows_done']:,} forecasts to {output} in {time.perf_counter() - start:.1f}s "
+          f"({progress['errors']:,} rows with errors)")
+
+
+if __name__ == '__main__':
+    main()
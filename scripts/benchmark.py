@@ -0,0 +1,379 @@
+"""
+Offline benchmark suite for feature engineering, model scoring and endpoints
+
+Runs entirely in-process: no server is needed. Micro-benchmarks time
+FeatureEngineer.create_features, each _compute_* helper,
+create_lot_level_features and raw model predict calls at batch sizes from 1
+to 10k rows. Macro-benchmarks send requests to every endpoint through Flask's
+test client. Results are written as JSON (p50/p95/p99 latency and ops/sec)
+so runs before and after an optimization can be compared with --compare.
+
+By default the suite builds a fixture (synthetic histories + small models,
+see benchmark_fixture.py) in a temporary directory, so it works without the
+Git LFS data. Pass --repo-data to benchmark the real data and models instead.
+
+Usage:
+    python scripts/benchmark.py --output benchmarks/run.json
+    python scripts/benchmark.py --quick --compare benchmarks/run.json
+    python scripts/benchmark.py --fixture-dir /tmp/cougarpark_2k   # data from generate_synthetic_data.py
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def summarize(timings, rows_per_call=1):
+    """Latency percentiles (ms) and throughput for a list of per-call durations in seconds"""
+    timings = np.asarray(timings)
+    total = timings.sum()
+    summary = {
+        'iterations': int(len(timings)),
+        'mean_ms': round(float(timings.mean()) * 1000.0, 4),
+        'p50_ms': round(float(np.percentile(timings, 50)) * 1000.0, 4),
+        'p95_ms': round(float(np.percentile(timings, 95)) * 1000.0, 4),
+        'p99_ms': round(float(np.percentile(timings, 99)) * 1000.0, 4),
+        'max_ms': round(float(timings.max()) * 1000.0, 4),
+        'ops_per_sec': round(len(timings) / total, 2) if total > 0 else None
+    }
+    if rows_per_call > 1:
+        summary['rows_per_call'] = rows_per_call
+        summary['rows_per_sec'] = round(len(timings) * rows_per_call / total, 2) if total > 0 else None
+    return summary
+
+
+def run_benchmark(fn, args_list, iterations, warmup=3):
+    """Call fn once per iteration, cycling through args_list; returns per-call durations"""
+    for i in range(min(warmup, iterations)):
+        fn(*args_list[i % len(args_list)])
+
+    timings = []
+    for i in range(iterations):
+        args = args_list[i % len(args_list)]
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def sample_inputs(api, count):
+    """(zone, amp zone, lot, datetime) combinations spread over the next two days"""
+    base = pd.Timestamp.now().floor('h')
+    zones = sorted(api.lot_mapping['Zone_Name'].dropna().unique())
+    amp_zones = sorted(set(api.lot_to_amp_zone.values()))
+    lots = sorted(api.lot_to_amp_zone.keys())
+
+    inputs = []
+    for i in range(count):
+        inputs.append({
+            'zone': zones[i % len(zones)],
+            'amp_zone': amp_zones[(i * 7) % len(amp_zones)],
+            'lot': lots[(i * 11) % len(lots)],
+            'datetime': base + pd.Timedelta(hours=(i * 5) % 48)
+        })
+    return inputs
+
+
+def predict_fns(api):
+    """Raw booster calls (no batching scheduler) keyed by model name"""
+    fns = {}
+    if api.active_bundle.occupancy_model is not None:
+        fns['occupancy'] = api.active_bundle.occupancy_model.predict
+    if api.active_bundle.enforcement_model is not None:
+        fns['enforcement'] = lambda df: api.active_bundle.enforcement_model.predict_proba(df)[:, 1]
+    if api.active_bundle.lot_level_lpr_model is not None:
+        fns['lot_lpr'] = api.active_bundle.lot_level_lpr_model.predict
+    return fns
+
+
+def model_feature_rows(api, inputs):
+    """A few real feature rows per model, used to tile batches of any size"""
+    rows = {}
+    amp_zones = [item['amp_zone'] for item in inputs]
+    zones = [item['zone'] for item in inputs]
+    lots = [item['lot'] for item in inputs]
+    dts = [item['datetime'] for item in inputs]
+
+    if api.active_bundle.occupancy_model is not None:
+        rows['occupancy'], _ = api.build_feature_rows('occupancy', amp_zones, dts, on_error='skip')
+    if api.active_bundle.enforcement_model is not None:
+        rows['enforcement'], _ = api.build_feature_rows('enforcement', zones, dts, on_error='skip')
+    if api.active_bundle.lot_level_lpr_model is not None:
+        lot_df, _ = api.build_feature_rows('lot_lpr', lots, dts, on_error='skip')
+        if lot_df is not None:
+            lot_df = lot_df[api.active_bundle.lot_level_lpr_features]
+            for col in ['Zone', 'weather_category']:
+                if col in lot_df.columns:
+                    lot_df[col] = lot_df[col].astype('category')
+            rows['lot_lpr'] = lot_df
+    return {name: df for name, df in rows.items() if df is not None and len(df)}
+
+
+def micro_benchmarks(api, iterations, batch_sizes):
+    results = {}
+    inputs = sample_inputs(api, 64)
+    occ_engineer = api.components.feature_engineer_occupancy
+    enf_engineer = api.components.feature_engineer_enforcement
+    encoder = api.active_bundle.occupancy_zone_encoder
+
+    def add(name, fn, args_list, n=iterations):
+        print(f"  {name} ...", flush=True)
+        results[name] = summarize(run_benchmark(fn, args_list, n))
+
+    if occ_engineer is not None:
+        amp_args = [(item['amp_zone'], item['datetime']) for item in inputs]
+        add('create_features.occupancy', lambda z, dt: occ_engineer.create_features(z, dt, encoder), amp_args)
+        add('_compute_lag_features', occ_engineer._compute_lag_features, amp_args)
+        # Called directly rather than through date_features, so date_cache hits do not hide the lookup cost
+        date_args = [(pd.Timestamp(item['datetime']).normalize(),) for item in inputs]
+        add('_compute_date_features', occ_engineer._compute_date_features, date_args)
+        features = [(occ_engineer.create_features(z, dt, encoder), api.active_bundle.occupancy_features) for z, dt in amp_args[:8]]
+        add('features_to_array.occupancy', occ_engineer.features_to_array, features)
+
+    if enf_engineer is not None:
+        zone_args = [(item['zone'], item['datetime']) for item in inputs]
+        add('create_features.enforcement', lambda z, dt: enf_engineer.create_features(z, dt, encoder), zone_args)
+        enforcement_features = api.active_bundle.enforcement_features
+        add('create_feature_row.enforcement',
+            lambda z, dt: enf_engineer.create_feature_row(z, dt, encoder, enforcement_features), zone_args)
+        add('_compute_enforcement_lag_features', enf_engineer._compute_enforcement_lag_features, zone_args)
+        add('_compute_enforcement_features', enf_engineer._compute_enforcement_features, zone_args)
+
+    if api.active_bundle.lot_level_lpr_model is not None and api.components.lpr_history is not None:
+        lot_args = [(item['lot'], item['datetime'], api.components.lpr_history) for item in inputs]
+        add('create_lot_level_features', api.create_lot_level_features, lot_args)
+
+    # Time-pattern fallback for every lot over a week of hours, in one call
+    lots = api.lot_mapping
+    capacities = lots['Lot_number'].astype(int).map(api.lot_capacities).fillna(0).to_numpy()[:, None]
+    zone_types = lots['zone_type'].to_numpy()[:, None] if 'zone_type' in lots.columns else None
+    week = pd.date_range(pd.Timestamp.now().floor('h'), periods=168, freq='h').to_numpy()[None, :]
+    add('time_pattern.all_lots_week', api.components.time_pattern.occupancy, [(capacities, zone_types, week)])
+
+    base_rows = model_feature_rows(api, inputs)
+    for name, predict in predict_fns(api).items():
+        if name not in base_rows:
+            continue
+        base = base_rows[name]
+        for batch_size in batch_sizes:
+            batch = base.iloc[np.arange(batch_size) % len(base)].reset_index(drop=True)
+            # Keep total rows per benchmark roughly constant so large batches stay quick
+            n = max(3, min(iterations, (iterations * 100) // batch_size))
+            label = f'predict.{name}.batch_{batch_size}'
+            print(f"  {label} ...", flush=True)
+            results[label] = summarize(run_benchmark(predict, [(batch,)], n), rows_per_call=batch_size)
+
+    return results
+
+
+def endpoint_requests(api, include_writes):
+    """(name, method, path, body list) for every endpoint"""
+    inputs = sample_inputs(api, 32)
+    iso = lambda dt: dt.isoformat()
+
+    requests_list = [
+        ('GET /', 'GET', '/', [None]),
+        ('GET /api/health', 'GET', '/api/health', [None]),
+        ('GET /api/status', 'GET', '/api/status', [None]),
+        ('GET /metrics', 'GET', '/metrics', [None]),
+        ('GET /api/zones/list', 'GET', '/api/zones/list', [None]),
+        ('GET /api/lots/list', 'GET', '/api/lots/list', [None]),
+        ('GET /api/models/info', 'GET', '/api/models/info', [None]),
+        ('GET /api/feedback/stats', 'GET', '/api/feedback/stats', [None]),
+        ('GET /api/enforcement/heatmap', 'GET', '/api/enforcement/heatmap', [None]),
+        ('POST /api/occupancy/predict', 'POST', '/api/occupancy/predict',
+         [{'zone': item['zone'], 'datetime': iso(item['datetime'])} for item in inputs]),
+        ('POST /api/occupancy/predict-lot', 'POST', '/api/occupancy/predict-lot',
+         [{'lot_number': item['lot'], 'datetime': iso(item['datetime']), 'parking_duration_hours': 2}
+          for item in inputs]),
+        ('POST /api/enforcement/risk', 'POST', '/api/enforcement/risk',
+         [{'zone': item['zone'], 'datetime': iso(item['datetime'])} for item in inputs]),
+        ('POST /api/parking/recommend', 'POST', '/api/parking/recommend',
+         [{'zone': item['zone'], 'datetime': iso(item['datetime']), 'duration_hours': 3} for item in inputs])
+    ]
+
+    located = api.lot_mapping.dropna(subset=['latitude', 'longitude'])
+    if len(located):
+        points = located[['latitude', 'longitude']].to_numpy()
+        requests_list.append(('POST /api/lots/nearest', 'POST', '/api/lots/nearest', [
+            {'latitude': float(points[i % len(points), 0]) + 0.001, 'longitude': float(points[i % len(points), 1]),
+             'k': 8, 'datetime': iso(item['datetime']), 'duration_hours': 2}
+            for i, item in enumerate(inputs)
+        ]))
+
+    zone_paths = [f"/api/zones/{item['amp_zone']}/info" for item in inputs]
+    requests_list.append(('GET /api/zones/<zone_name>/info', 'GET', zone_paths, [None]))
+
+    if include_writes:
+        requests_list.append(('POST /api/feedback/submit', 'POST', '/api/feedback/submit',
+                              [{'zone': item['zone'], 'datetime': iso(item['datetime']), 'found_parking': True,
+                                'predicted_occupancy': 10, 'predicted_available': 20} for item in inputs]))
+    return requests_list
+
+
+def macro_benchmarks(api, iterations, include_writes):
+    results = {}
+    client = api.app.test_client()
+    if getattr(api, 'risk_heatmap', None) is not None:
+        api.risk_heatmap.wait()  # built in the background at import
+
+    for name, method, paths, bodies in endpoint_requests(api, include_writes):
+        paths = paths if isinstance(paths, list) else [paths]
+        args_list = [(paths[i % len(paths)], bodies[i % len(bodies)]) for i in range(max(len(paths), len(bodies)))]
+        statuses = {}
+
+        def call(path, body):
+            response = client.open(path, method=method, json=body)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        print(f"  {name} ...", flush=True)
+        for path, body in args_list[:3]:
+            call(path, body)
+        statuses.clear()  # report status codes of the timed requests only
+        summary = summarize(run_benchmark(call, args_list, iterations, warmup=0))
+        summary['status_codes'] = {str(code): count for code, count in sorted(statuses.items())}
+        results[name] = summary
+
+    return results
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def print_results(results, baseline=None):
+    for section in ('micro', 'macro'):
+        print("\n" + "=" * 100)
+        print(f"{section.upper()} BENCHMARKS")
+        print("=" * 100)
+        header = f"{'benchmark':<44} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/sec':>12}"
+        if baseline:
+            header += f" {'p50 vs base':>12}"
+        print(header)
+        print("-" * 100)
+        for name, stats in results[section].items():
+            line = (f"{name:<44} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+                    f"{stats['p99_ms']:>10.3f} {stats['ops_per_sec'] or 0:>12.1f}")
+            base = (baseline or {}).get(section, {}).get(name)
+            if base and base['p50_ms'] > 0:
+                line += f" {stats['p50_ms'] / base['p50_ms']:>11.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline CougarPark benchmark suite')
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    parser.add_argument('--compare', default=None, help='Baseline results JSON to compare p50 against')
+    parser.add_argument('--fixture-dir', default=None,
+                        help='Reuse (or build into) this fixture directory instead of a temporary one')
+    parser.add_argument('--repo-data', action='store_true',
+                        help='Benchmark the data/ and models/ in the repo (skips write endpoints)')
+    parser.add_argument('--iterations', type=int, default=200, help='Iterations per micro-benchmark')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per endpoint')
+    parser.add_argument('--batch-sizes', default=','.join(str(n) for n in BATCH_SIZES),
+                        help='Comma separated batch sizes for model predict benchmarks')
+    parser.add_argument('--quick', action='store_true', help='Few iterations, for a sanity check')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-macro', action='store_true')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.iterations = min(args.iterations, 20)
+        args.requests = min(args.requests, 5)
+
+    temp_dir = None
+    fixture_dir = None
+    if not args.repo_data:
+        fixture_dir = args.fixture_dir
+        if fixture_dir is None:
+            temp_dir = fixture_dir = tempfile.mkdtemp(prefix='cougarpark_bench_')
+        if not os.path.exists(os.path.join(fixture_dir, 'models', 'occupancy_lightgbm_tuned.pkl')):
+            from benchmark_fixture import build_fixture
+            print(f"Building benchmark fixture in {fixture_dir} ...")
+            build_fixture(fixture_dir)
+        os.environ['COUGARPARK_DATA_DIR'] = os.path.join(fixture_dir, 'data')
+        os.environ['COUGARPARK_MODEL_DIR'] = os.path.join(fixture_dir, 'models')
+
+    try:
+        start = time.perf_counter()
+        import parking_api as api
+        import_seconds = time.perf_counter() - start
+
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'data': 'repo' if args.repo_data else 'fixture',
+                'api_import_seconds': round(import_seconds, 3),
+                'api_peak_rss_mb': peak_rss_mb(),
+                'lots': len(api.lot_mapping),
+                'zones': int(api.lot_mapping['Zone_Name'].nunique()),
+                'iterations': args.iterations,
+                'requests_per_endpoint': args.requests
+            },
+            'micro': {},
+            'macro': {}
+        }
+
+        if not args.skip_micro:
+            print("\nRunning micro-benchmarks...")
+            batch_sizes = [int(n) for n in args.batch_sizes.split(',') if n]
+            results['micro'] = micro_benchmarks(api, args.iterations, batch_sizes)
+        if not args.skip_macro:
+            print("\nRunning endpoint benchmarks...")
+            results['macro'] = macro_benchmarks(api, args.requests, include_writes=not args.repo_data)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Build a self-contained fixture for benchmarks
+
+The processed histories and trained model pickles are stored in Git LFS and
+are not always available, so benchmarks run against a fixture directory that
+holds:
+  - the small reference files from the repo (lot mapping, academic calendar,
+    football games, daily weather and model metadata)
+  - synthetic occupancy, enforcement and lot-level LPR histories covering the
+    last few weeks (from generate_synthetic_data.py) for the real lots and zones
+  - small LightGBM/XGBoost models trained on random data with the production
+    feature lists, so predict calls have realistic shapes (not realistic values)
+
+Usage:
+    python scripts/benchmark_fixture.py --output /tmp/cougarpark_fixture [--days 70]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from generate_synthetic_data import amp_zone_names, write_histories
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OCCUPANCY_FEATURES = [
+    'hour', 'day_of_week', 'month', 'year', 'is_weekend', 'time_of_day_code',
+    'is_game_day', 'is_dead_week', 'is_finals_week', 'is_spring_break',
+    'is_thanksgiving_break', 'is_winter_break', 'is_any_break',
+    'temp_mean_f', 'precipitation_inches', 'is_rainy', 'is_snowy', 'is_cold', 'is_hot', 'is_windy',
+    'Max_Capacity', 'Zone_encoded',
+    'occupancy_lag_1', 'occupancy_lag_24', 'occupancy_rolling_3', 'occupancy_rolling_24',
+    'occupancy_dow_hour_avg'
+]
+
+ENFORCEMENT_FEATURES = OCCUPANCY_FEATURES[:21] + [
+    'Zone_encoded',
+    'enforcement_lag_1', 'tickets_lag_1', 'enforcement_lag_24', 'tickets_lag_24',
+    'enforcement_rolling_3', 'enforcement_rolling_24', 'tickets_rolling_24', 'enforcement_dow_hour_avg',
+    'lpr_scans', 'amp_sessions', 'unpaid_estimate', 'compliance_ratio',
+    'zone_avg_enforcement', 'vulnerability_score', 'high_risk', 'zone_type_Permit'
+]
+
+REFERENCE_DATA_FILES = [
+    'lot_mapping_enhanced.csv',
+    'lot_mapping_enhanced_with_coords.csv',
+    'academic_calendar.csv',
+    'football_games.csv'
+]
+
+MODEL_METADATA_FILES = [
+    'occupancy_model_metadata.json',
+    'enforcement_model_metadata.json',
+    'occupancy_lot_level_lpr_metadata.json'
+]
+
+
+def write_models(model_dir, amp_zones, zones, rng, training_rows=3000):
+    """Small models with the production feature lists"""
+    import lightgbm as lgb
+    import xgboost as xgb
+    from sklearn.preprocessing import LabelEncoder
+
+    X = pd.DataFrame(rng.random((training_rows, len(OCCUPANCY_FEATURES))) * 10, columns=OCCUPANCY_FEATURES)
+    occupancy_model = lgb.LGBMRegressor(n_estimators=50, verbose=-1).fit(X, X.sum(axis=1))
+    X = pd.DataFrame(rng.random((training_rows, len(ENFORCEMENT_FEATURES))), columns=ENFORCEMENT_FEATURES)
+    enforcement_model = xgb.XGBClassifier(n_estimators=30, max_depth=4).fit(
+        X, (X['hour'] + X['enforcement_lag_1'] > 1).astype(int)
+    )
+
+    with open(os.path.join(model_dir, 'occupancy_lot_level_lpr_metadata.json'), 'r') as f:
+        lot_features = json.load(f)['features']['feature_list']
+    X = pd.DataFrame(rng.random((training_rows, len(lot_features))), columns=lot_features)
+    X['Zone'] = pd.Categorical(rng.choice(zones, training_rows))
+    X['weather_category'] = pd.Categorical(rng.choice(['Clear', 'Rain', 'Snow', 'Drizzle'], training_rows))
+    lot_model = lgb.LGBMRegressor(n_estimators=30, verbose=-1).fit(X, rng.random(training_rows) * 5)
+
+    artifacts = {
+        'occupancy_lightgbm_tuned.pkl': occupancy_model,
+        'occupancy_feature_list_lags.pkl': OCCUPANCY_FEATURES,
+        'occupancy_zone_encoder.pkl': LabelEncoder().fit(amp_zones + zones),
+        'enforcement_xgboost_tuned.pkl': enforcement_model,
+        'enforcement_feature_list_lags.pkl': ENFORCEMENT_FEATURES,
+        'occupancy_lot_level_lpr_model.pkl': lot_model
+    }
+    for filename, obj in artifacts.items():
+        with open(os.path.join(model_dir, filename), 'wb') as f:
+            pickle.dump(obj, f)
+
+
+def copy_model_metadata(model_dir):
+    for filename in MODEL_METADATA_FILES:
+        shutil.copy(os.path.join(PROJECT_ROOT, 'models', filename), model_dir)
+
+
+def build_fixture(output_dir, days=70, seed=0):
+    """Write data/ and models/ under output_dir, returns (data_dir, model_dir)"""
+    rng = np.random.default_rng(seed)
+    data_dir = os.path.join(output_dir, 'data')
+    model_dir = os.path.join(output_dir, 'models')
+    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(model_dir, exist_ok=True)
+
+    for filename in REFERENCE_DATA_FILES:
+        shutil.copy(os.path.join(PROJECT_ROOT, 'data', filename), data_dir)
+    # The API reads the combined daily weather file under this name
+    shutil.copy(os.path.join(PROJECT_ROOT, 'data', 'weather_pullman_2020_2025.csv'),
+                os.path.join(data_dir, 'weather_pullman_hourly_2020_2025.csv'))
+    copy_model_metadata(model_dir)
+
+    lot_mapping = pd.read_csv(os.path.join(data_dir, 'lot_mapping_enhanced_with_coords.csv'))
+    end = pd.Timestamp.now().floor('h')
+    write_histories(data_dir, lot_mapping, end - pd.Timedelta(days=days), end, rng)
+    write_models(model_dir, amp_zone_names(lot_mapping), sorted(lot_mapping['Zone_Name'].dropna().unique()), rng)
+    return data_dir, model_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build benchmark fixture data and models')
+    parser.add_argument('--output', required=True, help='Directory to write data/ and models/ into')
+    parser.add_argument('--days', type=int, default=70, help='Days of hourly history to generate')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data_dir, model_dir = build_fixture(args.output, days=args.days, seed=args.seed)
+    print(f"Fixture data:   {data_dir}")
+    print(f"Fixture models: {model_dir}")
+
+
+if __name__ == '__main__':
+    main()
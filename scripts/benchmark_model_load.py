@@ -0,0 +1,137 @@
+"""
+Startup benchmark: model load time and memory, pickle vs native formats
+
+Each trial loads the full model bundle in a fresh interpreter (pandas and
+numpy already imported, as they are in the API). LightGBM and XGBoost are
+imported first and timed on their own, so load time covers only reading the
+artifacts. Reports per format the median import and load time, the resident
+memory both added, the size on disk and whether scikit-learn was imported
+(both libraries import it themselves when it is installed).
+
+By default the models come from the benchmark fixture (see
+benchmark_fixture.py) in a temporary directory; pass --model-dir to measure
+real models. Native files missing there are exported into a temporary copy.
+
+Usage:
+    python scripts/benchmark_model_load.py [--model-dir models] [--trials 5] [--output load.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from native_models import NATIVE_MODELS, NATIVE_ENCODERS, native_available, schema_path
+from model_bundle import ARTIFACTS
+
+FORMATS = ['pickle', 'native']
+
+TRIAL_CODE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+import numpy, pandas
+from memory_footprint import process_rss_bytes
+from model_bundle import load_model_bundle
+rss_before = process_rss_bytes()
+start = time.perf_counter()
+import lightgbm, xgboost
+import_seconds = time.perf_counter() - start
+start = time.perf_counter()
+bundle = load_model_bundle({model_dir!r}, model_format={model_format!r})
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    'import_seconds': import_seconds,
+    'seconds': seconds,
+    'rss_added_bytes': process_rss_bytes() - rss_before,
+    'artifact_seconds': bundle.load_seconds,
+    'formats': bundle.formats,
+    'sklearn_imported': 'sklearn' in sys.modules
+}}))
+"""
+
+
+def run_trial(model_dir, model_format):
+    code = TRIAL_CODE.format(src=os.path.join(PROJECT_ROOT, 'src'), model_dir=model_dir, model_format=model_format)
+    output = subprocess.check_output([sys.executable, '-c', code], stderr=subprocess.DEVNULL).decode()
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def disk_bytes(model_dir, model_format):
+    """Bytes on disk of the model and encoder files one format loads"""
+    total = 0
+    for name, stem in {**NATIVE_MODELS, **NATIVE_ENCODERS}.items():
+        if model_format == 'native' and native_available(model_dir, name):
+            with open(schema_path(model_dir, stem)) as f:
+                model_file = json.load(f).get('model_file')
+            paths = [schema_path(model_dir, stem)] + ([os.path.join(model_dir, model_file)] if model_file else [])
+        else:
+            paths = [os.path.join(model_dir, ARTIFACTS[name][0])]
+        total += sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare model load time and memory of pickle vs native formats')
+    parser.add_argument('--model-dir', default=None, help='Models to measure (default: the benchmark fixture)')
+    parser.add_argument('--trials', type=int, default=5, help='Fresh interpreters per format')
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix='cougarpark_load_')
+    try:
+        model_dir = os.path.join(temp_dir, 'models')
+        if args.model_dir:
+            shutil.copytree(args.model_dir, model_dir)
+        else:
+            from benchmark_fixture import build_fixture
+            print(f"Building benchmark fixture in {temp_dir} ...")
+            build_fixture(temp_dir)
+        if not all(native_available(model_dir, name) for name in {**NATIVE_MODELS, **NATIVE_ENCODERS}):
+            print("Exporting native models...")
+            subprocess.check_call([sys.executable, os.path.join(PROJECT_ROOT, 'scripts', 'export_native_models.py'),
+                                   '--model-dir', model_dir, '--verify'])
+
+        results = {}
+        for model_format in FORMATS:
+            trials = [run_trial(model_dir, model_format) for _ in range(args.trials)]
+            results[model_format] = {
+                'median_import_seconds': round(statistics.median(t['import_seconds'] for t in trials), 4),
+                'median_seconds': round(statistics.median(t['seconds'] for t in trials), 4),
+                'min_seconds': round(min(t['seconds'] for t in trials), 4),
+                'median_rss_added_mb': round(statistics.median(t['rss_added_bytes'] for t in trials) / 2**20, 1),
+                'disk_bytes': disk_bytes(model_dir, model_format),
+                'sklearn_imported': trials[-1]['sklearn_imported'],
+                'formats': trials[-1]['formats'],
+                'artifact_seconds': trials[-1]['artifact_seconds']
+            }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("\n" + "=" * 84)
+    print(f"{'format':<10} {'import s':>10} {'load s':>10} {'min load s':>12} {'RSS added MB':>14} "
+          f"{'disk KB':>10} {'sklearn':>8}")
+    print("-" * 84)
+    for model_format, stats in results.items():
+        print(f"{model_format:<10} {stats['median_import_seconds']:>10.3f} {stats['median_seconds']:>10.3f} "
+              f"{stats['min_seconds']:>12.3f} {stats['median_rss_added_mb']:>14.1f} "
+              f"{stats['disk_bytes'] / 1024:>10.1f} {'yes' if stats['sklearn_imported'] else 'no':>8}")
+    pickle_s, native_s = results['pickle']['median_seconds'], results['native']['median_seconds']
+    if native_s > 0:
+        print(f"\nnative load time is {native_s / pickle_s:.2f}x that of pickle (imports excluded)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Split the lot-level LPR history CSV into the monthly partitioned store
+
+The API builds the store itself on first start (ingestion.lpr_store.build_if_missing);
+run this ahead of a deploy so the first start doesn't pay for it.
+
+Usage:
+    python scripts/build_lpr_store.py [--data-dir data] [--chunksize 500000]
+"""
+
+import argparse
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+from lpr_store import build_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the monthly LPR history store')
+    parser.add_argument('--data-dir', default=os.path.join(PROJECT_ROOT, 'data'))
+    parser.add_argument('--chunksize', type=int, default=500000, help='CSV rows read at a time')
+    args = parser.parse_args()
+
+    csv_path = os.path.join(args.data_dir, 'processed', 'occupancy_lot_level_lpr_full.csv')
+    store_dir = os.path.join(args.data_dir, 'processed', 'lpr_store')
+    build_store(csv_path, store_dir, chunksize=args.chunksize)
+    print(f"Wrote {store_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Export the pickled models in their native booster formats
+
+Writes next to each pickle a LightGBM text model (.txt) or XGBoost UBJSON
+model (.ubj) and a <name>.schema.json with the feature list, library version
+and task, plus occupancy_zone_encoder.schema.json with the encoder's classes.
+With model_serialization.format set to "native" in config.json the API loads
+these instead of the pickles, and checks that both give the same predictions
+when --verify is passed here.
+
+Usage:
+    python scripts/export_native_models.py [--model-dir models] [--verify]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+from native_models import NATIVE_MODELS, NATIVE_ENCODERS, export_model, export_encoder, load_native
+from model_bundle import ARTIFACTS
+
+
+def verification_frame(model, rows=256, seed=0):
+    """Random rows in the feature ranges the model was trained on, categorical columns included"""
+    rng = np.random.default_rng(seed)
+    if hasattr(model, 'booster_'):
+        booster = model.booster_
+        names = booster.feature_name()
+        # pandas_categorical lists the categories of each categorical column, in column order
+        categorical = [names[i] for i in booster.params.get('categorical_column') or []]
+        categories = dict(zip(categorical, booster.pandas_categorical or []))
+    else:
+        names = model.get_booster().feature_names
+        categories = {}
+    frame = pd.DataFrame({name: rng.uniform(0, 100, rows) for name in names})
+    for name, values in categories.items():
+        frame[name] = pd.Categorical(rng.choice(values, rows), categories=values)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export models in their native booster formats')
+    parser.add_argument('--model-dir', default=os.path.join(PROJECT_ROOT, 'models'))
+    parser.add_argument('--verify', action='store_true',
+                        help='Check that the native predictors match the pickles on random rows')
+    args = parser.parse_args()
+
+    failed = False
+    for name, stem in {**NATIVE_MODELS, **NATIVE_ENCODERS}.items():
+        pickle_path = os.path.join(args.model_dir, ARTIFACTS[name][0])
+        if not os.path.exists(pickle_path):
+            print(f"  {name}: {ARTIFACTS[name][0]} not found, skipped")
+            continue
+        with open(pickle_path, 'rb') as f:
+            obj = pickle.load(f)
+
+        if name in NATIVE_ENCODERS:
+            path = export_encoder(obj, args.model_dir, stem)
+        else:
+            path = export_model(obj, args.model_dir, stem)
+        print(f"  {name}: {os.path.getsize(pickle_path):,} byte pickle -> "
+              f"{os.path.basename(path)} ({os.path.getsize(path):,} bytes)")
+
+        if args.verify and name in NATIVE_MODELS:
+            native = load_native(args.model_dir, name)
+            X = verification_frame(obj)
+            if hasattr(obj, 'predict_proba'):
+                expected, actual = obj.predict_proba(X)[:, 1], native.predict_proba(X)[:, 1]
+            else:
+                expected, actual = obj.predict(X), native.predict(X)
+            max_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+            ok = max_diff <= 1e-6
+            failed = failed or not ok
+            print(f"    verify: max abs difference {max_diff:.2e} over {len(X)} rows {'OK' if ok else 'MISMATCH'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
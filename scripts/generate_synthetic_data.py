@@ -0,0 +1,338 @@
+"""
+Generate synthetic CougarPark data at arbitrary scale
+
+Writes every file the API loads, in the exact schemas it expects, so startup
+time, memory and request latency can be measured at sizes far beyond the real
+campus (185 lots, 25 enforcement zones):
+
+  data/lot_mapping_enhanced_with_coords.csv   (and lot_mapping_enhanced.csv)
+  data/academic_calendar.csv
+  data/football_games.csv
+  data/weather_pullman_hourly_2020_2025.csv   (daily rows, as the loaders read it)
+  data/processed/occupancy_history_2025.csv
+  data/processed/occupancy_lot_level_full.csv
+  data/processed/enforcement_full_extended.csv
+  data/processed/occupancy_lot_level_lpr_full.csv
+
+Histories end at the current hour, since the API only keeps recent LPR rows.
+They are written in chunks so multi-year, multi-thousand-lot datasets do not
+have to fit in memory. With --with-models small models are trained on the
+production feature lists as well (see benchmark_fixture.py), giving a
+directory that benchmark.py --fixture-dir can load directly.
+
+Usage:
+    python scripts/generate_synthetic_data.py --output /tmp/cougarpark_2k --lots 2000 --zones 250 --years 2 --with-models
+    COUGARPARK_DATA_DIR=/tmp/cougarpark_2k/data COUGARPARK_MODEL_DIR=/tmp/cougarpark_2k/models python src/parking_api.py
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ZONE_COLORS = ['Green', 'Grey', 'Red', 'Blue', 'Yellow', 'Orange', 'Crimson', 'Gray']
+ZONE_TYPES = ['Permit', 'Permit', 'Permit', 'University Vehicles', 'Resident', 'ADA', 'Hourly']
+WEATHER_CATEGORIES = ['Clear', 'Cloudy', 'Drizzle', 'Rain', 'Snow']
+
+# Campus centre; synthetic lots are scattered around it
+CENTER_LAT, CENTER_LON = 46.7305, -117.1603
+
+CHUNK_ROWS = 2_000_000
+
+
+def zone_names(zones):
+    """'Green 1', 'Grey 1', ... cycling through the permit colours"""
+    return [f'{ZONE_COLORS[i % len(ZONE_COLORS)]} {i // len(ZONE_COLORS) + 1}' for i in range(zones)]
+
+
+def make_lot_mapping(lots, zones, rng):
+    """Lot mapping with coordinates; most lots carry one or two AMP zone names"""
+    names = zone_names(zones)
+    lot_numbers = np.arange(1, lots + 1)
+    lot_zones = [names[i % zones] for i in range(lots)]
+
+    amp_names = []
+    for lot, zone in zip(lot_numbers, lot_zones):
+        draw = rng.random()
+        if draw < 0.35:
+            amp_names.append(None)
+        elif draw < 0.9:
+            amp_names.append(f'{zone} Lot {lot}')
+        else:
+            amp_names.append(f'{zone} Lot {lot}|{zone} Lot {lot} Annex')
+
+    # Spread lots over an area that grows with the lot count (~185 lots per campus)
+    spread = 0.01 * max(1.0, np.sqrt(lots / 185))
+    return pd.DataFrame({
+        'Lot_number': lot_numbers,
+        'Zone_Name': lot_zones,
+        'zone_type': rng.choice(ZONE_TYPES, lots),
+        'capacity': rng.integers(10, 450, lots).astype(float),
+        'location_description': [f'SYNTHETIC LOT {lot}' for lot in lot_numbers],
+        'is_dorm_parking': (rng.random(lots) < 0.1).astype(int),
+        'alternative_location_description': amp_names,
+        'latitude': np.round(CENTER_LAT + rng.normal(0, spread, lots), 6),
+        'longitude': np.round(CENTER_LON + rng.normal(0, spread * 1.5, lots), 6),
+        'coord_source': 'Synthetic'
+    })
+
+
+def amp_zone_names(lot_mapping):
+    names = set()
+    for value in lot_mapping['alternative_location_description'].dropna():
+        names.update(name.strip() for name in str(value).split('|') if name.strip())
+    return sorted(names)
+
+
+def make_calendar(years):
+    """Fall/spring semesters with the breaks and exam weeks the feature engineer looks for"""
+    rows = []
+    for year in years:
+        labor_day = pd.Timestamp(year, 9, 1) + pd.offsets.Week(weekday=0)
+        thanksgiving = pd.Timestamp(year, 11, 1) + pd.offsets.Week(weekday=3) + pd.Timedelta(weeks=3)
+        fall_end = pd.Timestamp(year, 12, 18)
+        spring_start = pd.Timestamp(year, 1, 10)
+        spring_end = pd.Timestamp(year, 5, 8)
+        spring_break = pd.Timestamp(year, 3, 9)
+
+        events = [
+            ('Spring', 'Semester', spring_start, spring_end, 'Spring semester'),
+            ('Spring', 'Spring_Break', spring_break, spring_break + pd.Timedelta(days=6), 'Spring break'),
+            ('Spring', 'Dead_Week', spring_end - pd.Timedelta(days=13), spring_end - pd.Timedelta(days=7), 'Dead week'),
+            ('Spring', 'Finals_Week', spring_end - pd.Timedelta(days=6), spring_end, 'Finals week'),
+            ('Fall', 'Week_Of_Welcome', pd.Timestamp(year, 8, 17), pd.Timestamp(year, 8, 23), 'Week of Welcome'),
+            ('Fall', 'Semester', pd.Timestamp(year, 8, 24), fall_end, 'Fall semester'),
+            ('Fall', 'University_Holiday', labor_day, labor_day, 'Labor Day'),
+            ('Fall', 'Thanksgiving_Break', thanksgiving - pd.Timedelta(days=3), thanksgiving + pd.Timedelta(days=3),
+             'Thanksgiving break'),
+            ('Fall', 'Dead_Week', fall_end - pd.Timedelta(days=13), fall_end - pd.Timedelta(days=7), 'Dead week'),
+            ('Fall', 'Finals_Week', fall_end - pd.Timedelta(days=6), fall_end, 'Finals week'),
+            ('Fall', 'Winter_Break', fall_end + pd.Timedelta(days=1), pd.Timestamp(year + 1, 1, 9), 'Winter break')
+        ]
+        for semester, event_type, start, end, description in events:
+            rows.append({
+                'Year': year,
+                'Semester': semester,
+                'Event_Type': event_type,
+                'Start_Date': start.strftime('%Y-%m-%d'),
+                'End_Date': end.strftime('%Y-%m-%d'),
+                'Description': description
+            })
+    return pd.DataFrame(rows)
+
+
+def make_football_games(years, rng):
+    """Six home games per season on Saturdays from September to November"""
+    rows = []
+    for year in years:
+        first_saturday = pd.Timestamp(year, 9, 1) + pd.offsets.Week(weekday=5)
+        weeks = np.sort(rng.choice(np.arange(12), 6, replace=False))
+        for week in weeks:
+            date = first_saturday + pd.Timedelta(weeks=int(week))
+            home, away = rng.integers(7, 49, 2)
+            rows.append({
+                'Date': f'{date.month}/{date.day}/{date.year}',
+                'Year': year,
+                'Opponent': f'Opponent {len(rows) + 1}',
+                'Location': 'Home',
+                'Result': 'Win' if home > away else 'Loss',
+                'Score': f'{home}-{away}'
+            })
+    return pd.DataFrame(rows)
+
+
+def make_weather(start_date, end_date, rng):
+    """Daily weather in the schema of weather_pullman_2020_2025.csv, with a seasonal temperature cycle"""
+    dates = pd.date_range(start_date, end_date, freq='D')
+    n = len(dates)
+    seasonal = 50 - 22 * np.cos(2 * np.pi * (dates.dayofyear.values - 15) / 365.25)
+    temp_mean = np.round(seasonal + rng.normal(0, 6, n), 1)
+    temp_range = np.round(rng.uniform(6, 25, n), 1)
+    precipitation = np.round(np.where(rng.random(n) < 0.3, rng.exponential(0.15, n), 0.0), 3)
+    snowfall = np.round(np.where(temp_mean < 34, precipitation * 10, 0.0), 3)
+    wind = np.round(rng.uniform(5, 35, n), 1)
+
+    category = np.where(snowfall > 0, 'Snow',
+                        np.where(precipitation > 0.1, 'Rain',
+                                 np.where(precipitation > 0, 'Drizzle', rng.choice(['Clear', 'Cloudy'], n))))
+    weather_codes = {'Clear': 0, 'Cloudy': 3, 'Drizzle': 55, 'Rain': 63, 'Snow': 73}
+
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'temp_max_f': np.round(temp_mean + temp_range / 2, 1),
+        'temp_min_f': np.round(temp_mean - temp_range / 2, 1),
+        'temp_mean_f': temp_mean,
+        'precipitation_inches': precipitation,
+        'precipitation_hours': np.where(precipitation > 0, rng.integers(1, 14, n), 0).astype(float),
+        'snowfall_inches': snowfall,
+        'snow_depth_inches': np.round(np.maximum(0, snowfall * 0.5), 3),
+        'wind_max_mph': wind,
+        'weather_code': [weather_codes[c] for c in category],
+        'weather_category': category,
+        'is_rainy': (precipitation > 0).astype(int),
+        'is_snowy': (snowfall > 0).astype(int),
+        'is_cold': (temp_mean < 32).astype(int),
+        'is_hot': (temp_mean > 85).astype(int),
+        'is_windy': (wind > 20).astype(int),
+        'temp_range_f': temp_range,
+        'is_severe': ((snowfall > 2) | (wind > 40)).astype(int)
+    })
+
+
+def hourly_profile(hours):
+    """Relative activity by hour: busy during the campus day, quiet at night and on weekends"""
+    hour = hours.hour.values
+    weekday = hours.dayofweek.values < 5
+    daytime = np.exp(-((hour - 12.5) ** 2) / 18.0)
+    return daytime * np.where(weekday, 1.0, 0.35)
+
+
+def _write_chunked(path, entities, make_frame, rows_per_entity, chunk_rows):
+    """Build and append one frame per group of entities so the full table never sits in memory"""
+    per_chunk = max(1, chunk_rows // max(1, rows_per_entity))
+    total = 0
+    for start in range(0, len(entities), per_chunk):
+        frame = make_frame(entities[start:start + per_chunk])
+        frame.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+        total += len(frame)
+    if not entities:
+        make_frame([]).to_csv(path, index=False)
+    return total
+
+
+def write_histories(data_dir, lot_mapping, start, end, rng, chunk_rows=CHUNK_ROWS):
+    """Occupancy, capacity, enforcement and lot-level LPR histories between start and end (hourly)"""
+    processed_dir = os.path.join(data_dir, 'processed')
+    os.makedirs(processed_dir, exist_ok=True)
+
+    hours = pd.date_range(start, end, freq='h')
+    profile = hourly_profile(hours)
+    amp_zones = amp_zone_names(lot_mapping)
+    zones = sorted(lot_mapping['Zone_Name'].dropna().unique())
+    lots = lot_mapping['Lot_number'].astype(int).tolist()
+    counts = {}
+
+    # AMP sessions are sparse, so occupancy is sampled every 3 hours
+    sampled = hours[::3]
+    sampled_profile = profile[::3]
+
+    def occupancy_frame(names):
+        frame = pd.DataFrame({
+            'Zone': np.repeat(names, len(sampled)),
+            'datetime': np.tile(sampled, len(names)),
+            'occupancy_count': rng.poisson(np.tile(1 + 12 * sampled_profile, len(names)))
+        })
+        frame['hour'] = frame['datetime'].dt.hour
+        frame['day_of_week'] = frame['datetime'].dt.dayofweek
+        return frame
+
+    counts['occupancy_history_2025'] = _write_chunked(
+        os.path.join(processed_dir, 'occupancy_history_2025.csv'), amp_zones, occupancy_frame, len(sampled), chunk_rows
+    )
+
+    pd.DataFrame({
+        'Zone': amp_zones,
+        'Max_Capacity': rng.integers(20, 300, len(amp_zones))
+    }).to_csv(os.path.join(processed_dir, 'occupancy_lot_level_full.csv'), index=False)
+
+    def enforcement_frame(names):
+        activity = np.tile(profile, len(names))
+        frame = pd.DataFrame({
+            'datetime': np.tile(hours, len(names)),
+            'Zone': np.repeat(names, len(hours)),
+            'tickets_issued': rng.binomial(3, 0.02 + 0.08 * activity),
+            'lpr_scans': rng.poisson(1 + 8 * activity),
+            'amp_sessions': rng.poisson(0.5 + 4 * activity),
+            'unpaid_estimate': np.round(rng.random(len(activity)) * 3 * activity, 3)
+        })
+        frame['date'] = frame['datetime'].dt.normalize()
+        frame['hour'] = frame['datetime'].dt.hour
+        frame['day_of_week'] = frame['datetime'].dt.dayofweek
+        frame['year'] = frame['datetime'].dt.year
+        frame['lpr_estimated'] = False
+        return frame
+
+    counts['enforcement_full_extended'] = _write_chunked(
+        os.path.join(processed_dir, 'enforcement_full_extended.csv'), zones, enforcement_frame, len(hours), chunk_rows
+    )
+
+    def lpr_frame(lot_numbers):
+        frame = pd.DataFrame({
+            'lot_number': np.repeat(lot_numbers, len(hours)),
+            'datetime': np.tile(hours, len(lot_numbers)),
+            'lpr_scans': rng.poisson(np.tile(0.2 + 4 * profile, len(lot_numbers)))
+        })
+        frame['date'] = frame['datetime'].dt.date
+        frame['hour'] = frame['datetime'].dt.hour
+        return frame
+
+    counts['occupancy_lot_level_lpr_full'] = _write_chunked(
+        os.path.join(processed_dir, 'occupancy_lot_level_lpr_full.csv'), lots, lpr_frame, len(hours), chunk_rows
+    )
+
+    return counts
+
+
+def generate(output_dir, lots=185, zones=25, years=1.0, seed=0, with_models=False):
+    """Write a complete synthetic dataset (and optionally models) under output_dir"""
+    rng = np.random.default_rng(seed)
+    data_dir = os.path.join(output_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+
+    end = pd.Timestamp.now().floor('h')
+    start = end - pd.Timedelta(days=int(round(years * 365)))
+    calendar_years = list(range(start.year - 1, end.year + 2))
+
+    lot_mapping = make_lot_mapping(lots, zones, rng)
+    lot_mapping.to_csv(os.path.join(data_dir, 'lot_mapping_enhanced_with_coords.csv'), index=False)
+    lot_mapping.drop(columns=['latitude', 'longitude', 'coord_source']).to_csv(
+        os.path.join(data_dir, 'lot_mapping_enhanced.csv'), index=False
+    )
+    make_calendar(calendar_years).to_csv(os.path.join(data_dir, 'academic_calendar.csv'), index=False)
+    make_football_games(calendar_years, rng).to_csv(os.path.join(data_dir, 'football_games.csv'), index=False)
+    make_weather(pd.Timestamp(calendar_years[0], 1, 1), pd.Timestamp(calendar_years[-1], 12, 31), rng).to_csv(
+        os.path.join(data_dir, 'weather_pullman_hourly_2020_2025.csv'), index=False
+    )
+
+    counts = write_histories(data_dir, lot_mapping, start, end, rng)
+
+    if with_models:
+        from benchmark_fixture import copy_model_metadata, write_models
+        model_dir = os.path.join(output_dir, 'models')
+        os.makedirs(model_dir, exist_ok=True)
+        copy_model_metadata(model_dir)
+        write_models(model_dir, amp_zone_names(lot_mapping), sorted(lot_mapping['Zone_Name'].unique()), rng)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic CougarPark data for scale testing')
+    parser.add_argument('--output', required=True, help='Directory to write data/ (and models/) into')
+    parser.add_argument('--lots', type=int, default=185, help='Number of parking lots')
+    parser.add_argument('--zones', type=int, default=25, help='Number of enforcement zones')
+    parser.add_argument('--years', type=float, default=1.0, help='Years of hourly history, ending now')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--with-models', action='store_true', help='Also train small models for the dataset')
+    args = parser.parse_args()
+
+    if args.zones < 1 or args.lots < 1:
+        parser.error('--lots and --zones must be at least 1')
+
+    print("=" * 80)
+    print(f"Generating {args.lots} lots, {args.zones} zones, {args.years:g} years of hourly history")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    counts = generate(args.output, args.lots, args.zones, args.years, args.seed, args.with_models)
+    for name, rows in counts.items():
+        print(f"  {name}: {rows:,} rows")
+    print(f"Done in {time.perf_counter() - start:.1f}s -> {os.path.abspath(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+"""
+Concurrent load generator for a running CougarPark API
+
+Replaces the old sequential test_all_lots.py. A dispatcher issues requests at
+a target rate (ramping up linearly from --start-rps) and a pool of worker
+threads sends them over a shared, connection-pooled requests.Session. The
+traffic mix covers the read-only endpoints, weighted like real usage, with zones, lots
+and times drawn from the lot mapping. Throughput, latency percentiles and
+error rates are reported per endpoint and per zone.
+
+Start the API first (python src/parking_api.py), then for example:
+    python scripts/load_test.py --workers 32 --target-rps 50 --ramp-seconds 30 --duration 60
+    python scripts/load_test.py --smoke      # every zone once, like the old test_all_lots.py
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative weights of each request type in the default traffic mix.
+# /api/feedback/submit is left out: it writes records, so a load run would
+# fill the feedback store with fake submissions and skew its stats.
+DEFAULT_MIX = {
+    'recommend': 40,
+    'occupancy': 20,
+    'predict_lot': 20,
+    'enforcement': 10,
+    'zones_list': 3,
+    'lots_list': 3,
+    'zone_info': 2,
+    'health': 2,
+    'status': 1,
+    'models_info': 1,
+    'feedback_stats': 1
+}
+
+
+class TrafficMix:
+    """Builds random requests (name, method, path, body, zone) following the configured weights"""
+
+    def __init__(self, weights, zones, amp_zones, lots, days_ahead=7, seed=None):
+        self.names = [name for name, weight in weights.items() if weight > 0]
+        self.weights = [weights[name] for name in self.names]
+        self.zones = zones
+        self.amp_zones = amp_zones
+        self.lots = lots
+        self.days_ahead = days_ahead
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def _datetime(self):
+        # Campus hours over the next few days, when people actually look for parking
+        day = datetime.now().date() + timedelta(days=self.random.randint(0, self.days_ahead))
+        return datetime(day.year, day.month, day.day, self.random.randint(7, 20)).isoformat()
+
+    def next_request(self):
+        with self.lock:
+            name = self.random.choices(self.names, weights=self.weights)[0]
+            zone = self.random.choice(self.zones)
+
+            if name == 'recommend':
+                body = {'zone': zone, 'datetime': self._datetime(), 'duration_hours': self.random.choice([1, 2, 3, 4])}
+                return name, 'POST', '/api/parking/recommend', body, zone
+            if name == 'occupancy':
+                return name, 'POST', '/api/occupancy/predict', {'zone': zone, 'datetime': self._datetime()}, zone
+            if name == 'enforcement':
+                return name, 'POST', '/api/enforcement/risk', {'zone': zone, 'datetime': self._datetime()}, zone
+            if name == 'predict_lot':
+                lot = self.random.choice(self.lots)
+                body = {'lot_number': lot, 'datetime': self._datetime(),
+                        'parking_duration_hours': self.random.choice([1, 2, 3])}
+                return name, 'POST', '/api/occupancy/predict-lot', body, f'lot {lot}'
+            if name == 'zone_info':
+                amp_zone = self.random.choice(self.amp_zones)
+                return name, 'GET', f"/api/zones/{quote(amp_zone, safe='')}/info", None, amp_zone
+            if name == 'zones_list':
+                return name, 'GET', '/api/zones/list', None, None
+            if name == 'lots_list':
+                return name, 'GET', '/api/lots/list', None, None
+            if name == 'status':
+                return name, 'GET', '/api/status', None, None
+            if name == 'models_info':
+                return name, 'GET', '/api/models/info', None, None
+            if name == 'feedback_stats':
+                return name, 'GET', '/api/feedback/stats', None, None
+            return name, 'GET', '/api/health', None, None
+
+
+class ResultLog:
+    """Thread-safe record of (start offset, endpoint, zone, latency, status, error)"""
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+
+
+def percentile_summary(latencies_ms, errors, elapsed):
+    latencies = np.asarray(latencies_ms) if latencies_ms else np.zeros(1)
+    count = len(latencies_ms)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': round(errors / count, 4) if count else 0.0,
+        'throughput_rps': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 2),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 2),
+        'max_ms': round(float(latencies.max()), 2)
+    }
+
+
+def summarize(records, elapsed, group_key):
+    groups = defaultdict(lambda: ([], 0))
+    for record in records:
+        key = record[group_key]
+        if key is None:
+            continue
+        latencies, errors = groups[key]
+        latencies.append(record['latency_ms'])
+        groups[key] = (latencies, errors + (0 if record['ok'] else 1))
+    return {key: percentile_summary(latencies, errors, elapsed) for key, (latencies, errors) in sorted(groups.items())}
+
+
+def make_session(workers):
+    """One session shared by all workers, with a connection pool large enough for all of them"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def send(session, base_url, method, path, body, timeout):
+    """Returns (status_code, error or None)"""
+    try:
+        response = session.request(method, f'{base_url}{path}', json=body, timeout=timeout)
+        if response.status_code >= 400:
+            return response.status_code, f'HTTP {response.status_code}: {response.text[:200]}'
+        return response.status_code, None
+    except requests.RequestException as e:
+        return None, str(e)
+
+
+def target_rate(elapsed, start_rps, target_rps, ramp_seconds):
+    if ramp_seconds <= 0 or elapsed >= ramp_seconds:
+        return target_rps
+    return start_rps + (target_rps - start_rps) * elapsed / ramp_seconds
+
+
+def run_load(args, mix):
+    session = make_session(args.workers)
+    log = ResultLog()
+    work = queue.Queue(maxsize=args.workers * 2)
+    stop = object()
+    test_start = time.perf_counter()
+
+    def worker():
+        while True:
+            item = work.get()
+            if item is stop:
+                return
+            name, method, path, body, zone = item
+            start = time.perf_counter()
+            status, error = send(session, args.url, method, path, body, args.timeout)
+            log.add({
+                'offset': start - test_start,
+                'endpoint': name,
+                'zone': zone,
+                'latency_ms': (time.perf_counter() - start) * 1000.0,
+                'status': status,
+                'ok': error is None,
+                'error': error
+            })
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.workers)]
+    for thread in threads:
+        thread.start()
+
+    # Open-loop dispatch: requests are issued on schedule regardless of how long
+    # earlier ones take. If every worker is busy and the queue is full the
+    # request is counted as shed, meaning the client (or server) is saturated.
+    total_seconds = args.ramp_seconds + args.duration
+    shed = 0
+    issued = 0
+    next_send = time.perf_counter()
+    last_report = test_start
+    while True:
+        now = time.perf_counter()
+        elapsed = now - test_start
+        if elapsed >= total_seconds:
+            break
+
+        if now < next_send:
+            time.sleep(min(next_send - now, 0.05))
+            continue
+
+        try:
+            work.put_nowait(mix.next_request())
+            issued += 1
+        except queue.Full:
+            shed += 1
+
+        rate = max(target_rate(elapsed, args.start_rps, args.target_rps, args.ramp_seconds), 0.1)
+        next_send += 1.0 / rate
+
+        if now - last_report >= 5:
+            last_report = now
+            done = len(log.records)
+            print(f"  t={elapsed:5.1f}s  target {rate:6.1f} rps  issued {issued}  completed {done}  shed {shed}")
+
+    for _ in threads:
+        work.put(stop)
+    for thread in threads:
+        thread.join(timeout=args.timeout + 5)
+
+    return log.records, time.perf_counter() - test_start, issued, shed
+
+
+def timeline(records, bucket_seconds=5):
+    """Achieved throughput and latency per time bucket, to see where the ramp starts to hurt"""
+    buckets = defaultdict(list)
+    for record in records:
+        buckets[int(record['offset'] // bucket_seconds)].append(record)
+    rows = []
+    for bucket, items in sorted(buckets.items()):
+        latencies = [r['latency_ms'] for r in items]
+        rows.append({
+            'start_s': bucket * bucket_seconds,
+            'throughput_rps': round(len(items) / bucket_seconds, 2),
+            'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+            'p95_ms': round(float(np.percentile(latencies, 95)), 2),
+            'error_rate': round(sum(1 for r in items if not r['ok']) / len(items), 4)
+        })
+    return rows
+
+
+def print_table(title, stats):
+    print("\n" + "=" * 100)
+    print(title)
+    print("=" * 100)
+    print(f"{'':<40} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'err %':>7}")
+    print("-" * 100)
+    for key, s in stats.items():
+        print(f"{str(key)[:40]:<40} {s['requests']:>7} {s['throughput_rps']:>8.1f} {s['p50_ms']:>9.1f} "
+              f"{s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['errors']:>7} {s['error_rate'] * 100:>6.1f}%")
+
+
+def run_smoke(args, zones):
+    """Send one recommendation per zone concurrently and list the zones that fail"""
+    session = make_session(args.workers)
+    test_time = (datetime.now() + timedelta(days=1)).replace(hour=14, minute=0, second=0, microsecond=0)
+    print(f"Testing {len(zones)} zones at {test_time.strftime('%B %d, %Y at 2:00 PM')}")
+
+    def check(zone):
+        body = {'zone': zone, 'datetime': test_time.isoformat(), 'duration_hours': 2}
+        status, error = send(session, args.url, 'POST', '/api/parking/recommend', body, args.timeout)
+        return {'zone': zone, 'status': 'OK' if error is None else 'ERROR', 'http_status': status, 'error': error}
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(check, zones))
+
+    failed = [r for r in results if r['status'] == 'ERROR']
+    print(f"Successful: {len(results) - len(failed)}/{len(results)}")
+    for r in failed:
+        print(f"  [FAILED] {r['zone']}: {r['error'][:100]}")
+    if not failed:
+        print("All zones working!")
+    return {'smoke': results}
+
+
+def parse_mix(value):
+    weights = dict(DEFAULT_MIX)
+    if value:
+        weights = {name: 0 for name in DEFAULT_MIX}
+        for part in value.split(','):
+            name, weight = part.split('=')
+            if name not in DEFAULT_MIX:
+                raise ValueError(f"Unknown request type '{name}', expected one of {sorted(DEFAULT_MIX)}")
+            weights[name] = float(weight)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load test for the CougarPark API')
+    parser.add_argument('--url', default='http://localhost:5000', help='Base URL of the running API')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent worker threads')
+    parser.add_argument('--target-rps', type=float, default=20.0, help='Request rate to ramp up to')
+    parser.add_argument('--start-rps', type=float, default=1.0, help='Request rate at the start of the ramp')
+    parser.add_argument('--ramp-seconds', type=float, default=30.0, help='Seconds to ramp from start to target rate')
+    parser.add_argument('--duration', type=float, default=60.0, help='Seconds to hold the target rate')
+    parser.add_argument('--mix', default=None,
+                        help=f"Traffic weights, e.g. 'recommend=5,predict_lot=1' (types: {', '.join(DEFAULT_MIX)})")
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--lot-mapping', default=os.path.join(PROJECT_ROOT, 'data', 'lot_mapping_enhanced_with_coords.csv'))
+    parser.add_argument('--smoke', action='store_true', help='Request every zone once instead of a timed load test')
+    parser.add_argument('--output', default=None, help='Write the report as JSON')
+    args = parser.parse_args()
+
+    lot_mapping = pd.read_csv(args.lot_mapping)
+    zones = sorted(z for z in lot_mapping['Zone_Name'].unique() if pd.notna(z))
+    # The API answers lots reserved for University Vehicles, ADA or Guest Pass with 403
+    # (parking_api.is_restricted_zone_type, on a lot's first mapping row); leave them out
+    lot_rows = lot_mapping.dropna(subset=['Lot_number']).drop_duplicates('Lot_number')
+    zone_types = lot_rows['zone_type'].fillna('').astype(str)
+    restricted = zone_types.str.contains('University|ADA|Guest')
+    lots = sorted(int(lot) for lot in lot_rows.loc[~restricted, 'Lot_number'])
+    amp_zones = sorted({name.strip() for value in lot_mapping['alternative_location_description'].dropna()
+                        for name in str(value).split('|') if name.strip()})
+
+    print("=" * 100)
+    print(f"CougarPark load test against {args.url}")
+    print("=" * 100)
+
+    if args.smoke:
+        report = run_smoke(args, zones)
+    else:
+        weights = parse_mix(args.mix)
+        mix = TrafficMix(weights, zones, amp_zones, lots, seed=args.seed)
+        print(f"Workers: {args.workers}  ramp {args.start_rps} -> {args.target_rps} rps over {args.ramp_seconds}s, "
+              f"then hold for {args.duration}s")
+        print(f"Mix: {', '.join(f'{k}={v:g}' for k, v in weights.items() if v)}")
+
+        records, elapsed, issued, shed = run_load(args, mix)
+        endpoint_stats = summarize(records, elapsed, 'endpoint')
+        zone_stats = summarize(records, elapsed, 'zone')
+
+        overall = percentile_summary([r['latency_ms'] for r in records],
+                                     sum(1 for r in records if not r['ok']), elapsed)
+        overall.update({'issued': issued, 'shed': shed, 'elapsed_s': round(elapsed, 2)})
+
+        print_table("BY ENDPOINT", endpoint_stats)
+        print_table("BY ZONE", zone_stats)
+        print_table("OVERALL", {'all requests': overall})
+        if shed:
+            print(f"\n{shed} requests shed: all {args.workers} workers were busy. "
+                  f"Add workers or lower --target-rps to measure the server rather than the client.")
+
+        errors = defaultdict(int)
+        for r in records:
+            if r['error']:
+                errors[f"{r['endpoint']}: {r['error'][:80]}"] += 1
+        if errors:
+            print("\nMost common errors:")
+            for message, count in sorted(errors.items(), key=lambda item: -item[1])[:10]:
+                print(f"  {count:>6}  {message}")
+
+        report = {
+            'config': vars(args),
+            'overall': overall,
+            'by_endpoint': endpoint_stats,
+            'by_zone': zone_stats,
+            'timeline': timeline(records)
+        }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nSaved report to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
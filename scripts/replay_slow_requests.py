@@ -0,0 +1,157 @@
+"""
+Replay captured slow requests against the in-process API
+
+Reads the slow-request log written when tracing is enabled (see "tracing" in
+config.json), sends each captured request through Flask's test client and
+reports the replayed latency and stage timings next to the original ones.
+Feature vectors are compared against the captured ones to show whether the
+inputs to the models have drifted since the request was recorded.
+
+The API's caches (date features, recent forecasts, LPR time patterns and the
+prediction memo) are emptied before every replay, so each one takes the same
+uncached path the captured request did; --warm-caches keeps them instead.
+
+Usage:
+    python scripts/replay_slow_requests.py [--log logs/slow_requests.jsonl] [--repeat 5] [--limit 20]
+                                           [--warm-caches]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+
+def load_entries(log_path):
+    """Read the current log plus its rotated backups, oldest first"""
+    backups = [p for p in glob.glob(f'{log_path}.*') if p.rsplit('.', 1)[-1].isdigit()]
+    paths = sorted(backups, key=lambda p: int(p.rsplit('.', 1)[-1]), reverse=True)
+    if os.path.exists(log_path):
+        paths.append(log_path)
+
+    entries = []
+    for path in paths:
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    return entries
+
+
+def feature_drift(captured, replayed):
+    """Largest absolute difference between captured and replayed numeric features, per model"""
+    drift = {}
+    for before, after in zip(captured, replayed):
+        if before['model'] != after['model'] or before['columns'] != after['columns']:
+            drift[before['model']] = 'schema changed'
+            continue
+
+        max_diff = drift.get(before['model'], 0.0)
+        for row_before, row_after in zip(before['rows'], after['rows']):
+            for a, b in zip(row_before, row_after):
+                try:
+                    max_diff = max(max_diff, abs(float(a) - float(b)))
+                except (TypeError, ValueError):
+                    if str(a) != str(b):
+                        max_diff = float('inf')
+        drift[before['model']] = max_diff
+    return drift
+
+
+def clear_caches(api):
+    """Empty every cache a request can be answered from, so a replay does the full work again"""
+    for cache in (api.date_feature_cache, api.lot_date_feature_cache, api.forecast_cache, api.lpr_pattern_cache):
+        cache.invalidate()
+    if api.prediction_memo is not None:
+        api.prediction_memo.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured slow requests in-process')
+    parser.add_argument('--log', default=os.path.join(PROJECT_ROOT, 'logs', 'slow_requests.jsonl'),
+                        help='Slow-request log (rotated backups are read too)')
+    parser.add_argument('--repeat', type=int, default=3, help='Replays per captured request')
+    parser.add_argument('--limit', type=int, default=None, help='Only replay the N slowest requests')
+    parser.add_argument('--output', default=None, help='Optional JSON file for the replay results')
+    parser.add_argument('--warm-caches', action='store_true',
+                        help='Keep the API caches between replays instead of emptying them first')
+    args = parser.parse_args()
+
+    entries = load_entries(args.log)
+    if not entries:
+        print(f"No captured requests found in {args.log}")
+        return
+
+    entries.sort(key=lambda e: e['total_ms'], reverse=True)
+    if args.limit:
+        entries = entries[:args.limit]
+
+    print(f"Loaded {len(entries)} captured requests, loading API...")
+    import parking_api
+
+    # Trace every replay but don't write the replays back into the slow log
+    tracer = parking_api.request_tracer
+    tracer.enabled = True
+    tracer._slow_log = None
+
+    client = parking_api.app.test_client()
+    results = []
+
+    print("=" * 80)
+    for entry in entries:
+        timings = []
+        trace = None
+        status = None
+        for _ in range(max(1, args.repeat)):
+            if not args.warm_caches:
+                clear_caches(parking_api)
+            start = time.perf_counter()
+            response = client.open(entry['path'], method=entry['method'], json=entry.get('body'))
+            timings.append((time.perf_counter() - start) * 1000.0)
+            status = response.status_code
+            trace = tracer.last_trace()
+
+        replay = {
+            'method': entry['method'],
+            'path': entry['path'],
+            'body': entry.get('body'),
+            'captured_at': entry.get('timestamp'),
+            'original_ms': entry['total_ms'],
+            'original_status': entry.get('status'),
+            'replay_status': status,
+            'replay_p50_ms': round(float(np.percentile(timings, 50)), 3),
+            'replay_max_ms': round(max(timings), 3),
+            'original_stages_ms': entry.get('stages_ms', {}),
+            'replay_stages_ms': trace.stage_ms() if trace else {},
+            'feature_drift': feature_drift(entry.get('features', []), trace.features if trace else [])
+        }
+        results.append(replay)
+
+        print(f"{entry['method']} {entry['path']}  status {replay['original_status']} -> {status}")
+        print(f"  body: {json.dumps(entry.get('body'))[:120]}")
+        print(f"  original {entry['total_ms']:.1f} ms | replay p50 {replay['replay_p50_ms']:.1f} ms, max {replay['replay_max_ms']:.1f} ms")
+        stages = sorted(set(replay['original_stages_ms']) | set(replay['replay_stages_ms']))
+        for stage in stages:
+            before = replay['original_stages_ms'].get(stage, 0.0)
+            after = replay['replay_stages_ms'].get(stage, 0.0)
+            print(f"    {stage:<28} {before:>10.2f} ms -> {after:>10.2f} ms")
+        if replay['feature_drift']:
+            print(f"  feature drift (max abs diff): {replay['feature_drift']}")
+        print("-" * 80)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"Saved replay results to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
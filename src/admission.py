@@ -0,0 +1,94 @@
+"""Admission control for model inference under overload"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Tiers a prediction can be served from, best first
+TIER_MODEL = 'model'
+TIER_CACHE = 'cache'
+TIER_HEATMAP = 'heatmap'
+TIER_TIME_PATTERN = 'time_pattern'
+TIER_ORDER = [TIER_MODEL, TIER_CACHE, TIER_HEATMAP, TIER_TIME_PATTERN]
+
+
+def worst_tier(tiers):
+    """Lowest-quality tier among those used for one response"""
+    return max(tiers, key=TIER_ORDER.index, default=TIER_MODEL)
+
+
+class AdmissionController:
+    """
+    Decide per request whether it may run full model inference
+
+    A request is shed (answered from cheaper tiers instead) when too many
+    requests are already inferring, when the batching schedulers have too many
+    rows queued, or when the recent inference latency (an exponentially
+    weighted average) is over the budget. While shedding for latency, one
+    request per probe_interval_s is still admitted so the average can recover.
+    """
+
+    def __init__(self, max_in_flight=32, max_queue_depth=256, latency_budget_ms=250.0,
+                 probe_interval_s=1.0, ewma_alpha=0.2, queue_depth_fn=None):
+        self.max_in_flight = int(max_in_flight)
+        self.max_queue_depth = int(max_queue_depth)
+        self.latency_budget_s = float(latency_budget_ms) / 1000.0
+        self.probe_interval_s = float(probe_interval_s)
+        self.ewma_alpha = float(ewma_alpha)
+        self.queue_depth_fn = queue_depth_fn or (lambda: 0)
+
+        self.in_flight = 0
+        self.latency_ewma_s = 0.0
+        self.admitted = 0
+        self.shed = {'in_flight': 0, 'queue_depth': 0, 'latency': 0}
+
+        self._lock = threading.Lock()
+        self._last_probe = 0.0
+
+    def _shed_reason(self):
+        if self.in_flight >= self.max_in_flight:
+            return 'in_flight'
+        if self.queue_depth_fn() >= self.max_queue_depth:
+            return 'queue_depth'
+        if self.latency_ewma_s > self.latency_budget_s:
+            now = time.monotonic()
+            if now - self._last_probe < self.probe_interval_s:
+                return 'latency'
+            self._last_probe = now
+        return None
+
+    @contextmanager
+    def admit(self):
+        """Context manager yielding True if the request may use the models"""
+        with self._lock:
+            reason = self._shed_reason()
+            if reason is None:
+                self.in_flight += 1
+                self.admitted += 1
+            else:
+                self.shed[reason] += 1
+
+        if reason is not None:
+            yield False
+            return
+
+        start = time.perf_counter()
+        try:
+            yield True
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.latency_ewma_s += self.ewma_alpha * (elapsed - self.latency_ewma_s)
+
+    def stats(self):
+        return {
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth_fn(),
+            'latency_ewma_ms': round(self.latency_ewma_s * 1000.0, 2),
+            'latency_budget_ms': self.latency_budget_s * 1000.0,
+            'max_in_flight': self.max_in_flight,
+            'max_queue_depth': self.max_queue_depth,
+            'admitted': self.admitted,
+            'shed': dict(self.shed)
+        }
@@ -0,0 +1,122 @@
+"""Bounded in-process caches"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a fixed number of entries
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, name, maxsize=512):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute_fn):
+        """Cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Computed outside the lock; two threads missing on the same key at
+        # once both compute it, which is harmless for pure functions
+        value = compute_fn()
+        self.put(key, value)
+        return value
+
+    def invalidate(self, predicate=None):
+        """Drop every entry (or those whose key matches predicate), returns how many"""
+        with self._lock:
+            if predicate is None:
+                dropped = len(self._data)
+                self._data.clear()
+            else:
+                keys = [key for key in self._data if predicate(key)]
+                for key in keys:
+                    del self._data[key]
+                dropped = len(keys)
+        return dropped
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'entries': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+class PredictionMemo:
+    """
+    Model outputs memoized by feature vector
+
+    Rows are keyed by their feature values rounded to `decimals` places, so
+    requests for different zones/times that end up with the same feature vector
+    (e.g. future hours with all-zero lags) reuse one model output. Keys also
+    carry a model tag (e.g. kind and bundle version) so outputs of different
+    models never mix.
+    """
+
+    def __init__(self, name, maxsize=100000, decimals=6):
+        self.decimals = int(decimals)
+        self.cache = LRUCache(name, maxsize)
+
+    def row_keys(self, tag, features_df):
+        values = np.round(features_df.to_numpy(dtype=np.float64), self.decimals)
+        values += 0.0  # -0.0 and 0.0 share a key
+        return [(tag, row.tobytes()) for row in values]
+
+    def predict(self, tag, features_df, predict_fn):
+        """Outputs for every row, calling predict_fn(rows_df) once for the rows not cached"""
+        keys = self.row_keys(tag, features_df)
+        outputs = [self.cache.get(key) for key in keys]
+        missing = [i for i, output in enumerate(outputs) if output is None]
+
+        if missing:
+            computed = np.asarray(predict_fn(features_df.iloc[missing] if len(missing) < len(keys) else features_df))
+            for i, output in zip(missing, computed):
+                outputs[i] = output
+                self.cache.put(keys[i], output)
+        return np.asarray(outputs)
+
+    def clear(self):
+        return self.cache.invalidate()
+
+    def stats(self):
+        return dict(self.cache.stats(), decimals=self.decimals)
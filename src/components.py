@@ -0,0 +1,77 @@
+"""Datasets and derived structures loaded on first use"""
+
+import threading
+import time
+
+
+class ComponentRegistry:
+    """
+    Named components, each built by its loader the first time it is used
+
+    components.get('name') (or components.name) runs the loader once, even
+    when several requests need the component at the same moment, and records
+    how long it took. Loaders may use other components. set() replaces a
+    component's value, e.g. when live ingestion swaps in a new history frame.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._values = {}
+        self._lock = threading.RLock()
+        self.load_seconds = {}
+        self.errors = {}
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+
+    def get(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._values:
+                start = time.perf_counter()
+                try:
+                    value = self._loaders[name]()
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    raise
+                self.load_seconds[name] = round(time.perf_counter() - start, 3)
+                self.errors.pop(name, None)
+                self._values[name] = value
+            return self._values[name]
+
+    def __getattr__(self, name):
+        if not name.startswith('_') and name in self.__dict__.get('_loaders', {}):
+            return self.get(name)
+        raise AttributeError(name)
+
+    def set(self, name, value):
+        with self._lock:
+            self._values[name] = value
+
+    def is_loaded(self, name):
+        return name in self._values
+
+    def peek(self, name):
+        """Component if it has been loaded, else None (never triggers a load)"""
+        return self._values.get(name)
+
+    def warm(self, names=None):
+        """Load components now (all registered ones by default); failures are logged, not raised"""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Warning: could not load {name}: {e}")
+
+    def stats(self):
+        return {
+            name: {
+                'loaded': name in self._values,
+                'load_seconds': self.load_seconds.get(name),
+                'error': self.errors.get(name)
+            }
+            for name in self._loaders
+        }
@@ -1,19 +1,232 @@
 """Feature engineering for parking prediction"""
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+from caching import LRUCache
+from metrics import timed_stage
+
+# Encoded time_of_day for each hour of the day:
+# Afternoon 0 (12-17), Evening 1 (18-21), Late Night 2 (0-5), Morning 3 (6-11), Night 4 (22-23)
+TIME_OF_DAY_CODES = tuple(
+    3 if 6 <= hour < 12 else
+    0 if 12 <= hour < 18 else
+    1 if 18 <= hour < 22 else
+    4 if 22 <= hour < 24 else
+    2
+    for hour in range(24)
+)
+
+# What-if inputs: calendar flags that can be forced on or off, and weather
+# measurements with the thresholds the weather data derives its flags from
+BREAK_FLAGS = ('is_spring_break', 'is_thanksgiving_break', 'is_winter_break')
+CALENDAR_FLAGS = ('is_game_day', 'is_dead_week', 'is_finals_week') + BREAK_FLAGS
+WEATHER_FLAGS = ('is_rainy', 'is_snowy', 'is_cold', 'is_hot', 'is_windy')
+WEATHER_MEASUREMENTS = {
+    # input name: (feature it sets or None, ((flag it implies, test), ...))
+    'temp_f': ('temp_mean_f', (('is_cold', lambda f: f < 32), ('is_hot', lambda f: f > 80))),
+    'precipitation': ('precipitation_inches', (('is_rainy', lambda inches: inches > 0.05),)),
+    'snowfall': (None, (('is_snowy', lambda inches: inches > 0.05),)),
+    'wind_mph': (None, (('is_windy', lambda mph: mph > 20),))
+}
+
+
+def parse_date_overrides(spec):
+    """
+    Date-feature values forced by a request's what-if inputs ({} for none)
+
+    spec may hold any of CALENDAR_FLAGS as booleans and "weather" as
+    {"temp_f", "precipitation", "snowfall", "wind_mph"} plus any of
+    WEATHER_FLAGS. Measurements imply their flags (see WEATHER_MEASUREMENTS)
+    unless the flag is given as well.
+    Raises ValueError for unknown weather inputs or non-numeric values.
+    """
+    overrides = {}
+    for flag in CALENDAR_FLAGS:
+        if spec.get(flag) is not None:
+            overrides[flag] = int(bool(spec[flag]))
+
+    weather = spec.get('weather') or {}
+    if not isinstance(weather, dict):
+        raise ValueError("weather must be an object")
+    unknown = set(weather) - set(WEATHER_MEASUREMENTS) - set(WEATHER_FLAGS)
+    if unknown:
+        raise ValueError(f"Unknown weather inputs: {', '.join(sorted(unknown))}")
+
+    for name, (feature, flags) in WEATHER_MEASUREMENTS.items():
+        if weather.get(name) is None:
+            continue
+        try:
+            value = float(weather[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"weather.{name} must be a number")
+        if feature is not None:
+            overrides[feature] = value
+        for flag, test in flags:
+            overrides[flag] = int(test(value))
+    for flag in WEATHER_FLAGS:
+        if weather.get(flag) is not None:
+            overrides[flag] = int(bool(weather[flag]))
+    return overrides
+
+
+def apply_date_overrides(features_df, overrides):
+    """Copy of a feature matrix with the overridden columns set on every row"""
+    if not overrides:
+        return features_df
+    features_df = features_df.copy()
+    for name, value in overrides.items():
+        if name in features_df.columns:
+            features_df[name] = value
+    # is_any_break follows the break flags unless it is forced itself
+    if ('is_any_break' in features_df.columns and 'is_any_break' not in overrides
+            and any(flag in overrides for flag in BREAK_FLAGS)
+            and all(flag in features_df.columns for flag in BREAK_FLAGS)):
+        features_df['is_any_break'] = features_df[list(BREAK_FLAGS)].any(axis=1).astype(np.int64)
+    return features_df
+
+
+class ZoneHistoryIndex:
+    """
+    Row positions of every zone in one history frame, plus per-zone constants
+
+    Built once per frame, so lookups take a zone's rows directly instead of
+    scanning the whole history with a boolean mask. Ingested rows do not copy
+    the frame: appended() returns an index that shares it, keeps the new rows
+    in a small tail frame and re-indexes only the zones they belong to.
+    Readers holding the previous index are unaffected.
+    """
+
+    def __init__(self, frame, column, positions=None, constants=None):
+        self.frame = frame
+        self.column = column
+        if positions is None:
+            positions = frame.groupby(column, observed=True, sort=False).indices if column else {}
+        self.positions = positions
+        self._empty = frame.iloc[0:0]
+        self._constants = dict(constants) if constants else {}
+        # Appended rows (see appended()) and each zone's positions in them
+        self.tail = None
+        self.tail_positions = {}
+        # Rows before window_start are out of the history, whichever frame holds them
+        self.window_start = None
+
+    def keys(self):
+        """Every zone with rows in the frame or the tail"""
+        return list(self.positions) + [key for key in self.tail_positions if key not in self.positions]
+
+    def _frame_positions(self, key):
+        """Positions of the zone's rows in frame inside the window (None for an unknown zone)"""
+        positions = self.positions.get(key)
+        if positions is None or self.window_start is None:
+            return positions
+
+        def by_time():
+            times = self.frame['datetime'].to_numpy(dtype='datetime64[ns]')[positions]
+            order = np.argsort(times, kind='stable')
+            return positions[order], times[order]
+
+        # Evicting is moving the boundary: the sorted positions are kept across windows
+        ordered, times = self.constant(key, 'by_time', by_time)
+        return ordered[np.searchsorted(times, self.window_start.to_datetime64()):]
+
+    def rows(self, key):
+        """The zone's rows, in their original order (oldest first once a window is set), appended rows last"""
+        positions = self._frame_positions(key)
+        rows = self._empty if positions is None else self.frame.iloc[positions]
+        tail_positions = self.tail_positions.get(key)
+        if tail_positions is None:
+            return rows
+        tail_rows = self.tail.iloc[tail_positions]
+        if self.window_start is not None:
+            tail_rows = tail_rows[tail_rows['datetime'] >= self.window_start]
+        return pd.concat([rows, tail_rows], ignore_index=True) if len(rows) else tail_rows
+
+    def rows_sorted(self, key, column):
+        """The zone's rows sorted by column (same order as rows(key).sort_values(column))"""
+        if key in self.tail_positions:
+            rows = self.rows(key)
+            order = self.constant(key, f'sorted_by_{column}',
+                                  lambda: np.argsort(rows[column].to_numpy(), kind='quicksort'))
+            return rows.iloc[order]
+
+        def sorted_positions():
+            positions = self._frame_positions(key)
+            if positions is None:
+                return None
+            return positions[np.argsort(self.frame[column].to_numpy()[positions], kind='quicksort')]
+
+        positions = self.constant(key, f'sorted_by_{column}', sorted_positions)
+        return self._empty if positions is None else self.frame.iloc[positions]
+
+    def constant(self, key, name, compute_fn):
+        """Value computed once per (zone, name) for this frame"""
+        cache_key = (key, name)
+        if cache_key not in self._constants:
+            self._constants[cache_key] = compute_fn()
+        return self._constants[cache_key]
+
+    def appended(self, records, window_start=None):
+        """
+        New index with records added; they replace rows of the same zone and datetime
+
+        Only the zones in records lose their constants (with the ones across
+        zones, keyed by None), and only their positions are rebuilt. A later
+        window_start evicts older rows from every zone without copying
+        anything; constants then keep just the time order.
+        """
+        records = records.drop_duplicates(subset=[self.column, 'datetime'], keep='last')
+        records = records.reindex(columns=self.frame.columns).reset_index(drop=True)
+        moved = window_start is not None and window_start != self.window_start
+        touched = set(records[self.column])
+
+        index = ZoneHistoryIndex(self.frame, self.column, dict(self.positions), {
+            (key, name): value for (key, name), value in self._constants.items()
+            if key is not None and key not in touched and (name == 'by_time' or not moved)
+        })
+        index.window_start = window_start if moved else self.window_start
+        offset = 0 if self.tail is None else len(self.tail)
+        index.tail = records if self.tail is None else pd.concat([self.tail, records], ignore_index=True)
+        index.tail_positions = dict(self.tail_positions)
+
+        tail_times = index.tail['datetime'].to_numpy(dtype='datetime64[ns]')
+        for key, at in records.groupby(self.column, sort=False).indices.items():
+            replaced = tail_times[at + offset]
+            positions = index.positions.get(key)
+            if positions is not None:
+                frame_times = self.frame['datetime'].to_numpy(dtype='datetime64[ns]')[positions]
+                index.positions[key] = positions[~np.isin(frame_times, replaced)]
+            previous = index.tail_positions.get(key)
+            if previous is not None:
+                previous = previous[~np.isin(tail_times[previous], replaced)]
+                at = np.concatenate([previous, at + offset])
+            else:
+                at = at + offset
+            index.tail_positions[key] = at
+        return index
+
+
 class FeatureEngineer:
     """Prepare features for occupancy prediction"""
 
     def __init__(self, calendar_df, games_df, weather_df, zone_capacity_dict,
-                 occupancy_history_2025=None, enforcement_history=None):
+                 occupancy_history_2025=None, enforcement_history=None, date_cache=None):
         self.calendar = calendar_df
         self.games = games_df
         self.weather = weather_df
         self.zone_capacity_dict = zone_capacity_dict
         self.occupancy_history = occupancy_history_2025
         self.enforcement_history = enforcement_history
+        # Engineers built from the same calendar/games/weather frames can share one cache
+        self.date_cache = date_cache if date_cache is not None else LRUCache('date_features')
+
+        # Per-zone history indexes (rebuilt when a history frame is replaced,
+        # extended by append_history when rows are ingested),
+        # encoder class -> code lookup, and feature-row templates per zone
+        self._history_indexes = {}
+        self._encoder_codes = (None, {})
+        self._row_templates = LRUCache('feature_row_templates', 4096)
 
         # Detect whether enforcement_history uses Zone or Lot_Name
         if enforcement_history is not None:
@@ -35,48 +248,286 @@ class FeatureEngineer:
         else:
             self.weather['date'] = pd.to_datetime(self.weather['datetime']).dt.date
 
-    def create_features(self, zone, dt, zone_encoder):
-        """Create feature vector for prediction"""
+    @staticmethod
+    def _naive_timestamp(dt):
         if isinstance(dt, str):
             dt = pd.to_datetime(dt)
 
         # Remove timezone info to avoid tz-naive vs tz-aware comparison issues
         if dt.tz is not None:
             dt = dt.tz_localize(None)
+        return dt
+
+    @timed_stage('create_features')
+    def create_features(self, zone, dt, zone_encoder):
+        """Create feature vector for prediction"""
+        dt = self._naive_timestamp(dt)
+
+        features = self._time_features(dt)
+
+        # Calendar and weather features only depend on the date, so they are
+        # computed once per date and shared by every zone and hour
+        date_normalized = pd.Timestamp(dt).normalize()
+        features.update(self.date_features(date_normalized))
+
+        features.update(self._zone_features(zone, zone_encoder))
+        features.update(self._history_features(zone, dt))
+        return features
+
+    @timed_stage('create_features')
+    def create_feature_row(self, zone, dt, zone_encoder, feature_names):
+        """
+        Feature values for one prediction, in feature_names order
+
+        Starts from a copy of the zone's template row, which already holds the
+        zone constants, and fills in only the time-dependent features. Equivalent
+        to features_to_array(create_features(...)) without building the dict.
+        """
+        dt = self._naive_timestamp(dt)
+        template, slots = self._row_template(zone, zone_encoder, feature_names)
+
+        row = list(template)
+        for block in (self._time_features(dt),
+                      self.date_features(pd.Timestamp(dt).normalize()),
+                      self._history_features(zone, dt)):
+            for name, value in block.items():
+                slot = slots.get(name)
+                if slot is not None:
+                    row[slot] = value
+        return row
+
+    @timed_stage('features_to_array')
+    def rows_to_frame(self, rows, feature_names):
+        """DataFrame of rows from create_feature_row"""
+        return pd.DataFrame(rows, columns=feature_names)
+
+    def create_feature_frame(self, zones, dts, zone_encoder, feature_names):
+        """
+        Feature matrix of many (zone, datetime) rows, for offline replays
+
+        Same values as rows_to_frame([create_feature_row(...) for each row]),
+        but built a zone at a time: features that only depend on the day of
+        week and hour are computed once per zone for each of those, date
+        features once per date, and the hour-by-hour enforcement lags are
+        looked up for all of a zone's rows at once.
+        """
+        dts = pd.DatetimeIndex(dts)
+        if dts.tz is not None:
+            dts = dts.tz_localize(None)
+        zones = np.asarray(zones, dtype=object)
+        n = len(zones)
+
+        hours = dts.hour.to_numpy()
+        days_of_week = dts.dayofweek.to_numpy()
+        columns = {
+            'hour': hours,
+            'day_of_week': days_of_week,
+            'month': dts.month.to_numpy(),
+            'year': dts.year.to_numpy(),
+            'is_weekend': (days_of_week >= 5).astype(np.int64),
+            'time_of_day_code': np.asarray(TIME_OF_DAY_CODES)[hours]
+        }
 
+        date_codes, dates = pd.factorize(dts.normalize())
+        date_rows = pd.DataFrame([self.date_features(date) for date in dates])
+        for name in date_rows.columns:
+            columns[name] = date_rows[name].to_numpy()[date_codes]
+
+        history = {}
+
+        def history_column(name):
+            if name not in history:
+                history[name] = np.zeros(n)
+            return history[name]
+
+        for zone, positions in pd.Series(np.arange(n)).groupby(zones, sort=False).indices.items():
+            zone_columns = self._zone_features(zone, zone_encoder)
+
+            # Occupancy lags and enforcement estimates only depend on (day of week, hour)
+            slots = days_of_week[positions].astype(np.int64) * 24 + hours[positions]
+            for slot in np.unique(slots):
+                dt = pd.Timestamp(2024, 1, 1) + timedelta(days=int(slot // 24), hours=int(slot % 24))
+                at_slot = positions[slots == slot]
+                for block in (self._compute_lag_features(zone, dt), self._compute_enforcement_features(zone, dt)):
+                    for name, value in block.items():
+                        history_column(name)[at_slot] = value
+
+            zone_columns.update(self._enforcement_lag_columns(zone, dts[positions]))
+            for name, value in zone_columns.items():
+                history_column(name)[positions] = value
+        columns.update(history)
+
+        return pd.DataFrame({name: columns[name] if name in columns else np.zeros(n, dtype=np.int64)
+                             for name in feature_names})
+
+    def _enforcement_lag_columns(self, zone, dts):
+        """_compute_enforcement_lag_features of one zone at many datetimes, as arrays"""
+        n = len(dts)
+        columns = {name: np.zeros(n) for name in (
+            'enforcement_lag_1', 'tickets_lag_1', 'enforcement_lag_24', 'tickets_lag_24',
+            'enforcement_rolling_3', 'enforcement_rolling_24', 'tickets_rolling_24', 'enforcement_dow_hour_avg'
+        )}
+        if self.enforcement_history is None or self.enforcement_lookup_col is None:
+            return columns
+        zone_history = self._history_index('enforcement').rows_sorted(zone, 'datetime')
+        if len(zone_history) == 0:
+            return columns
+
+        times = zone_history['datetime'].to_numpy(dtype='datetime64[ns]')
+        tickets = zone_history['tickets_issued'].to_numpy(dtype=np.float64)
+        ticketed = tickets > 0
+        queries = dts.to_numpy(dtype='datetime64[ns]')
+
+        # Per distinct datetime: rows, rows with a ticket, tickets issued and the first row's tickets
+        distinct, first, counts = np.unique(times, return_index=True, return_counts=True)
+        ticketed_rows = np.add.reduceat(ticketed.astype(np.int64), first)
+        ticket_sums = np.add.reduceat(np.nan_to_num(tickets), first)
+        first_tickets = tickets[first]
+
+        def hours_before(k):
+            """(positions into distinct, found) of each query's datetime minus k hours"""
+            target = queries - np.timedelta64(k, 'h')
+            pos = np.minimum(np.searchsorted(distinct, target), len(distinct) - 1)
+            return pos, distinct[pos] == target
+
+        for k, suffix in ((1, '1'), (24, '24')):
+            pos, found = hours_before(k)
+            columns[f'enforcement_lag_{suffix}'][found] = (first_tickets[pos[found]] > 0).astype(np.float64)
+            columns[f'tickets_lag_{suffix}'][found] = first_tickets[pos[found]]
+
+        rows, with_ticket, issued = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64), np.zeros(n)
+        for k in range(1, 25):
+            pos, found = hours_before(k)
+            rows += np.where(found, counts[pos], 0)
+            with_ticket += np.where(found, ticketed_rows[pos], 0)
+            issued += np.where(found, ticket_sums[pos], 0.0)
+            if k == 3:
+                has_rows = rows > 0
+                columns['enforcement_rolling_3'][has_rows] = with_ticket[has_rows] / rows[has_rows]
+        has_rows = rows > 0
+        columns['enforcement_rolling_24'][has_rows] = with_ticket[has_rows] / rows[has_rows]
+        columns['tickets_rolling_24'][has_rows] = issued[has_rows]
+
+        # Earlier rows at the same day of week and hour (by the history's own columns)
+        history_slots = (zone_history['day_of_week'].to_numpy(dtype=np.int64) * 24
+                         + zone_history['hour'].to_numpy(dtype=np.int64))
+        query_slots = dts.dayofweek.to_numpy(dtype=np.int64) * 24 + dts.hour.to_numpy(dtype=np.int64)
+        for slot in np.unique(query_slots):
+            in_slot = history_slots == slot
+            if not in_slot.any():
+                continue
+            at_slot = np.flatnonzero(query_slots == slot)
+            earlier = np.searchsorted(times[in_slot], queries[at_slot], side='left')
+            ticketed_so_far = np.concatenate([[0], np.cumsum(ticketed[in_slot])])
+            has_rows = earlier > 0
+            columns['enforcement_dow_hour_avg'][at_slot[has_rows]] = (
+                ticketed_so_far[earlier[has_rows]] / earlier[has_rows]
+            )
+        return columns
+
+    def _encode_zone(self, zone, zone_encoder):
+        """zone_encoder.transform([zone])[0] via a dict, 0 for zones it doesn't know"""
+        encoder, codes = self._encoder_codes
+        if encoder is not zone_encoder:
+            classes = getattr(zone_encoder, 'classes_', [])
+            codes = {name: code for code, name in enumerate(classes)}
+            self._encoder_codes = (zone_encoder, codes)
+        return codes.get(zone, 0)
+
+    def _zone_features(self, zone, zone_encoder):
+        return {
+            'Max_Capacity': self.zone_capacity_dict.get(zone, 100),
+            'Zone_encoded': self._encode_zone(zone, zone_encoder)
+        }
+
+    def _row_template(self, zone, zone_encoder, feature_names):
+        """(template row with the zone constants filled in, feature name -> position)"""
+        # Keyed by identity; the entry keeps the encoder and feature list alive so ids aren't reused
+        key = (zone, id(zone_encoder), id(feature_names))
+        entry = self._row_templates.get(key)
+        if entry is None:
+            constants = self._zone_features(zone, zone_encoder)
+            template = tuple(constants.get(name, 0) for name in feature_names)
+            slots = {name: i for i, name in enumerate(feature_names)}
+            entry = (template, slots, zone_encoder, feature_names)
+            self._row_templates.put(key, entry)
+        return entry[0], entry[1]
+
+    def _history_source(self, kind):
+        if kind == 'occupancy':
+            return self.occupancy_history, 'Zone'
+        return self.enforcement_history, self.enforcement_lookup_col
+
+    def _history_index(self, kind):
+        """ZoneHistoryIndex of the current occupancy or enforcement history"""
+        frame, column = self._history_source(kind)
+        index = self._history_indexes.get(kind)
+        if index is None or index.frame is not frame:
+            index = ZoneHistoryIndex(frame, column)
+            self._history_indexes[kind] = index
+        return index
+
+    def append_history(self, kind, records):
+        """Add ingested rows to the occupancy or enforcement history; only their zones are re-indexed"""
+        self._history_indexes[kind] = self._history_index(kind).appended(records)
+
+    def history_zones(self, kind):
+        """Zones with rows in the occupancy or enforcement history, ingested rows included"""
+        return self._history_index(kind).keys()
+
+    def export_history_indexes(self, frames):
+        """Zone positions and per-zone constants of the indexes built over frames (kind -> frame)"""
+        # Indexes holding ingested rows don't describe the frame alone
+        return {
+            kind: {'positions': index.positions, 'constants': dict(index._constants)}
+            for kind, index in self._history_indexes.items()
+            if index.frame is frames.get(kind) and index.tail is None
+        }
+
+    def import_history_indexes(self, states):
+        """Reinstall indexes exported over history frames with the same rows as the current ones"""
+        for kind, state in states.items():
+            frame, column = self._history_source(kind)
+            if frame is not None:
+                self._history_indexes[kind] = ZoneHistoryIndex(frame, column, state['positions'], state['constants'])
+
+    def _history_features(self, zone, dt):
+        """Occupancy and enforcement features derived from the zone's history"""
         features = {}
 
-        features['hour'] = dt.hour
-        features['day_of_week'] = dt.dayofweek
-        features['month'] = dt.month
-        features['year'] = dt.year
-        features['is_weekend'] = 1 if dt.dayofweek >= 5 else 0
-
-        # Add time_of_day categorization
-        hour = dt.hour
-        if 6 <= hour < 12:
-            time_of_day = 'Morning'
-        elif 12 <= hour < 18:
-            time_of_day = 'Afternoon'
-        elif 18 <= hour < 22:
-            time_of_day = 'Evening'
-        elif 22 <= hour < 24:
-            time_of_day = 'Night'
-        else:  # 0-5
-            time_of_day = 'Late Night'
-
-        # Encode time_of_day 
-        time_of_day_map = {
-            'Afternoon': 0,
-            'Evening': 1,
-            'Late Night': 2,
-            'Morning': 3,
-            'Night': 4
+        # Compute occupancy lag features
+        occupancy_lag_features = self._compute_lag_features(zone, dt)
+        features.update(occupancy_lag_features)
+
+        # Compute enforcement lag features
+        enforcement_lag_features = self._compute_enforcement_lag_features(zone, dt)
+        features.update(enforcement_lag_features)
+
+        # Compute enforcement-specific features 
+        enforcement_features = self._compute_enforcement_features(zone, dt)
+        features.update(enforcement_features)
+
+        return features
+
+    def _time_features(self, dt):
+        """Temporal features of one hour"""
+        return {
+            'hour': dt.hour,
+            'day_of_week': dt.dayofweek,
+            'month': dt.month,
+            'year': dt.year,
+            'is_weekend': 1 if dt.dayofweek >= 5 else 0,
+            'time_of_day_code': TIME_OF_DAY_CODES[dt.hour]
         }
-        features['time_of_day_code'] = time_of_day_map[time_of_day]
 
-        # Normalize datetime to midnight for date comparisons
-        date_normalized = pd.Timestamp(dt).normalize()
+    def date_features(self, date_normalized):
+        """Game day, academic calendar and weather features of a date (cached, read-only)"""
+        return self.date_cache.get_or_compute(
+            date_normalized, lambda: self._compute_date_features(date_normalized)
+        )
+
+    def _compute_date_features(self, date_normalized):
+        features = {}
         features['is_game_day'] = int(date_normalized in self.games['Date'].values)
 
         for event_type in ['Dead_Week', 'Finals_Week', 'Spring_Break',
@@ -116,27 +567,28 @@ class FeatureEngineer:
             features['is_hot'] = 0
             features['is_windy'] = 0
 
-        features['Max_Capacity'] = self.zone_capacity_dict.get(zone, 100)
-
-        try:
-            features['Zone_encoded'] = zone_encoder.transform([zone])[0]
-        except:
-            features['Zone_encoded'] = 0
-
-        # Compute occupancy lag features
-        occupancy_lag_features = self._compute_lag_features(zone, dt)
-        features.update(occupancy_lag_features)
-
-        # Compute enforcement lag features
-        enforcement_lag_features = self._compute_enforcement_lag_features(zone, dt)
-        features.update(enforcement_lag_features)
-
-        # Compute enforcement-specific features 
-        enforcement_features = self._compute_enforcement_features(zone, dt)
-        features.update(enforcement_features)
-
         return features
 
+    def dow_hour_enforcement_rate(self, zone, dt):
+        """Historical share of hours with a ticket in the zone on this day of week and hour"""
+        if self.enforcement_history is None or self.enforcement_lookup_col is None:
+            return 0.0
+        index = self._history_index('enforcement')
+        table = index.constant(zone, 'dow_hour_rate', lambda: self._dow_hour_rate_table(index.rows(zone)))
+        return float(table[dt.dayofweek, dt.hour])
+
+    @staticmethod
+    def _dow_hour_rate_table(zone_history):
+        table = np.zeros((7, 24))
+        if len(zone_history) > 0:
+            rates = (zone_history['tickets_issued'] > 0).groupby(
+                [zone_history['day_of_week'], zone_history['hour']]
+            ).mean()
+            for (day_of_week, hour), rate in rates.items():
+                table[int(day_of_week), int(hour)] = rate
+        return table
+
+    @timed_stage('occupancy_history_filter')
     def _compute_lag_features(self, zone, dt):
         """Compute lag features from 2025 historical averages"""
         lag_features = {
@@ -150,10 +602,9 @@ class FeatureEngineer:
         if self.occupancy_history is None:
             return lag_features
 
-        # Filter to this zone
-        zone_history = self.occupancy_history[
-            self.occupancy_history['Zone'] == zone
-        ]
+        # Rows of this zone
+        index = self._history_index('occupancy')
+        zone_history = index.rows(zone)
 
         if len(zone_history) == 0:
             return lag_features
@@ -174,7 +625,9 @@ class FeatureEngineer:
         if len(rolling_data) > 0:
             lag_features['occupancy_rolling_3'] = rolling_data[occupancy_col].mean()
 
-        lag_features['occupancy_rolling_24'] = zone_history[occupancy_col].mean()
+        lag_features['occupancy_rolling_24'] = index.constant(
+            zone, 'rolling_24', lambda: zone_history[occupancy_col].mean()
+        )
 
         dow_hour_data = zone_history[
             (zone_history['day_of_week'] == dt.dayofweek) &
@@ -187,6 +640,7 @@ class FeatureEngineer:
 
         return lag_features
 
+    @timed_stage('enforcement_history_filter')
     def _compute_enforcement_lag_features(self, zone, dt):
         """Compute enforcement lag features from historical enforcement data"""
         lag_features = {
@@ -203,17 +657,12 @@ class FeatureEngineer:
         if self.enforcement_history is None or self.enforcement_lookup_col is None:
             return lag_features
 
-        # Filter to this zone or lot 
-        zone_history = self.enforcement_history[
-            self.enforcement_history[self.enforcement_lookup_col] == zone
-        ]
+        # Rows of this zone or lot, sorted by datetime for lag calculations
+        zone_history = self._history_index('enforcement').rows_sorted(zone, 'datetime')
 
         if len(zone_history) == 0:
             return lag_features
 
-        # Sort by datetime for lag calculations
-        zone_history = zone_history.sort_values('datetime')
-
         # 1. Lag 1 hour 
         lag_1_hour = dt - timedelta(hours=1)
         prev_hour_data = zone_history[zone_history['datetime'] == lag_1_hour]
@@ -254,6 +703,7 @@ class FeatureEngineer:
 
         return lag_features
 
+    @timed_stage('enforcement_history_filter')
     def _compute_enforcement_features(self, zone, dt):
         """
         Compute enforcement-specific features that model expects
@@ -273,15 +723,16 @@ class FeatureEngineer:
             return features
 
         # Calculate zone/lot average enforcement rate 
-        zone_history = self.enforcement_history[
-            self.enforcement_history[self.enforcement_lookup_col] == zone
-        ]
+        index = self._history_index('enforcement')
+        zone_history = index.rows(zone)
 
         if len(zone_history) == 0:
             return features
 
         # Zone average enforcement (mean enforcement rate for this zone)
-        features['zone_avg_enforcement'] = (zone_history['tickets_issued'] > 0).mean()
+        features['zone_avg_enforcement'] = index.constant(
+            zone, 'avg_enforcement', lambda: (zone_history['tickets_issued'] > 0).mean()
+        )
 
         # Estimate typical lpr_scans, amp_sessions, unpaid_estimate for this zone-dow-hour
         # Use historical averages for same day-of-week and hour
@@ -304,10 +755,14 @@ class FeatureEngineer:
 
             # High-risk indicator 
             # 75th percentile of unpaid_estimate and 50th percentile of zone/lot avg_enforcement
-            unpaid_75th = zone_history['unpaid_estimate'].quantile(0.75)
-            zone_enf_50th = self.enforcement_history.groupby(self.enforcement_lookup_col)['tickets_issued'].apply(
-                lambda x: (x > 0).mean()
-            ).median()
+            # Both are constant for a given history, so they are computed once
+            unpaid_75th = index.constant(
+                zone, 'unpaid_75th', lambda: zone_history['unpaid_estimate'].quantile(0.75)
+            )
+            zone_enf_50th = index.constant(None, 'median_zone_enforcement', lambda: pd.Series([
+                index.constant(key, 'avg_enforcement', lambda: (index.rows(key)['tickets_issued'] > 0).mean())
+                for key in index.keys()
+            ]).median())
 
             features['high_risk'] = int(
                 (features['unpaid_estimate'] > unpaid_75th) and
@@ -316,6 +771,7 @@ class FeatureEngineer:
 
         return features
 
+    @timed_stage('features_to_array')
     def features_to_array(self, features, feature_names):
         """Convert feature dict to DataFrame with proper column names"""
         import pandas as pd
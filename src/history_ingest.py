@@ -0,0 +1,265 @@
+"""Incremental ingestion of hourly LPR and enforcement records from a drop directory"""
+
+import glob
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+LPR_COLUMNS = ['lot_number', 'datetime', 'lpr_scans']
+ENFORCEMENT_COLUMNS = ['datetime', 'Zone', 'tickets_issued', 'lpr_scans', 'amp_sessions', 'unpaid_estimate']
+
+# Called with (kind, keys, start, end) after new records land, so caches can
+# drop just the predictions that depend on those lots/zones and hours
+_invalidation_listeners = []
+
+
+def add_invalidation_listener(listener):
+    _invalidation_listeners.append(listener)
+
+
+def notify_invalidation(kind, keys, start, end):
+    for listener in _invalidation_listeners:
+        try:
+            listener(kind, keys, start, end)
+        except Exception as e:
+            print(f"Warning: invalidation listener failed for {kind} update: {e}")
+
+
+def _require_columns(records, columns, kind):
+    missing = [c for c in columns if c not in records.columns]
+    if missing:
+        raise ValueError(f"{kind} records missing columns: {missing}")
+
+
+def prepare_lpr_records(records):
+    """Normalize raw LPR rows to the lpr_history schema (lot_number, datetime, lpr_scans, date, hour)"""
+    _require_columns(records, LPR_COLUMNS, 'LPR')
+    records = records[LPR_COLUMNS].copy()
+    records['lot_number'] = records['lot_number'].astype(int)
+    records['datetime'] = pd.to_datetime(records['datetime']).dt.floor('h')
+    records['lpr_scans'] = records['lpr_scans'].astype(int)
+    records['date'] = records['datetime'].dt.strftime('%Y-%m-%d')
+    records['hour'] = records['datetime'].dt.hour
+    return records
+
+
+def prepare_enforcement_records(records):
+    """Normalize raw enforcement rows to the enforcement_full_extended schema"""
+    _require_columns(records, ENFORCEMENT_COLUMNS, 'Enforcement')
+    lpr_estimated = records['lpr_estimated'].astype(bool) if 'lpr_estimated' in records.columns else False
+    records = records[ENFORCEMENT_COLUMNS].copy()
+    records['datetime'] = pd.to_datetime(records['datetime']).dt.floor('h')
+    records['date'] = records['datetime'].dt.strftime('%Y-%m-%d')
+    records['hour'] = records['datetime'].dt.hour
+    records['day_of_week'] = records['datetime'].dt.dayofweek
+    records['year'] = records['datetime'].dt.year
+    records['lpr_estimated'] = lpr_estimated
+    return records
+
+
+def merge_history(history, records, key_columns, window_start=None):
+    """
+    New history frame with records appended (newer rows replace rows with the same key)
+
+    With window_start, rows older than it are evicted, so the history behaves as
+    a ring buffer over a fixed window. The input frame is not modified: callers
+    swap the returned frame in, and readers holding the old one are unaffected.
+    """
+    columns = list(history.columns)
+    combined = pd.concat([history, records.reindex(columns=columns)], ignore_index=True)
+    combined = combined.drop_duplicates(subset=key_columns, keep='last')
+    if window_start is not None:
+        combined = combined[combined['datetime'] >= window_start]
+    return combined.reset_index(drop=True)
+
+
+class PendingRecords:
+    """
+    Records ingested since a history frame was last rebuilt
+
+    Readers see them through per-zone indexes (ZoneHistoryIndex.appended), so
+    an ingest never copies the whole history. The frame is rebuilt with
+    merge_history only once the pending rows reach rebuild_fraction of it.
+    """
+
+    def __init__(self, rebuild_fraction=0.1):
+        self.rebuild_fraction = float(rebuild_fraction)
+        self.rows = 0
+        self._frames = []
+
+    def add(self, records):
+        self._frames.append(records)
+        self.rows += len(records)
+
+    def frame(self):
+        """Every pending record in ingestion order, None when there are none"""
+        return pd.concat(self._frames, ignore_index=True) if self._frames else None
+
+    def rebuild_due(self, history):
+        return self.rows >= self.rebuild_fraction * len(history)
+
+    def merge_into(self, history, key_columns, window_start=None):
+        """history with the pending records merged in (see merge_history); none are pending afterwards"""
+        merged = merge_history(history, self.frame(), key_columns, window_start)
+        self.rows = 0
+        self._frames = []
+        return merged
+
+
+class DropDirectoryWatcher:
+    """
+    Poll a directory for new CSV files of hourly records
+
+    Files are routed by name prefix (e.g. lpr_*.csv, enforcement_*.csv) to a
+    handler that takes a DataFrame. Applied files move to processed/ (so they
+    can be replayed on the next start), unreadable ones to failed/. Writers
+    should create files under another name and rename them into place so a
+    half-written file is never picked up.
+
+    A processed file's mtime is set to when it was applied, strictly
+    increasing, so applied_mark_ns orders every update: other processes
+    holding their own copy of the histories call catch_up() with the mark
+    to apply just the files they have not seen.
+    """
+
+    def __init__(self, drop_dir, handlers, poll_interval_s=5.0, on_applied=None, compactors=None):
+        self.drop_dir = drop_dir
+        self.handlers = handlers  # prefix -> fn(records_df) returning rows applied
+        self.poll_interval_s = float(poll_interval_s)
+        self.on_applied = on_applied  # optional callback after a poll applied any file
+        self.compactors = compactors or {}  # prefix -> fn(records_df) returning the rows worth replaying
+        self.processed_dir = os.path.join(drop_dir, 'processed')
+        self.failed_dir = os.path.join(drop_dir, 'failed')
+        for directory in (self.drop_dir, self.processed_dir, self.failed_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        self.files_applied = 0
+        self.files_failed = 0
+        self.rows_applied = 0
+        self.last_applied = None
+        self.applied_mark_ns = 0  # mtime of the newest processed file applied in this process
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _handler_for(self, path):
+        name = os.path.basename(path)
+        for prefix, handler in self.handlers.items():
+            if name.startswith(prefix):
+                return handler
+        return None
+
+    def _pending_files(self, directory, newer_than_ns=None):
+        paths = [p for p in glob.glob(os.path.join(directory, '*.csv')) if self._handler_for(p) is not None]
+        stamped = sorted((os.stat(p).st_mtime_ns, p) for p in paths)
+        if newer_than_ns is not None:
+            stamped = [(mtime_ns, p) for mtime_ns, p in stamped if mtime_ns > newer_than_ns]
+        return stamped
+
+    def _mark_applied(self, path):
+        """Stamp a processed file with its (strictly increasing) apply time"""
+        mark_ns = max(time.time_ns(), self.applied_mark_ns + 1)
+        os.utime(path, ns=(mark_ns, mark_ns))
+        self.applied_mark_ns = mark_ns
+
+    def replay_processed(self, newer_than_ns=None):
+        """Re-apply previously ingested files (on startup, the base CSVs do not contain them)"""
+        rows = 0
+        for mtime_ns, path in self._pending_files(self.processed_dir, newer_than_ns):
+            try:
+                rows += self._handler_for(path)(pd.read_csv(path))
+            except Exception as e:
+                print(f"Warning: could not replay ingested file {path}: {e}")
+            self.applied_mark_ns = max(self.applied_mark_ns, mtime_ns)
+        return rows
+
+    def catch_up(self, mark_ns):
+        """Apply the processed files another process ingested up to mark_ns that this one has not"""
+        if not mark_ns or mark_ns <= self.applied_mark_ns:
+            return 0
+        return self.replay_processed(newer_than_ns=self.applied_mark_ns)
+
+    def compact_processed(self):
+        """
+        Merge each kind's processed files into one file of the rows still worth replaying
+
+        The compactor for a prefix dedupes and drops rows outside any retention
+        window. The merged file keeps the newest input's mtime, so processes
+        that already applied the inputs do not apply it again. Returns
+        (files before, files after).
+        """
+        before = after = 0
+        for prefix, compactor in self.compactors.items():
+            stamped = [(mtime_ns, p) for mtime_ns, p in self._pending_files(self.processed_dir)
+                       if os.path.basename(p).startswith(prefix)]
+            before += len(stamped)
+            if not stamped:
+                continue
+            records = compactor(pd.concat([pd.read_csv(p) for _, p in stamped], ignore_index=True))
+
+            target = os.path.join(self.processed_dir, f'{prefix}compacted.csv')
+            if len(records):
+                tmp_path = os.path.join(self.processed_dir, f'.{prefix}compacted.tmp')
+                records.to_csv(tmp_path, index=False)
+                mark_ns = stamped[-1][0]
+                os.utime(tmp_path, ns=(mark_ns, mark_ns))
+                os.replace(tmp_path, target)
+                after += 1
+            for _, path in stamped:
+                if path != target or not len(records):
+                    os.remove(path)
+        return before, after
+
+    def poll_once(self):
+        """Apply every waiting file, returns the number of rows applied"""
+        rows = 0
+        for _, path in self._pending_files(self.drop_dir):
+            name = os.path.basename(path)
+            try:
+                applied = self._handler_for(path)(pd.read_csv(path))
+            except Exception as e:
+                self.files_failed += 1
+                print(f"Warning: could not ingest {name}: {e}")
+                shutil.move(path, os.path.join(self.failed_dir, name))
+                continue
+
+            processed_path = os.path.join(self.processed_dir, name)
+            shutil.move(path, processed_path)
+            self._mark_applied(processed_path)
+            self.files_applied += 1
+            self.rows_applied += applied
+            self.last_applied = time.time()
+            rows += applied
+            print(f"Ingested {applied} records from {name}")
+
+        if rows and self.on_applied is not None:
+            self.on_applied()
+        return rows
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='history-ingest', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval_s):
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Warning: ingestion poll failed: {e}")
+
+    def stats(self):
+        return {
+            'drop_dir': self.drop_dir,
+            'poll_interval_s': self.poll_interval_s,
+            'files_applied': self.files_applied,
+            'files_failed': self.files_failed,
+            'rows_applied': self.rows_applied,
+            'last_applied': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.last_applied))
+                            if self.last_applied else None
+        }
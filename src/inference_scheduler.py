@@ -0,0 +1,126 @@
+"""Micro-batching scheduler for model inference"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+
+class InferenceScheduler:
+    """
+    Coalesce feature rows from concurrent requests into batched model calls
+
+    Rows submitted while a batch is collecting are concatenated and scored
+    with a single predict call. A batch is flushed once it holds
+    max_batch_size rows or its first row has waited max_wait_ms, and every
+    caller gets back only the slice of the output that belongs to its rows.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=2.0, name='inference', on_batch=None):
+        self.predict_fn = predict_fn
+        self.on_batch = on_batch  # optional callback(rows, seconds) after each booster call
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self._pending = []  # (model, features_df, future, enqueue_time)
+        self._pending_rows = 0
+        self._cond = threading.Condition()
+
+        self.batches_flushed = 0
+        self.rows_scored = 0
+        self.largest_batch = 0
+
+        self._worker = threading.Thread(target=self._run, name=f'{name}-scheduler', daemon=True)
+        self._worker.start()
+
+    def submit(self, model, features_df):
+        """Queue feature rows for scoring, returns a Future resolving to a numpy array"""
+        future = Future()
+        with self._cond:
+            self._pending.append((model, features_df, future, time.perf_counter()))
+            self._pending_rows += len(features_df)
+            self._cond.notify()
+        return future
+
+    def predict(self, model, features_df, timeout=None):
+        """Blocking helper: submit rows and wait for their predictions"""
+        return self.submit(model, features_df).result(timeout=timeout)
+
+    def queue_depth(self):
+        """Rows waiting to be scored"""
+        return self._pending_rows
+
+    def stats(self):
+        """Counters describing how well requests are being coalesced"""
+        return {
+            'batches_flushed': self.batches_flushed,
+            'rows_scored': self.rows_scored,
+            'avg_batch_size': round(self.rows_scored / self.batches_flushed, 2) if self.batches_flushed else 0.0,
+            'largest_batch': self.largest_batch,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                # Keep collecting until the batch is full or the oldest row has waited long enough
+                deadline = self._pending[0][3] + self.max_wait
+                while self._pending_rows < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._take_batch()
+
+            self._flush(batch)
+
+    def _take_batch(self):
+        """Pop whole submissions off the queue up to max_batch_size rows (always at least one)"""
+        batch = []
+        rows = 0
+        while self._pending:
+            item_rows = len(self._pending[0][1])
+            if batch and rows + item_rows > self.max_batch_size:
+                break
+            item = self._pending.pop(0)
+            batch.append(item)
+            rows += item_rows
+        self._pending_rows -= rows
+        return batch
+
+    def _flush(self, batch):
+        # Rows are only stacked together when they target the same model object,
+        # so requests holding an older model still get scored by that model
+        groups = {}
+        for model, features_df, future, _ in batch:
+            groups.setdefault(id(model), (model, []))[1].append((features_df, future))
+
+        for model, items in groups.values():
+            frames = [features_df for features_df, _ in items]
+            try:
+                features = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+                start = time.perf_counter()
+                output = np.asarray(self.predict_fn(model, features))
+                if self.on_batch is not None:
+                    self.on_batch(len(features), time.perf_counter() - start)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            self.batches_flushed += 1
+            self.rows_scored += len(features)
+            self.largest_batch = max(self.largest_batch, len(features))
+
+            offset = 0
+            for features_df, future in items:
+                future.set_result(output[offset:offset + len(features_df)])
+                offset += len(features_df)
@@ -0,0 +1,81 @@
+"""Spatial index over lot locations for nearest-lot queries"""
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def parse_additional_coords(value):
+    """[(lat, lon), ...] from the "lat1,lon1;lat2,lon2" format of additional_coords"""
+    points = []
+    if value is None or pd.isna(value):
+        return points
+    for pair in str(value).split(';'):
+        try:
+            lat, lon = (float(part) for part in pair.strip().split(','))
+        except ValueError:
+            continue
+        if np.isfinite(lat) and np.isfinite(lon):
+            points.append((lat, lon))
+    return points
+
+
+class LotSpatialIndex:
+    """
+    Ball tree (haversine metric) over every lot's centroid and split-lot points
+
+    A lot's distance from a location is that of its closest point. Lots
+    without coordinates are not indexed. lot_numbers gives the lot of each
+    indexed point.
+    """
+
+    def __init__(self, lot_mapping):
+        # Deferred: scikit-learn is only needed once someone asks for nearby lots
+        from sklearn.neighbors import BallTree
+
+        lot_numbers, points = [], []
+        has_extra = 'additional_coords' in lot_mapping.columns
+        for row in lot_mapping.drop_duplicates('Lot_number').itertuples(index=False):
+            lot_points = []
+            lat, lon = getattr(row, 'latitude', None), getattr(row, 'longitude', None)
+            if lat is not None and lon is not None and pd.notna(lat) and pd.notna(lon):
+                lot_points.append((float(lat), float(lon)))
+            if has_extra:
+                lot_points.extend(parse_additional_coords(row.additional_coords))
+            lot_numbers.extend([int(row.Lot_number)] * len(lot_points))
+            points.extend(lot_points)
+
+        self.lot_numbers = np.asarray(lot_numbers, dtype=np.int64)
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.lots = len(np.unique(self.lot_numbers))
+        self.tree = BallTree(np.radians(self.points), metric='haversine') if len(self.points) else None
+
+    def _nearest_per_lot(self, point_indexes, distances_rad):
+        """(lot numbers, distances in meters) keeping each lot's closest point, nearest first"""
+        order = np.argsort(distances_rad, kind='stable')
+        lots = self.lot_numbers[point_indexes[order]]
+        _, first = np.unique(lots, return_index=True)
+        first.sort()
+        return lots[first], distances_rad[order][first] * EARTH_RADIUS_M
+
+    def within(self, latitude, longitude, radius_m):
+        """Lots with a point within radius_m of the location, nearest first"""
+        if self.tree is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        query = np.radians([[latitude, longitude]])
+        indexes, distances = self.tree.query_radius(query, r=radius_m / EARTH_RADIUS_M, return_distance=True)
+        return self._nearest_per_lot(indexes[0], distances[0])
+
+    def nearest(self, latitude, longitude, k):
+        """The k lots closest to the location, nearest first"""
+        if self.tree is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        # Split lots contribute several points, so ask for enough to cover k distinct lots
+        points = min(len(self.points), k + len(self.points) - self.lots)
+        distances, indexes = self.tree.query(np.radians([[latitude, longitude]]), k=points)
+        lots, meters = self._nearest_per_lot(indexes[0], distances[0])
+        return lots[:k], meters[:k]
+
+    def stats(self):
+        return {'lots': self.lots, 'points': len(self.points)}
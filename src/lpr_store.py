@@ -0,0 +1,176 @@
+"""Month-partitioned store of lot-level LPR history with range reads"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = 'manifest.json'
+STORE_VERSION = 1
+COLUMNS = ['lot_number', 'datetime', 'lpr_scans']
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def build_store(csv_path, store_dir, chunksize=500000):
+    """
+    Split an LPR history CSV into one .npz file per calendar month plus a manifest
+
+    The CSV is read in chunks and each chunk's rows are spilled to disk per
+    month; every month is then merged from its pieces on its own. Memory is
+    bounded by the chunk size plus the largest month, not by the archive, and
+    the CSV does not need to be sorted. Partitions are written under
+    temporary names and the manifest last, so a reader never sees a
+    half-built store.
+    """
+    start = time.perf_counter()
+    os.makedirs(store_dir, exist_ok=True)
+    spill_dir = os.path.join(store_dir, f'.build-{os.getpid()}')
+    os.makedirs(spill_dir, exist_ok=True)
+
+    pieces = {}  # month -> spilled piece files, in CSV order
+    try:
+        chunks = pd.read_csv(csv_path, usecols=COLUMNS, parse_dates=['datetime'], chunksize=chunksize)
+        for chunk_index, chunk in enumerate(chunks):
+            month_keys = chunk['datetime'].to_numpy().astype('datetime64[M]')
+            for month in np.unique(month_keys):
+                part = chunk[month_keys == month]
+                piece_path = os.path.join(spill_dir, f'{month}-{chunk_index:06d}.npz')
+                np.savez(piece_path, **{col: part[col].to_numpy() for col in COLUMNS})
+                pieces.setdefault(str(month), []).append(piece_path)
+
+        partitions = []
+        for month in sorted(pieces):
+            month_pieces = []
+            for piece_path in pieces[month]:
+                with np.load(piece_path) as data:
+                    month_pieces.append({col: data[col] for col in COLUMNS})
+                os.remove(piece_path)
+            arrays = {col: np.concatenate([piece[col] for piece in month_pieces]) for col in COLUMNS}
+            del month_pieces
+
+            file_name = f'lpr-{month}.npz'
+            tmp_path = os.path.join(store_dir, f'.{file_name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, os.path.join(store_dir, file_name))
+            partitions.append({
+                'month': month,
+                'file': file_name,
+                'rows': int(len(arrays['datetime'])),
+                'start': str(arrays['datetime'].min()),
+                'end': str(arrays['datetime'].max())
+            })
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    manifest = {
+        'version': STORE_VERSION,
+        'columns': COLUMNS,
+        'source': source_fingerprint(csv_path),
+        'built_at': pd.Timestamp.now().isoformat(),
+        'partitions': partitions
+    }
+    tmp_path = os.path.join(store_dir, f'.{MANIFEST_NAME}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(manifest, indent=2) + '\n')
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST_NAME))
+
+    rows = sum(p['rows'] for p in partitions)
+    print(f"  LPR store built: {rows:,} rows in {len(partitions)} monthly partitions "
+          f"({time.perf_counter() - start:.1f}s)")
+    return manifest
+
+
+class LPRHistoryStore:
+    """
+    Read access to a store written by build_store
+
+    read_range(start, end) opens only the partitions whose months overlap the
+    range and returns the matching rows as typed arrays, in month order.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported LPR store version {self.manifest.get('version')} in {store_dir}")
+        self.partitions = self.manifest['partitions']
+        self.partitions_read = 0
+
+    @classmethod
+    def open_or_build(cls, store_dir, csv_path, build_if_missing=True):
+        """
+        Store for csv_path, rebuilding it when it is missing or the CSV has changed
+
+        Returns None when there is no usable store and building is disabled.
+        """
+        manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            store = cls(store_dir)
+            if not os.path.exists(csv_path) or store.matches_source(csv_path):
+                return store
+            print(f"  LPR store at {store_dir} is out of date with {csv_path}")
+        if not build_if_missing or not os.path.exists(csv_path):
+            return None
+        print(f"  Building monthly LPR store from {csv_path}...")
+        build_store(csv_path, store_dir)
+        return cls(store_dir)
+
+    def matches_source(self, csv_path):
+        recorded = self.manifest.get('source', {})
+        current = source_fingerprint(csv_path)
+        return recorded.get('size') == current['size'] and recorded.get('mtime_ns') == current['mtime_ns']
+
+    def partitions_for(self, start=None, end=None):
+        """Manifest entries of the monthly partitions that overlap [start, end]"""
+        selected = []
+        for partition in self.partitions:
+            if start is not None and pd.Timestamp(partition['end']) < start:
+                continue
+            if end is not None and pd.Timestamp(partition['start']) > end:
+                continue
+            selected.append(partition)
+        return selected
+
+    def read_range(self, start=None, end=None):
+        """Rows with start <= datetime <= end as a dict of column -> numpy array"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        pieces = []
+        for partition in self.partitions_for(start, end):
+            with np.load(os.path.join(self.store_dir, partition['file'])) as data:
+                arrays = {col: data[col] for col in COLUMNS}
+            self.partitions_read += 1
+            mask = np.ones(len(arrays['datetime']), dtype=bool)
+            if start is not None:
+                mask &= arrays['datetime'] >= start.to_datetime64()
+            if end is not None:
+                mask &= arrays['datetime'] <= end.to_datetime64()
+            pieces.append({col: values[mask] for col, values in arrays.items()})
+
+        if not pieces:
+            return {col: np.empty(0, dtype='datetime64[ns]' if col == 'datetime' else np.int64) for col in COLUMNS}
+        return {col: np.concatenate([piece[col] for piece in pieces]) for col in COLUMNS}
+
+    def read_frame(self, start=None, end=None):
+        """read_range as a DataFrame with the CSV's columns"""
+        return pd.DataFrame(self.read_range(start, end), columns=COLUMNS)
+
+    def stats(self):
+        return {
+            'store_dir': self.store_dir,
+            'partitions': len(self.partitions),
+            'rows': sum(p['rows'] for p in self.partitions),
+            'first_month': self.partitions[0]['month'] if self.partitions else None,
+            'last_month': self.partitions[-1]['month'] if self.partitions else None,
+            'partitions_read': self.partitions_read,
+            'built_at': self.manifest.get('built_at')
+        }
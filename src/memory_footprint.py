@@ -0,0 +1,87 @@
+"""Compact in-memory history frames and report what each dataset and model costs"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+def compact_frame(df, columns, categorical=()):
+    """
+    Copy of df holding only `columns` (those present), with compact dtypes
+
+    String key columns listed in `categorical` become categoricals, integer
+    columns are downcast to the smallest type that holds their range, and float
+    columns become float32 only when every value survives the round trip, so
+    features computed from the compacted frame are bit-for-bit unchanged.
+    """
+    df = df[[c for c in columns if c in df.columns]].copy()
+    for col in df.columns:
+        series = df[col]
+        if col in categorical:
+            df[col] = series.astype('category')
+        elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy()
+            narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+                df[col] = narrowed
+    return df
+
+
+def frame_bytes(df):
+    """Bytes held by a DataFrame, including the strings behind object columns"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+def frame_report(df):
+    if df is None:
+        return None
+    return {
+        'rows': len(df),
+        'bytes': frame_bytes(df),
+        'columns': {col: str(dtype) for col, dtype in df.dtypes.items()}
+    }
+
+
+def object_bytes(obj):
+    """Approximate size of a model or encoder (its pickled size)"""
+    if obj is None:
+        return 0
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+
+def process_rss_bytes():
+    """Current resident set size of this process (None where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def memory_report(datasets, models):
+    """
+    Per-dataset and per-model memory usage
+
+    datasets maps name -> DataFrame (or None), models maps name -> object.
+    Frames shared by several components should be listed once.
+    """
+    dataset_reports = {name: frame_report(df) for name, df in datasets.items()}
+    model_bytes = {name: object_bytes(obj) for name, obj in models.items()}
+    return {
+        'process_rss_bytes': process_rss_bytes(),
+        'datasets_total_bytes': sum(r['bytes'] for r in dataset_reports.values() if r),
+        'models_total_bytes': sum(b for b in model_bytes.values() if b),
+        'datasets': dataset_reports,
+        'models': model_bytes
+    }
@@ -0,0 +1,212 @@
+"""Lightweight in-process metrics rendered in Prometheus text format"""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(k)} {_format_value(v)}' for k, v in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+
+        lines = []
+        for key, (bucket_counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                labels = key + (('le', _format_value(float(bound))),)
+                lines.append(f'{self.name}_bucket{_format_labels(labels)} {bucket_count}')
+            lines.append(f'{self.name}_bucket{_format_labels(key + (("le", "+Inf"),))} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics plus collectors that report values owned by other components"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation):
+        metric = Counter(name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collect_fn):
+        """
+        Register a function called at scrape time
+
+        It returns a list of (name, type, documentation, [(labels_dict, value), ...])
+        """
+        self._collectors.append(collect_fn)
+
+    def register_cache(self, cache_name, stats_fn):
+        """Report hits/misses/hit ratio of a cache whose stats_fn returns {'hits': .., 'misses': ..}"""
+        def collect():
+            stats = stats_fn()
+            hits, misses = stats.get('hits', 0), stats.get('misses', 0)
+            labels = {'cache': cache_name}
+            return [
+                ('cougarpark_cache_hits_total', 'counter', 'Cache lookups that were served from the cache', [(labels, hits)]),
+                ('cougarpark_cache_misses_total', 'counter', 'Cache lookups that had to be computed', [(labels, misses)]),
+                ('cougarpark_cache_hit_ratio', 'gauge', 'Fraction of cache lookups served from the cache',
+                 [(labels, round(hits / (hits + misses), 6) if hits + misses else 0.0)])
+            ]
+        self.register_collector(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            lines.extend(metric.render())
+
+        # Collectors may report the same family (e.g. several caches), group them
+        families = {}
+        for collect in self._collectors:
+            try:
+                collected = collect()
+            except Exception as e:
+                print(f"Warning: metrics collector failed: {e}")
+                continue
+            for name, type_name, documentation, samples in collected:
+                family = families.setdefault(name, (type_name, documentation, []))
+                family[2].extend(samples)
+
+        for name, (type_name, documentation, samples) in families.items():
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {type_name}')
+            for labels, value in samples:
+                lines.append(f'{name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'cougarpark_request_duration_seconds', 'End-to-end request latency by endpoint')
+REQUESTS_TOTAL = REGISTRY.counter(
+    'cougarpark_requests_total', 'Requests handled by endpoint and status code')
+REQUEST_ERRORS = REGISTRY.counter(
+    'cougarpark_request_errors_total', 'Requests that returned a 5xx status')
+STAGE_LATENCY = REGISTRY.histogram(
+    'cougarpark_stage_duration_seconds', 'Time spent in each request pipeline stage (stages may nest)')
+MODEL_CALL_LATENCY = REGISTRY.histogram(
+    'cougarpark_model_call_duration_seconds', 'Duration of a single booster predict call')
+MODEL_BATCH_SIZE = REGISTRY.histogram(
+    'cougarpark_model_batch_size', 'Rows scored per booster predict call', buckets=BATCH_SIZE_BUCKETS)
+FEATURE_ERRORS = REGISTRY.counter(
+    'cougarpark_feature_errors_total', 'Rows whose features could not be built')
+
+
+# Extra consumers of stage timings (e.g. per-request tracing), called with (stage, seconds)
+_stage_listeners = []
+
+
+def add_stage_listener(listener):
+    _stage_listeners.append(listener)
+
+
+@contextmanager
+def stage_timer(stage):
+    """Time a block of the request pipeline under the given stage name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, stage=stage)
+        for listener in _stage_listeners:
+            listener(stage, elapsed)
+
+
+def timed_stage(stage):
+    """Decorator form of stage_timer"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_model_call(model, rows, seconds):
+    """Record one booster call: its batch size and how long it took"""
+    MODEL_BATCH_SIZE.observe(rows, model=model)
+    MODEL_CALL_LATENCY.observe(seconds, model=model)
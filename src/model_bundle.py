@@ -0,0 +1,273 @@
+"""Model artifacts loaded and swapped together as one bundle"""
+
+import json
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+from native_models import MODEL_EXTENSIONS, native_available, load_native
+
+
+# Bundle attribute -> (artifact file, model group). Groups follow the models
+# enabled in config.json: the occupancy flag covers the zone-level and
+# lot-level LPR models, the enforcement flag the enforcement model.
+ARTIFACTS = {
+    'occupancy_model': ('occupancy_lightgbm_tuned.pkl', 'occupancy'),
+    'occupancy_zone_encoder': ('occupancy_zone_encoder.pkl', 'occupancy'),
+    'occupancy_features': ('occupancy_feature_list_lags.pkl', 'occupancy'),
+    'occupancy_metadata': ('occupancy_model_metadata.json', 'occupancy'),
+    'lot_level_lpr_model': ('occupancy_lot_level_lpr_model.pkl', 'lot_level_lpr'),
+    'lot_level_lpr_metadata': ('occupancy_lot_level_lpr_metadata.json', 'lot_level_lpr'),
+    'enforcement_model': ('enforcement_xgboost_tuned.pkl', 'enforcement'),
+    'enforcement_features': ('enforcement_feature_list_lags.pkl', 'enforcement'),
+    'enforcement_metadata': ('enforcement_model_metadata.json', 'enforcement')
+}
+
+
+class ModelBundle:
+    """
+    One consistent set of models, feature lists, encoder and metadata
+
+    Request handlers read the active bundle once and use that reference for
+    the whole request, so a reload that swaps in a new bundle never mixes
+    artifacts from two model versions inside one prediction.
+
+    Each artifact is read from disk the first time its attribute is used
+    (loading a model is what imports LightGBM/XGBoost), and how long that
+    took is recorded. Artifacts of disabled models are None without being read.
+
+    With model_format='native', models and the zone encoder are loaded from
+    their native booster exports (see native_models.py) where model_dir has
+    them, and from the pickles otherwise.
+    """
+
+    def __init__(self, model_dir, version=1, occupancy_enabled=True, enforcement_enabled=True,
+                 model_format='pickle'):
+        self.model_dir = model_dir
+        self.version = version
+        self.model_format = model_format
+        self.formats = {}
+        self.loaded_at = datetime.now().isoformat()
+        self.enabled_groups = {
+            'occupancy': occupancy_enabled,
+            'lot_level_lpr': occupancy_enabled,
+            'enforcement': enforcement_enabled
+        }
+        self.load_seconds = {}
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set yet, i.e. artifacts not loaded so far
+        if name in ARTIFACTS:
+            return self._load(name)
+        if name == 'lot_level_lpr_features':
+            metadata = self.lot_level_lpr_metadata
+            self.lot_level_lpr_features = metadata['features']['feature_list'] if metadata else None
+            return self.lot_level_lpr_features
+        raise AttributeError(name)
+
+    def _load(self, name):
+        with self._lock:
+            if name in self.__dict__:
+                return self.__dict__[name]
+            file_name, group = ARTIFACTS[name]
+            value = None
+            if self.enabled_groups[group]:
+                start = time.perf_counter()
+                try:
+                    if self.model_format == 'native' and native_available(self.model_dir, name):
+                        value = load_native(self.model_dir, name)
+                        self.formats[name] = 'native'
+                    else:
+                        value = self._read(file_name)
+                        self.formats[name] = 'json' if file_name.endswith('.json') else 'pickle'
+                except FileNotFoundError:
+                    if group != 'lot_level_lpr':
+                        raise
+                    # Lot-level LPR model is optional
+                    print(f"  WARNING: {file_name} not found, only zone-level predictions available")
+                else:
+                    self.load_seconds[name] = round(time.perf_counter() - start, 3)
+                    print(f"  Loaded {name} ({self.formats[name]}) in {self.load_seconds[name]}s")
+            setattr(self, name, value)
+            return value
+
+    def _read(self, file_name):
+        path = os.path.join(self.model_dir, file_name)
+        if file_name.endswith('.json'):
+            with open(path, 'r') as f:
+                return json.load(f)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def load_all(self):
+        """Read every artifact of the enabled models now"""
+        for name in ARTIFACTS:
+            getattr(self, name)
+        if self.lot_level_lpr_model is None:
+            # Keep the model and its metadata consistent when either file is missing
+            self.lot_level_lpr_metadata = None
+        return self
+
+    def is_loaded(self, name):
+        return name in self.__dict__
+
+    def peek(self, name):
+        """Artifact if it has been loaded, else None (never triggers a load)"""
+        return self.__dict__.get(name)
+
+    def load_stats(self):
+        return {
+            name: {
+                'group': group,
+                'enabled': self.enabled_groups[group],
+                'loaded': self.is_loaded(name),
+                'format': self.formats.get(name),
+                'load_seconds': self.load_seconds.get(name)
+            }
+            for name, (_, group) in ARTIFACTS.items()
+        }
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'model_dir': self.model_dir,
+            'loaded_at': self.loaded_at,
+            'model_format': self.model_format,
+            'occupancy_loaded': self.peek('occupancy_model') is not None,
+            'lot_level_lpr_loaded': self.peek('lot_level_lpr_model') is not None,
+            'enforcement_loaded': self.peek('enforcement_model') is not None,
+            'artifacts': self.load_stats()
+        }
+
+
+def load_model_bundle(model_dir, occupancy_enabled=True, enforcement_enabled=True, version=1, lazy=False,
+                      model_format='pickle'):
+    """
+    Bundle of every enabled model and its feature list/metadata from model_dir
+
+    With lazy=True nothing is read until first use; otherwise everything is
+    loaded before returning (reloads do this so the swap never stalls requests).
+    """
+    bundle = ModelBundle(model_dir, version, occupancy_enabled, enforcement_enabled, model_format)
+    if lazy:
+        print(f"Model artifacts in {model_dir} will load on first use")
+        return bundle
+
+    print(f"Loading model artifacts from {model_dir}...")
+    return bundle.load_all()
+
+
+def artifact_fingerprint(model_dir):
+    """(name, size, mtime) of every model artifact, to notice when files are replaced"""
+    entries = []
+    for name in sorted(os.listdir(model_dir)):
+        if name.endswith(('.pkl', '.json') + tuple(MODEL_EXTENSIONS.values())):
+            stat = os.stat(os.path.join(model_dir, name))
+            entries.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+
+class ModelReloader:
+    """
+    Load a new bundle in the background, validate it, then swap it in
+
+    load_fn(model_dir, version) returns a bundle, validate_fn(bundle) raises if
+    it cannot make predictions, and swap_fn(bundle) installs it. Only one
+    reload runs at a time; the current bundle keeps serving until the swap.
+    """
+
+    def __init__(self, load_fn, validate_fn, swap_fn, initial_version=1):
+        self.load_fn = load_fn
+        self.validate_fn = validate_fn
+        self.swap_fn = swap_fn
+        self.next_version = initial_version + 1
+
+        self.reloads_succeeded = 0
+        self.reloads_failed = 0
+        self.last_reload = None
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._watch_stop = threading.Event()
+
+    def in_progress(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, model_dir):
+        """Start a background reload; returns False if one is already running"""
+        with self._lock:
+            if self.in_progress():
+                return False
+            version = self.next_version
+            self.next_version += 1
+            self.last_reload = {
+                'version': version,
+                'model_dir': model_dir,
+                'status': 'loading',
+                'started_at': datetime.now().isoformat(),
+                'finished_at': None,
+                'duration_s': None,
+                'error': None
+            }
+            self._thread = threading.Thread(
+                target=self._reload, args=(model_dir, version, self.last_reload), name='model-reload', daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _reload(self, model_dir, version, record):
+        start = time.perf_counter()
+        try:
+            bundle = self.load_fn(model_dir, version)
+            record['status'] = 'validating'
+            self.validate_fn(bundle)
+            self.swap_fn(bundle)
+            record['status'] = 'active'
+            self.reloads_succeeded += 1
+            print(f"Model bundle v{version} from {model_dir} is now active")
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+            self.reloads_failed += 1
+            print(f"Warning: model reload from {model_dir} failed, keeping the current models: {e}")
+        finally:
+            record['finished_at'] = datetime.now().isoformat()
+            record['duration_s'] = round(time.perf_counter() - start, 3)
+
+    def watch(self, model_dir, poll_interval_s):
+        """Reload automatically whenever the artifacts in model_dir change"""
+        def run():
+            fingerprint = artifact_fingerprint(model_dir)
+            pending = None
+            while not self._watch_stop.wait(poll_interval_s):
+                try:
+                    current = artifact_fingerprint(model_dir)
+                except OSError as e:
+                    print(f"Warning: could not check {model_dir} for new models: {e}")
+                    continue
+                if current == fingerprint:
+                    pending = None
+                elif current == pending:
+                    # Unchanged for a full interval, so a copy in progress isn't loaded half-way
+                    fingerprint, pending = current, None
+                    self.start(model_dir)
+                else:
+                    pending = current
+
+        threading.Thread(target=run, name='model-watch', daemon=True).start()
+
+    def stats(self):
+        return {
+            'in_progress': self.in_progress(),
+            'reloads_succeeded': self.reloads_succeeded,
+            'reloads_failed': self.reloads_failed,
+            'last_reload': dict(self.last_reload) if self.last_reload else None
+        }
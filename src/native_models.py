@@ -0,0 +1,142 @@
+"""Models stored in their native booster formats, with lightweight predictors"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+
+# Bundle attribute -> file stem of the native export. LightGBM boosters are
+# saved as text models (they keep the pandas categorical mapping), XGBoost
+# boosters as UBJSON. Each has a <stem>.schema.json next to it.
+NATIVE_MODELS = {
+    'occupancy_model': 'occupancy_lightgbm_tuned',
+    'lot_level_lpr_model': 'occupancy_lot_level_lpr_model',
+    'enforcement_model': 'enforcement_xgboost_tuned'
+}
+NATIVE_ENCODERS = {
+    'occupancy_zone_encoder': 'occupancy_zone_encoder'
+}
+MODEL_EXTENSIONS = {'lightgbm': '.txt', 'xgboost': '.ubj'}
+
+
+def schema_path(model_dir, stem):
+    return os.path.join(model_dir, f'{stem}.schema.json')
+
+
+def native_available(model_dir, name):
+    """Whether model_dir holds a native export for this bundle attribute"""
+    stem = NATIVE_MODELS.get(name) or NATIVE_ENCODERS.get(name)
+    return stem is not None and os.path.exists(schema_path(model_dir, stem))
+
+
+class LightGBMPredictor:
+    """predict() of an LGBMRegressor, straight from a lightgbm.Booster"""
+
+    def __init__(self, booster, schema):
+        self.booster = booster
+        self.schema = schema
+        self.feature_names = schema['features']
+
+    def predict(self, X):
+        return self.booster.predict(X)
+
+
+class XGBoostPredictor:
+    """predict_proba()/predict() of a binary XGBClassifier, straight from an xgboost.Booster"""
+
+    def __init__(self, booster, schema):
+        self.booster = booster
+        self.schema = schema
+        self.feature_names = schema['features']
+        self.classes_ = np.asarray(schema.get('classes') or [0, 1])
+
+    def predict_proba(self, X):
+        positive = self.booster.inplace_predict(X)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.booster.inplace_predict(X) > 0.5).astype(np.intp)]
+
+
+class ZoneEncoder:
+    """The part of a fitted LabelEncoder feature engineering uses (classes_), without sklearn"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+        self._codes = {name: code for code, name in enumerate(classes)}
+
+    def transform(self, values):
+        return np.array([self._codes[value] for value in values], dtype=np.int64)
+
+
+def _write_schema(model_dir, stem, schema):
+    schema = dict(schema, schema_version=SCHEMA_VERSION, exported_at=datetime.now().isoformat())
+    with open(schema_path(model_dir, stem), 'w') as f:
+        f.write(json.dumps(schema, indent=2) + '\n')
+
+
+def export_model(model, model_dir, stem):
+    """
+    Save a fitted LGBMRegressor or XGBClassifier as <stem>.txt / <stem>.ubj plus its schema
+
+    Returns the path of the model file.
+    """
+    if hasattr(model, 'booster_'):
+        import lightgbm
+        library, booster = 'lightgbm', model.booster_
+        model_file = stem + MODEL_EXTENSIONS[library]
+        booster.save_model(os.path.join(model_dir, model_file))
+        schema = {'library': library, 'library_version': lightgbm.__version__, 'task': 'regression',
+                  'features': list(booster.feature_name())}
+    elif hasattr(model, 'get_booster'):
+        import xgboost
+        library, booster = 'xgboost', model.get_booster()
+        model_file = stem + MODEL_EXTENSIONS[library]
+        booster.save_model(os.path.join(model_dir, model_file))
+        classes = getattr(model, 'classes_', None)
+        schema = {'library': library, 'library_version': xgboost.__version__, 'task': 'binary',
+                  'features': list(booster.feature_names or []),
+                  'classes': [c.item() if hasattr(c, 'item') else c for c in classes] if classes is not None else None}
+    else:
+        raise TypeError(f"Don't know the native format of {type(model).__name__}")
+
+    schema['model_file'] = model_file
+    schema['n_features'] = len(schema['features'])
+    _write_schema(model_dir, stem, schema)
+    return os.path.join(model_dir, model_file)
+
+
+def export_encoder(encoder, model_dir, stem):
+    """Save a fitted LabelEncoder's classes as a schema file (there is no model file)"""
+    classes = [c.item() if hasattr(c, 'item') else c for c in encoder.classes_]
+    _write_schema(model_dir, stem, {'library': 'label_encoder', 'classes': classes})
+    return schema_path(model_dir, stem)
+
+
+def load_native(model_dir, name):
+    """Predictor (or encoder) for a bundle attribute from its native export"""
+    stem = NATIVE_MODELS.get(name) or NATIVE_ENCODERS[name]
+    with open(schema_path(model_dir, stem)) as f:
+        schema = json.load(f)
+    if schema.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema version {schema.get('schema_version')} for {stem}")
+
+    library = schema['library']
+    if library == 'label_encoder':
+        return ZoneEncoder(schema['classes'])
+
+    path = os.path.join(model_dir, schema['model_file'])
+    if library == 'lightgbm':
+        import lightgbm
+        # Parsing from a string skips the second pass Booster(model_file=...) makes over the file
+        with open(path) as f:
+            return LightGBMPredictor(lightgbm.Booster(model_str=f.read()), schema)
+    if library == 'xgboost':
+        import xgboost
+        booster = xgboost.Booster()
+        booster.load_model(path)
+        return XGBoostPredictor(booster, schema)
+    raise ValueError(f"Unknown model library {library} for {stem}")
@@ -1,6 +1,7 @@
 """CougarPark API - Smart Parking Prediction System"""
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import pickle
 import pandas as pd
@@ -9,11 +10,40 @@ from datetime import datetime
 import json
 import os
 import sys
+import threading
+import time
+from contextlib import nullcontext
 
 sys.path.insert(0, os.path.dirname(__file__))
-from feature_engineering import FeatureEngineer
+from feature_engineering import FeatureEngineer, ZoneHistoryIndex, parse_date_overrides, apply_date_overrides
+from inference_scheduler import InferenceScheduler
+from single_flight import SingleFlight
+from process_backend import ProcessPoolBackend, is_pool_worker
+from metrics import (REGISTRY, REQUEST_LATENCY, REQUESTS_TOTAL, REQUEST_ERRORS, FEATURE_ERRORS,
+                     stage_timer, timed_stage, observe_model_call, add_stage_listener)
+from request_tracing import RequestTracer, record_stage, record_features
+from model_bundle import load_model_bundle, ModelReloader, artifact_fingerprint
+from components import ComponentRegistry
+from memory_footprint import compact_frame, memory_report
+from caching import LRUCache, PredictionMemo
+from risk_heatmap import RiskHeatmap, CALENDAR_STATES, DAY_NAMES, calendar_state, calendar_state_overrides
+from lpr_store import LPRHistoryStore
+from warm_start import WarmStartSnapshot, file_fingerprint
+from time_pattern import TimePatternEstimator
+from lot_index import LotSpatialIndex
+from admission import AdmissionController, TIER_MODEL, TIER_CACHE, TIER_HEATMAP, TIER_TIME_PATTERN, worst_tier
+from history_ingest import (DropDirectoryWatcher, PendingRecords, prepare_lpr_records, prepare_enforcement_records,
+                            notify_invalidation, add_invalidation_listener, LPR_COLUMNS, ENFORCEMENT_COLUMNS)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records serialization time as its own pipeline stage"""
+
+    def dumps(self, obj, **kwargs):
+        with stage_timer('json_serialization'):
+            return super().dumps(obj, **kwargs)
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 # Configure CORS for both local development and GitHub Pages deployment
 CORS(app, origins=[
     "http://localhost:5173",  # Vite dev server
@@ -24,8 +54,9 @@ CORS(app, origins=[
 
 # Get paths relative to project root
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_DIR = os.path.join(PROJECT_ROOT, 'models')
-DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+# Overridable so benchmarks and scale tests can point the API at fixture data
+MODEL_DIR = os.environ.get('COUGARPARK_MODEL_DIR', os.path.join(PROJECT_ROOT, 'models'))
+DATA_DIR = os.environ.get('COUGARPARK_DATA_DIR', os.path.join(PROJECT_ROOT, 'data'))
 CONFIG_FILE = os.path.join(PROJECT_ROOT, 'config.json')
 CONFIG_LOCAL_FILE = os.path.join(PROJECT_ROOT, 'config.local.json')
 
@@ -53,14 +84,32 @@ def load_config():
         with open(CONFIG_LOCAL_FILE, 'r') as f:
             local_config = json.load(f)
             # Deep merge local config into base config
-            if 'models' in local_config:
-                config['models'].update(local_config['models'])
+            for section, values in local_config.items():
+                if isinstance(values, dict) and isinstance(config.get(section), dict):
+                    config[section].update(values)
+                else:
+                    config[section] = values
 
     return config
 
 config = load_config()
 OCCUPANCY_ENABLED = config['models']['occupancy'].get('enabled', True)
 ENFORCEMENT_ENABLED = config['models']['enforcement'].get('enabled', True)
+INFERENCE_CONFIG = config.get('inference', {})
+TRACING_CONFIG = config.get('tracing', {})
+INGESTION_CONFIG = config.get('ingestion', {})
+LPR_WINDOW_DAYS = INGESTION_CONFIG.get('lpr_window_days', 60)
+LPR_STORE_CONFIG = INGESTION_CONFIG.get('lpr_store', {})
+MODEL_RELOAD_CONFIG = config.get('model_reload', {})
+HEATMAP_CONFIG = config.get('risk_heatmap', {})
+FEATURE_CACHE_CONFIG = INFERENCE_CONFIG.get('feature_cache', {})
+ADMISSION_CONFIG = INFERENCE_CONFIG.get('admission', {})
+WARM_START_CONFIG = config.get('warm_start', {})
+LAZY_CONFIG = config.get('lazy_loading', {})
+NEAREST_LOTS_CONFIG = config.get('nearest_lots', {})
+SCENARIO_CONFIG = config.get('scenarios', {})
+# 'native' loads boosters exported by scripts/export_native_models.py where present
+MODEL_FORMAT = config.get('model_serialization', {}).get('format', 'pickle')
 
 print("="*80)
 print("Loading models...")
@@ -68,204 +117,936 @@ print(f"  Occupancy Model: {'ENABLED' if OCCUPANCY_ENABLED else 'DISABLED'}")
 print(f"  Enforcement Model: {'ENABLED' if ENFORCEMENT_ENABLED else 'DISABLED'}")
 print("="*80)
 
-# Conditionally load models based on config
-occupancy_model = None
-occupancy_zone_encoder = None
-occupancy_features = None
-occupancy_metadata = None
+# Models, feature lists, encoder and metadata live in one bundle that a
+# reload swaps as a whole. Handlers read active_bundle once per request.
+active_bundle = load_model_bundle(MODEL_DIR, OCCUPANCY_ENABLED, ENFORCEMENT_ENABLED,
+                                  lazy=LAZY_CONFIG.get('enabled', True), model_format=MODEL_FORMAT)
+
+# Warm start: everything derived from the data files and models at startup
+# (lot lookups, compacted histories, zone indexes, the risk heatmap) is saved
+# after a successful start and restored on the next one when none of the
+# inputs below changed. History frames are memory-mapped from the snapshot.
+WARM_START_INPUTS = [
+    'lot_mapping_enhanced_with_coords.csv', 'lot_mapping_enhanced.csv', 'academic_calendar.csv',
+    'football_games.csv', 'weather_pullman_hourly_2020_2025.csv', 'processed/occupancy_lot_level_full.csv',
+    'processed/occupancy_history_2025.csv', 'processed/enforcement_full_extended.csv',
+    'processed/occupancy_lot_level_lpr_full.csv'
+]
+WARM_START_CODE = ['parking_api.py', 'feature_engineering.py', 'memory_footprint.py', 'risk_heatmap.py']
+
+warm_start_fingerprint = {
+    'data': file_fingerprint([os.path.join(DATA_DIR, name) for name in WARM_START_INPUTS]),
+    'models': artifact_fingerprint(MODEL_DIR),
+    'code': file_fingerprint([os.path.join(os.path.dirname(__file__), name) for name in WARM_START_CODE]),
+    'settings': {'occupancy': OCCUPANCY_ENABLED, 'enforcement': ENFORCEMENT_ENABLED,
+                 'lpr_window_days': LPR_WINDOW_DAYS}
+}
+warm_snapshot = None
+warm_start = None
+warm_objects, warm_frames = {}, {}
+if WARM_START_CONFIG.get('enabled', False):
+    warm_snapshot = WarmStartSnapshot(f'{DATA_DIR}/processed/warm_start')
+    warm_start = warm_snapshot.load(warm_start_fingerprint)
+    if warm_start is not None:
+        warm_objects, warm_frames = warm_start
+        print(f"Restored derived data from the warm-start snapshot in {warm_snapshot.load_seconds}s")
+    else:
+        print(f"No usable warm-start snapshot ({warm_snapshot.miss_reason}), building from data files")
+
+def is_restricted_zone_type(zone_type):
+    """Lots reserved for University Vehicles, ADA, Guest Pass, etc. are not offered to users"""
+    zone_type = str(zone_type) if pd.notna(zone_type) else ''
+    return 'University' in zone_type or 'ADA' in zone_type or 'Guest' in zone_type
+
+def load_lot_tables():
+    """Lot mapping plus the capacity and AMP zone lookups derived from it"""
+    # Load lot mapping data (prefer version with coordinates if available)
+    lot_mapping_with_coords = f'{DATA_DIR}/lot_mapping_enhanced_with_coords.csv'
+    if os.path.exists(lot_mapping_with_coords):
+        lot_mapping = pd.read_csv(lot_mapping_with_coords)
+        print("  Loaded lot mapping with coordinates")
+    else:
+        lot_mapping = pd.read_csv(f'{DATA_DIR}/lot_mapping_enhanced.csv')
+        print("  Loaded lot mapping (no coordinates yet)")
+
+    # Build capacity dictionary and lot->AMP zone mapping from lot_mapping_enhanced.csv
+    zone_capacity_dict = {}
+    lot_to_amp_zone = {}  # Maps lot_number -> AMP zone name for occupancy predictions
+    lot_capacities = {}  # Maps lot_number -> capacity
+
+    for _, row in lot_mapping.iterrows():
+        lot_num = int(row['Lot_number'])
+        capacity = float(row['capacity']) if pd.notna(row.get('capacity')) else 0
+
+        # Store lot capacity
+        lot_capacities[lot_num] = capacity
+
+        # Map alternative_location_description (AMP zone names) to capacity
+        zone_name = row.get('alternative_location_description')
+        if pd.notna(zone_name):
+            for name in str(zone_name).split('|'):
+                name = name.strip()
+                if name:
+                    if name in zone_capacity_dict:
+                        zone_capacity_dict[name] += capacity
+                    else:
+                        zone_capacity_dict[name] = capacity
 
-# Lot-level LPR model (NEW - for individual lot predictions)
-lot_level_lpr_model = None
-lot_level_lpr_metadata = None
-lot_level_lpr_features = None
+                    # Store first AMP zone name for this lot
+                    if lot_num not in lot_to_amp_zone:
+                        lot_to_amp_zone[lot_num] = name
 
-enforcement_model = None
-enforcement_features = None
-enforcement_metadata = None
+        # Also add aggregated Zone_Name -> total capacity
+        zone_type = row.get('Zone_Name')
+        if pd.notna(zone_type):
+            if zone_type in zone_capacity_dict:
+                zone_capacity_dict[zone_type] += capacity
+            else:
+                zone_capacity_dict[zone_type] = capacity
 
-if OCCUPANCY_ENABLED:
-    print("Loading occupancy models...")
+    print(f"Loaded capacities for {len(zone_capacity_dict)} zones/lots from lot_mapping_enhanced.csv")
+    print(f"Mapped {len(lot_to_amp_zone)} lots to AMP zones for occupancy predictions")
+    return lot_mapping, zone_capacity_dict, lot_to_amp_zone, lot_capacities
 
-    # Load zone-level AMP occupancy model (62 lots)
-    with open(f'{MODEL_DIR}/occupancy_lightgbm_tuned.pkl', 'rb') as f:
-        occupancy_model = pickle.load(f)
+# The lot catalog is small and needed by almost every endpoint, so it loads now
+if 'lot_tables' in warm_objects:
+    lot_mapping, zone_capacity_dict, lot_to_amp_zone, lot_capacities = warm_objects['lot_tables']
+else:
+    lot_mapping, zone_capacity_dict, lot_to_amp_zone, lot_capacities = load_lot_tables()
+
+# MEMORY OPTIMIZATION: every worker holds its own copy of the histories, so they
+# keep only the columns feature engineering reads, with categorical zone names
+# and narrow numeric types
+OCCUPANCY_HISTORY_COLUMNS = ['Zone', 'hour', 'day_of_week', 'occupancy_mean', 'occupancy_count']
+ENFORCEMENT_HISTORY_COLUMNS = ['datetime', 'Zone', 'Lot_Name', 'hour', 'day_of_week',
+                               'tickets_issued', 'lpr_scans', 'amp_sessions', 'unpaid_estimate']
+LPR_HISTORY_COLUMNS = ['lot_number', 'datetime', 'lpr_scans']
+HISTORY_CATEGORICALS = ('Zone', 'Lot_Name')
+
+# Everything else (datasets, feature engineers, and in the bundle each model
+# artifact) loads on first use, so a node only pays for the endpoints it
+# serves. With lazy_loading.warm_in_background, the warm-up thread below
+# loads them right after startup instead. Load times are in /api/status.
+components = ComponentRegistry()
+
+# History frames as first loaded, before any live ingestion replaces them;
+# these are what a warm-start snapshot stores
+startup_frames = {}
+
+def load_amp_coverage():
+    """(AMP zone capacities, lot -> AMP coverage ratio (amp_cap / lot_cap)), from the occupancy data"""
+    if 'amp_coverage' in warm_objects:
+        return warm_objects['amp_coverage']
+
+    # Load AMP zone capacities from occupancy data
+    amp_zone_capacities = {}
+    if OCCUPANCY_ENABLED:
+        occupancy_data_path = f'{DATA_DIR}/processed/occupancy_lot_level_full.csv'
+        if os.path.exists(occupancy_data_path):
+            occ_df = pd.read_csv(occupancy_data_path, usecols=['Zone', 'Max_Capacity'])
+            amp_zone_capacities = occ_df.groupby('Zone')['Max_Capacity'].first().to_dict()
+            del occ_df
+            print(f"Loaded {len(amp_zone_capacities)} AMP zone capacities from occupancy data")
+
+    # Coverage of each lot's first AMP zone, relative to the capacity on the
+    # mapping row that named it
+    lot_amp_coverage = {}
+    covered = set()
+    for _, row in lot_mapping.iterrows():
+        lot_num = int(row['Lot_number'])
+        zone_name = row.get('alternative_location_description')
+        if lot_num in covered or pd.isna(zone_name) or not any(n.strip() for n in str(zone_name).split('|')):
+            continue
+        covered.add(lot_num)
+        capacity = float(row['capacity']) if pd.notna(row.get('capacity')) else 0
+        amp_cap = amp_zone_capacities.get(lot_to_amp_zone[lot_num], 0)
+        if capacity > 0 and amp_cap > 0:
+            lot_amp_coverage[lot_num] = amp_cap / capacity
+
+    print(f"  {len([c for c in lot_amp_coverage.values() if c >= 0.8])} lots with good AMP coverage (>=80%)")
+    print(f"  {len([c for c in lot_amp_coverage.values() if c < 0.8])} lots with partial AMP coverage (<80%), will use time-pattern estimates")
+    return amp_zone_capacities, lot_amp_coverage
+
+def load_reference_data():
+    """(academic calendar, football games, hourly weather) frames"""
+    calendar_df = pd.read_csv(f'{DATA_DIR}/academic_calendar.csv')
+    games_df = pd.read_csv(f'{DATA_DIR}/football_games.csv')
+    weather_df = pd.read_csv(f'{DATA_DIR}/weather_pullman_hourly_2020_2025.csv')
+    print(f"Loaded academic calendar, football games and {len(weather_df)} hourly weather records")
+    return calendar_df, games_df, weather_df
+
+def load_time_pattern():
+    # Occupancy rates by (session state, day of week, hour, zone type) for lots the
+    # occupancy model doesn't cover, with session states taken from the calendar
+    calendar_df, _, _ = components.reference_data
+    return TimePatternEstimator(calendar_df)
+
+def load_occupancy_history():
+    if 'occupancy_history' in warm_frames:
+        frame = warm_frames['occupancy_history']
+    else:
+        frame = compact_frame(
+            pd.read_csv(f'{DATA_DIR}/processed/occupancy_history_2025.csv'),
+            OCCUPANCY_HISTORY_COLUMNS, HISTORY_CATEGORICALS
+        )
+    print(f"Loaded 2025 occupancy history: {frame['Zone'].nunique()} zones")
+    startup_frames['occupancy_history'] = frame
+    return frame
+
+def load_enforcement_history():
+    """ZONE-LEVEL enforcement history; both feature engineers only read it, so they share the frame"""
+    if not (OCCUPANCY_ENABLED or ENFORCEMENT_ENABLED):
+        return None
+    if 'enforcement_history' in warm_frames:
+        frame = warm_frames['enforcement_history']
+    else:
+        frame = compact_frame(
+            pd.read_csv(f'{DATA_DIR}/processed/enforcement_full_extended.csv', parse_dates=['datetime']),
+            ENFORCEMENT_HISTORY_COLUMNS, HISTORY_CATEGORICALS
+        )
+    print(f"Loaded ZONE-LEVEL enforcement history: {len(frame):,} records")
+    print(f"  Unique zones: {frame['Zone'].nunique()}")
+    startup_frames['enforcement_history'] = frame
+    return frame
 
-    with open(f'{MODEL_DIR}/occupancy_zone_encoder.pkl', 'rb') as f:
-        occupancy_zone_encoder = pickle.load(f)
+# Load lot-level LPR historical data for lag features
+# MEMORY OPTIMIZATION: Only load last 60 days of data (sufficient for 168h lag features).
+# The full CSV is split once into monthly partitions, so startup only reads the
+# months overlapping the window instead of parsing the whole archive
+lpr_store = None
 
-    with open(f'{MODEL_DIR}/occupancy_feature_list_lags.pkl', 'rb') as f:
-        occupancy_features = pickle.load(f)
+def load_lpr_window(cutoff_date):
+    """(LPR history since cutoff_date, the monthly store it was read from or None)"""
+    lpr_history_path = f'{DATA_DIR}/processed/occupancy_lot_level_lpr_full.csv'
+    lpr_store = None
+    if LPR_STORE_CONFIG.get('enabled', True):
+        try:
+            lpr_store = LPRHistoryStore.open_or_build(
+                f'{DATA_DIR}/processed/lpr_store', lpr_history_path, LPR_STORE_CONFIG.get('build_if_missing', True)
+            )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  WARNING: could not use the monthly LPR store, reading the CSV instead: {e}")
+
+    if lpr_store is not None:
+        print(f"Loading lot-level LPR history (last {LPR_WINDOW_DAYS} days only) from the monthly store...")
+        lpr_history = lpr_store.read_frame(cutoff_date)
+    elif os.path.exists(lpr_history_path):
+        print(f"Loading lot-level LPR history (last {LPR_WINDOW_DAYS} days only)...")
+        # Filter each chunk as it is read so the full file is never in memory at once
+        lpr_history = pd.concat([
+            chunk[chunk['datetime'] >= cutoff_date]
+            for chunk in pd.read_csv(lpr_history_path, parse_dates=['datetime'],
+                                     usecols=LPR_HISTORY_COLUMNS, chunksize=500000)
+        ])
+    else:
+        print(f"  WARNING: LPR history not found at {lpr_history_path}")
+        return None, lpr_store
+    return compact_frame(lpr_history, LPR_HISTORY_COLUMNS), lpr_store
+
+def load_lpr_history():
+    """Last LPR_WINDOW_DAYS of lot-level LPR scans (None without the lot-level model)"""
+    global lpr_store
+    if active_bundle.lot_level_lpr_model is None:
+        return None
+    cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=LPR_WINDOW_DAYS)
+    if 'lpr_history' in warm_frames:
+        # The snapshot's window started earlier; drop the rows that have aged out since
+        lpr_history = warm_frames['lpr_history']
+        aged_out = lpr_history['datetime'] < cutoff_date
+        if aged_out.any():
+            lpr_history = lpr_history[~aged_out]
+    else:
+        lpr_history, lpr_store = load_lpr_window(cutoff_date)
+
+    if lpr_history is not None:
+        print(f"  LPR history loaded: {len(lpr_history):,} records ({lpr_history['lot_number'].nunique()} lots, last {LPR_WINDOW_DAYS} days)")
+        startup_frames['lpr_history'] = lpr_history
+    return lpr_history
+
+def load_lpr_index():
+    """Per-lot positions in the LPR history, so lot lookups skip scanning the whole window"""
+    lpr_history = components.lpr_history
+    return ZoneHistoryIndex(lpr_history, 'lot_number') if lpr_history is not None else None
+
+# Records ingested since each history frame was last rebuilt (see ingest_lpr_records)
+HISTORY_REBUILD_FRACTION = INGESTION_CONFIG.get('history_rebuild_fraction', 0.1)
+lpr_pending = PendingRecords(HISTORY_REBUILD_FRACTION)
+enforcement_pending = PendingRecords(HISTORY_REBUILD_FRACTION)
+
+# Calendar/game/weather features per date, shared by both engineers (they read
+# the same calendar, games and weather frames)
+date_feature_cache = LRUCache('date_features', FEATURE_CACHE_CONFIG.get('date_entries', 512))
+lot_date_feature_cache = LRUCache('lot_date_features', FEATURE_CACHE_CONFIG.get('date_entries', 512))
+
+def build_feature_engineer(kind):
+    """Feature engineer for OCCUPANCY or ENFORCEMENT predictions (None when that model is disabled)"""
+    if not (OCCUPANCY_ENABLED if kind == 'occupancy' else ENFORCEMENT_ENABLED):
+        return None
+    calendar_df, games_df, weather_df = components.reference_data
+    engineer = FeatureEngineer(
+        calendar_df=calendar_df,
+        games_df=games_df,
+        weather_df=weather_df,
+        zone_capacity_dict=zone_capacity_dict,
+        occupancy_history_2025=components.occupancy_history,
+        enforcement_history=components.enforcement_history,
+        date_cache=date_feature_cache
+    )
+    if 'history_indexes' in warm_objects:
+        # Saved indexes only fit histories live ingestion hasn't replaced since startup
+        current = {'occupancy': engineer.occupancy_history, 'enforcement': engineer.enforcement_history}
+        engineer.import_history_indexes({
+            name: state for name, state in warm_objects['history_indexes'].get(kind, {}).items()
+            if current[name] is warm_frames.get(f'{name}_history')
+        })
+    pending = enforcement_pending.frame()
+    if pending is not None and engineer.enforcement_history is not None:
+        # Records ingested before this engineer was built
+        engineer.append_history('enforcement', pending)
+    print(f"  {kind.capitalize()} feature engineer initialized!")
+    return engineer
+
+components.register('amp_coverage', load_amp_coverage)
+components.register('reference_data', load_reference_data)
+components.register('time_pattern', load_time_pattern)
+components.register('occupancy_history', load_occupancy_history)
+components.register('enforcement_history', load_enforcement_history)
+components.register('lpr_history', load_lpr_history)
+components.register('lpr_index', load_lpr_index)
+components.register('feature_engineer_occupancy', lambda: build_feature_engineer('occupancy'))
+components.register('feature_engineer_enforcement', lambda: build_feature_engineer('enforcement'))
+# Nearest-lot queries only consider lots open to the public
+components.register('lot_index', lambda: LotSpatialIndex(lot_mapping[~lot_mapping['zone_type'].map(is_restricted_zone_type)]))
+REGISTRY.register_collector(lambda: [
+    ('cougarpark_component_load_seconds', 'gauge', 'Seconds taken to load each lazily loaded component',
+     [({'component': name}, seconds) for name, seconds in components.load_seconds.items()])
+])
 
-    with open(f'{MODEL_DIR}/occupancy_model_metadata.json', 'r') as f:
-        occupancy_metadata = json.load(f)
-    print("  Zone-level occupancy model loaded (62 lots with AMP data)")
+if not (OCCUPANCY_ENABLED or ENFORCEMENT_ENABLED):
+    print("WARNING: All models are disabled!")
 
-    # Load lot-level LPR model (185 lots)
-    try:
-        with open(f'{MODEL_DIR}/occupancy_lot_level_lpr_model.pkl', 'rb') as f:
-            lot_level_lpr_model = pickle.load(f)
+# Micro-batching: concurrent requests hand their feature rows to a scheduler
+# that scores them together in one booster call
+occupancy_scheduler = None
+enforcement_scheduler = None
+
+batching_config = INFERENCE_CONFIG.get('batching', {})
+# Pool workers score one chunk at a time, so batching there would only add latency
+if batching_config.get('enabled', False) and not is_pool_worker():
+    max_batch_size = batching_config.get('max_batch_size', 64)
+    max_wait_ms = batching_config.get('max_wait_ms', 2)
+
+    if OCCUPANCY_ENABLED:
+        occupancy_scheduler = InferenceScheduler(
+            lambda model, X: model.predict(X),
+            max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name='occupancy',
+            on_batch=lambda rows, seconds: observe_model_call('occupancy', rows, seconds)
+        )
+    if ENFORCEMENT_ENABLED:
+        enforcement_scheduler = InferenceScheduler(
+            lambda model, X: model.predict_proba(X)[:, 1],
+            max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name='enforcement',
+            on_batch=lambda rows, seconds: observe_model_call('enforcement', rows, seconds)
+        )
+    print(f"Inference batching enabled (max batch {max_batch_size} rows, max wait {max_wait_ms} ms)")
+
+# Optional process pool: large batches of feature construction + scoring are
+# split across pre-warmed worker processes that each load models and data once
+process_backend = None
+pool_config = INFERENCE_CONFIG.get('process_pool', {})
+PROCESS_POOL_MIN_ROWS = pool_config.get('min_rows', 64)
+
+if pool_config.get('enabled', False) and not is_pool_worker():
+    print("Starting inference process pool...")
+    process_backend = ProcessPoolBackend(
+        workers=pool_config.get('workers'),
+        task_timeout_s=pool_config.get('task_timeout_s', 30),
+        chunk_size=pool_config.get('chunk_size', 256),
+        worker_env={'COUGARPARK_MODEL_DIR': MODEL_DIR}
+    )
+    print(f"  {process_backend.workers} worker processes ready")
+
+# Single-flight groups: identical predictions requested at the same moment
+# (same zone, same start time) are computed once and shared by every caller
+recommend_flight = SingleFlight('recommend')
+zone_occupancy_flight = SingleFlight('zone_occupancy')
+enforcement_hourly_flight = SingleFlight('enforcement_hourly')
+
+# Admission control: under overload, requests skip model inference and are
+# answered from cheaper tiers (recent forecasts, the risk heatmap, then
+# time-pattern estimates); every response says which tier served it
+admission = None
+if ADMISSION_CONFIG.get('enabled', False) and not is_pool_worker():
+    admission = AdmissionController(
+        max_in_flight=ADMISSION_CONFIG.get('max_in_flight', 32),
+        max_queue_depth=ADMISSION_CONFIG.get('max_queue_depth', 256),
+        latency_budget_ms=ADMISSION_CONFIG.get('latency_budget_ms', 250),
+        probe_interval_s=ADMISSION_CONFIG.get('probe_interval_s', 1.0),
+        queue_depth_fn=lambda: sum(
+            scheduler.queue_depth() for scheduler in (occupancy_scheduler, enforcement_scheduler) if scheduler
+        )
+    )
 
-        with open(f'{MODEL_DIR}/occupancy_lot_level_lpr_metadata.json', 'r') as f:
-            lot_level_lpr_metadata = json.load(f)
-            lot_level_lpr_features = lot_level_lpr_metadata['features']['feature_list']
+# Model outputs of recent requests, keyed by (kind, zone or lot, exact time),
+# served when a later request for the same inputs is shed
+forecast_cache = LRUCache('forecast_cache', ADMISSION_CONFIG.get('forecast_cache_entries', 20000))
+# Per-lot average LPR scans by (day of week, hour), the lot-level time pattern
+lpr_pattern_cache = LRUCache('lpr_time_pattern', 1024)
+
+def admit_inference():
+    """Context manager yielding True when this request may run model inference"""
+    return admission.admit() if admission is not None else nullcontext(True)
+
+def invalidate_forecasts(kind, keys, start, end):
+    if kind == 'lpr':
+        lots = set(keys)
+        forecast_cache.invalidate(lambda key: key[0] == 'lot_lpr' and key[1] in lots)
+        lpr_pattern_cache.invalidate(lambda lot: lot in lots)
+    elif kind == 'enforcement':
+        # Enforcement lags reach 24 hours back, so the new rows change forecasts
+        # up to a day after them: for the zones themselves, their lots and the
+        # AMP zones of those lots (all keys are canonical_time strings, which
+        # sort by time)
+        first = canonical_time(start)
+        last = canonical_time(end + pd.Timedelta(hours=24))
+        zones = set(keys)
+        lots = set(lot_mapping.loc[lot_mapping['Zone_Name'].isin(zones), 'Lot_number'].dropna().astype(int))
+        amp_zones = {lot_to_amp_zone[lot] for lot in lots if lot in lot_to_amp_zone}
+        stale = {'enforcement': zones, 'occupancy': zones | amp_zones, 'amp_occupancy': lots}
+        forecast_cache.invalidate(
+            lambda key: key[0] in stale and key[1] in stale[key[0]] and first <= key[2] <= last
+        )
+    else:
+        forecast_cache.invalidate()
+
+add_invalidation_listener(invalidate_forecasts)
+
+# Live ingestion: new hourly records dropped into a directory are appended to
+# the in-memory histories so lag features stay current without a restart.
+# Updates swap in a new per-zone index that shares the history frame and holds
+# just the new rows, so requests already reading the old one are unaffected;
+# the frame itself is rebuilt once ingested rows reach history_rebuild_fraction
+# of it.
+history_lock = threading.Lock()
+
+def ingest_lpr_records(records_df):
+    """Append hourly LPR records to the LPR history, evicting rows older than the LPR window"""
+    if components.lpr_history is None:
+        return 0
+
+    records = prepare_lpr_records(records_df)
+    if len(records) == 0:
+        return 0
+
+    with history_lock:
+        newest = max(pd.Timestamp.now(), records['datetime'].max())
+        window_start = newest - pd.Timedelta(days=LPR_WINDOW_DAYS)
+        lpr_pending.add(records)
+        if lpr_pending.rebuild_due(components.lpr_history):
+            lpr_history = compact_frame(
+                lpr_pending.merge_into(components.lpr_history, ['lot_number', 'datetime'], window_start),
+                LPR_HISTORY_COLUMNS
+            )
+            components.set('lpr_history', lpr_history)
+            components.set('lpr_index', ZoneHistoryIndex(lpr_history, 'lot_number'))
+        else:
+            components.set('lpr_index', components.lpr_index.appended(records, window_start))
 
-        print(f"  Lot-level LPR model loaded ({lot_level_lpr_metadata['num_lots']} lots)")
-    except FileNotFoundError:
-        print("  WARNING: Lot-level LPR model not found, only zone-level predictions available")
+    notify_invalidation('lpr', sorted(records['lot_number'].unique().tolist()),
+                        records['datetime'].min(), records['datetime'].max())
+    return len(records)
 
-if ENFORCEMENT_ENABLED:
-    print("Loading enforcement model...")
-    with open(f'{MODEL_DIR}/enforcement_xgboost_tuned.pkl', 'rb') as f:
-        enforcement_model = pickle.load(f)
+def ingest_enforcement_records(records_df):
+    """
+    Append hourly enforcement records to the shared enforcement history
 
-    with open(f'{MODEL_DIR}/enforcement_feature_list_lags.pkl', 'rb') as f:
-        enforcement_features = pickle.load(f)
+    The enforcement history is not windowed: zone averages and day-of-week/hour
+    rates are computed over all of it, as at startup. Only the zones in the
+    new records are re-indexed (and lose their cached per-zone values).
+    """
+    if components.enforcement_history is None:
+        return 0
+
+    records = prepare_enforcement_records(records_df)
+    if len(records) == 0:
+        return 0
+
+    with history_lock:
+        enforcement_history = components.enforcement_history
+        enforcement_pending.add(records)
+        # Engineers not loaded yet pick up the pending records when they are built
+        engineers = [engineer for engineer in (components.peek('feature_engineer_occupancy'),
+                                               components.peek('feature_engineer_enforcement'))
+                     if engineer is not None]
+        if enforcement_pending.rebuild_due(enforcement_history):
+            lookup_col = 'Lot_Name' if 'Lot_Name' in enforcement_history.columns else 'Zone'
+            enforcement_history = compact_frame(
+                enforcement_pending.merge_into(enforcement_history, [lookup_col, 'datetime']),
+                ENFORCEMENT_HISTORY_COLUMNS, HISTORY_CATEGORICALS
+            )
+            components.set('enforcement_history', enforcement_history)
+            for engineer in engineers:
+                engineer.enforcement_history = enforcement_history
+        else:
+            for engineer in engineers:
+                engineer.append_history('enforcement', records)
+
+    notify_invalidation('enforcement', sorted(records['Zone'].unique().tolist()),
+                        records['datetime'].min(), records['datetime'].max())
+    return len(records)
+
+def refresh_pool_workers():
+    """Pool workers hold their own copy of the histories; they apply the new files before their next task"""
+    if process_backend is not None:
+        process_backend.history_mark = history_watcher.applied_mark_ns
+
+def sync_history(mark_ns):
+    """In a pool worker: apply the drop files the parent has ingested since this worker last did"""
+    if history_watcher is not None:
+        history_watcher.catch_up(mark_ns)
+
+def compact_lpr_records(records_df):
+    """Ingested LPR records still worth replaying: the newest per lot and hour, inside the LPR window"""
+    records = prepare_lpr_records(records_df).drop_duplicates(['lot_number', 'datetime'], keep='last')
+    return records[records['datetime'] >= pd.Timestamp.now() - pd.Timedelta(days=LPR_WINDOW_DAYS)][LPR_COLUMNS]
+
+def compact_enforcement_records(records_df):
+    """Ingested enforcement records still worth replaying: the newest per zone and hour"""
+    records = prepare_enforcement_records(records_df).drop_duplicates(['Zone', 'datetime'], keep='last')
+    return records[ENFORCEMENT_COLUMNS + ['lpr_estimated']]
+
+history_watcher = None
+if INGESTION_CONFIG.get('enabled', False):
+    history_watcher = DropDirectoryWatcher(
+        os.path.join(PROJECT_ROOT, INGESTION_CONFIG.get('drop_dir', 'data/incoming')),
+        handlers={'lpr_': ingest_lpr_records, 'enforcement_': ingest_enforcement_records},
+        poll_interval_s=INGESTION_CONFIG.get('poll_interval_s', 5),
+        on_applied=refresh_pool_workers,
+        compactors={'lpr_': compact_lpr_records, 'enforcement_': compact_enforcement_records}
+    )
+    # Without this, processed/ grows by a file per drop and every start replays all of it
+    if INGESTION_CONFIG.get('compact_on_start', True) and not is_pool_worker():
+        files_before, files_after = history_watcher.compact_processed()
+        if files_before > files_after:
+            print(f"Compacted {files_before} ingested files into {files_after}")
+    # Records ingested before a restart are not in the base CSVs, replay them
+    replayed = history_watcher.replay_processed()
+    if replayed:
+        print(f"Replayed {replayed:,} previously ingested history records")
+    if not is_pool_worker():
+        history_watcher.start()
+        print(f"Watching {history_watcher.drop_dir} for new LPR/enforcement records")
+
+# Model outputs memoized by (quantized) feature vector: different zones and
+# hours often produce identical vectors, e.g. future hours with no history
+prediction_memo = None
+memo_config = INFERENCE_CONFIG.get('prediction_memo', {})
+if memo_config.get('enabled', False):
+    prediction_memo = PredictionMemo(
+        'prediction_memo', memo_config.get('max_entries', 100000), memo_config.get('decimals', 6)
+    )
+    # Keys carry the bundle version; drop outputs of replaced models right away
+    add_invalidation_listener(lambda kind, keys, start, end: kind == 'models' and prediction_memo.clear())
 
-    with open(f'{MODEL_DIR}/enforcement_model_metadata.json', 'r') as f:
-        enforcement_metadata = json.load(f)
-    print("  Enforcement model loaded successfully!")
+def canonical_time(dt):
+    """Timezone-naive ISO timestamp used to key identical prediction inputs"""
+    dt = pd.Timestamp(dt)
+    if dt.tz is not None:
+        dt = dt.tz_localize(None)
+    return dt.isoformat()
+
+def run_model_call(model_name, predict_fn, rows):
+    """Run one booster call directly, recording its batch size and duration"""
+    start = time.perf_counter()
+    output = np.asarray(predict_fn())
+    observe_model_call(model_name, rows, time.perf_counter() - start)
+    return output
+
+def memoized(kind, bundle, feature_array, predict_fn):
+    """predict_fn(rows) for the rows whose feature vector has no memoized output"""
+    if prediction_memo is None:
+        return predict_fn(feature_array)
+    return prediction_memo.predict((kind, bundle.version), feature_array, predict_fn)
+
+@timed_stage('model_inference')
+def predict_occupancy_rows(feature_array, bundle):
+    """Score occupancy feature rows, through the batching scheduler when enabled"""
+    record_features('occupancy', feature_array)
+    model = bundle.occupancy_model
+
+    def predict(rows):
+        if occupancy_scheduler is not None:
+            return occupancy_scheduler.predict(model, rows)
+        return run_model_call('occupancy', lambda: model.predict(rows), len(rows))
+    return memoized('occupancy', bundle, feature_array, predict)
+
+@timed_stage('model_inference')
+def predict_enforcement_rows(feature_array, bundle):
+    """Score enforcement feature rows (probability of a ticket), batched when enabled"""
+    record_features('enforcement', feature_array)
+    model = bundle.enforcement_model
+
+    def predict(rows):
+        if enforcement_scheduler is not None:
+            return enforcement_scheduler.predict(model, rows)
+        return run_model_call('enforcement', lambda: model.predict_proba(rows)[:, 1], len(rows))
+    return memoized('enforcement', bundle, feature_array, predict)
+
+@timed_stage('model_inference')
+def predict_lot_lpr_rows(features_df, bundle):
+    """Score lot-level LPR feature rows (predicted scans)"""
+    features_df = features_df[bundle.lot_level_lpr_features]
+    record_features('lot_level_lpr', features_df)
+
+    # Convert categorical columns to category dtype
+    for col in ['Zone', 'weather_category']:
+        if col in features_df.columns and features_df[col].dtype == 'object':
+            features_df[col] = features_df[col].astype('category')
+
+    return run_model_call('lot_level_lpr', lambda: bundle.lot_level_lpr_model.predict(features_df), len(features_df))
+
+def build_feature_rows(kind, row_keys, dts, on_error='raise', bundle=None, overrides=None):
+    """
+    Feature matrix for a batch of (zone or lot, datetime) rows
 
-# Load lot mapping data (prefer version with coordinates if available)
-import os
-lot_mapping_with_coords = f'{DATA_DIR}/lot_mapping_enhanced_with_coords.csv'
-if os.path.exists(lot_mapping_with_coords):
-    lot_mapping = pd.read_csv(lot_mapping_with_coords)
-    print("  Loaded lot mapping with coordinates")
-else:
-    lot_mapping = pd.read_csv(f'{DATA_DIR}/lot_mapping_enhanced.csv')
-    print("  Loaded lot mapping (no coordinates yet)")
-
-# Build capacity dictionary and lot->AMP zone mapping from lot_mapping_enhanced.csv
-zone_capacity_dict = {}
-lot_to_amp_zone = {}  # Maps lot_number -> AMP zone name for occupancy predictions
-lot_capacities = {}  # Maps lot_number -> capacity
-lot_amp_coverage = {}  # Maps lot_number -> AMP coverage ratio (amp_cap / lot_cap)
-
-# Load AMP zone capacities from occupancy data
-amp_zone_capacities = {}
-if OCCUPANCY_ENABLED:
-    occupancy_data_path = f'{DATA_DIR}/processed/occupancy_lot_level_full.csv'
-    if os.path.exists(occupancy_data_path):
-        occ_df = pd.read_csv(occupancy_data_path)
-        amp_zone_capacities = occ_df.groupby('Zone')['Max_Capacity'].first().to_dict()
-        print(f"Loaded {len(amp_zone_capacities)} AMP zone capacities from occupancy data")
-
-for _, row in lot_mapping.iterrows():
-    lot_num = int(row['Lot_number'])
-    capacity = float(row['capacity']) if pd.notna(row.get('capacity')) else 0
-
-    # Store lot capacity
-    lot_capacities[lot_num] = capacity
-
-    # Map alternative_location_description (AMP zone names) to capacity
-    zone_name = row.get('alternative_location_description')
-    if pd.notna(zone_name):
-        for name in str(zone_name).split('|'):
-            name = name.strip()
-            if name:
-                if name in zone_capacity_dict:
-                    zone_capacity_dict[name] += capacity
-                else:
-                    zone_capacity_dict[name] = capacity
-
-                # Store first AMP zone name for this lot and calculate coverage
-                if lot_num not in lot_to_amp_zone:
-                    lot_to_amp_zone[lot_num] = name
-
-                    # Calculate AMP coverage ratio
-                    amp_cap = amp_zone_capacities.get(name, 0)
-                    if capacity > 0 and amp_cap > 0:
-                        coverage_ratio = amp_cap / capacity
-                        lot_amp_coverage[lot_num] = coverage_ratio
-
-    # Also add aggregated Zone_Name -> total capacity
-    zone_type = row.get('Zone_Name')
-    if pd.notna(zone_type):
-        if zone_type in zone_capacity_dict:
-            zone_capacity_dict[zone_type] += capacity
+    kind is 'occupancy' or 'enforcement' (keys are zone names) or 'lot_lpr'
+    (keys are lot numbers). Returns (features_df, row_ok); with on_error='skip'
+    rows whose features cannot be built are left out and marked False in row_ok.
+    overrides (from parse_date_overrides) replace date features on every row.
+    """
+    bundle = bundle or active_bundle
+    if kind == 'occupancy':
+        engineer, feature_names = components.feature_engineer_occupancy, bundle.occupancy_features
+    elif kind == 'enforcement':
+        engineer, feature_names = components.feature_engineer_enforcement, bundle.enforcement_features
+    elif kind == 'lot_lpr':
+        engineer, feature_names = None, None
+    else:
+        raise ValueError(f"Unknown prediction kind: {kind}")
+
+    # Zone rows are filled into per-zone template rows and framed once at the end
+    rows = []
+    row_ok = np.zeros(len(row_keys), dtype=bool)
+
+    for i, (key, dt) in enumerate(zip(row_keys, dts)):
+        try:
+            if engineer is not None:
+                rows.append(engineer.create_feature_row(key, dt, bundle.occupancy_zone_encoder, feature_names))
+            else:
+                rows.append(create_lot_level_features(int(key), dt, components.lpr_index.rows(int(key))))
+            row_ok[i] = True
+        except Exception as e:
+            FEATURE_ERRORS.inc(kind=kind)
+            if on_error == 'raise':
+                raise
+            print(f"Warning: Could not build {kind} features for '{key}' at {dt}: {e}")
+
+    if not rows:
+        return None, row_ok
+    if engineer is not None:
+        return apply_date_overrides(engineer.rows_to_frame(rows, feature_names), overrides), row_ok
+    return pd.concat(rows, ignore_index=True), row_ok
+
+def score_rows_local(kind, row_keys, dts, on_error='raise', bundle=None, overrides=None):
+    """Build features and score a batch of rows in this process (NaN for skipped rows)"""
+    bundle = bundle or active_bundle
+    features_df, row_ok = build_feature_rows(kind, row_keys, dts, on_error=on_error, bundle=bundle,
+                                             overrides=overrides)
+
+    scores = np.full(len(row_keys), np.nan)
+    if features_df is not None:
+        if kind == 'occupancy':
+            scores[row_ok] = predict_occupancy_rows(features_df, bundle)
+        elif kind == 'enforcement':
+            scores[row_ok] = predict_enforcement_rows(features_df, bundle)
         else:
-            zone_capacity_dict[zone_type] = capacity
+            scores[row_ok] = predict_lot_lpr_rows(features_df, bundle)
+    return scores
 
-print(f"Loaded capacities for {len(zone_capacity_dict)} zones/lots from lot_mapping_enhanced.csv")
-print(f"Mapped {len(lot_to_amp_zone)} lots to AMP zones for occupancy predictions")
-print(f"  {len([c for c in lot_amp_coverage.values() if c >= 0.8])} lots with good AMP coverage (>=80%)")
-print(f"  {len([c for c in lot_amp_coverage.values() if c < 0.8])} lots with partial AMP coverage (<80%), will use time-pattern estimates")
+def score_rows(kind, row_keys, dts, on_error='raise', bundle=None, overrides=None):
+    """
+    Build features and score a batch of (zone or lot, datetime) rows
 
-# Load shared data files
-calendar_df = pd.read_csv(f'{DATA_DIR}/academic_calendar.csv')
-games_df = pd.read_csv(f'{DATA_DIR}/football_games.csv')
-weather_df = pd.read_csv(f'{DATA_DIR}/weather_pullman_hourly_2020_2025.csv')
-occupancy_history_2025 = pd.read_csv(f'{DATA_DIR}/processed/occupancy_history_2025.csv')
+    Large batches go to the process pool when it is enabled; small ones are
+    cheaper to score in-process than to ship to a worker.
+    """
+    dts = pd.DatetimeIndex(dts)
+    if dts.tz is not None:
+        dts = dts.tz_localize(None)
 
-# Load lot-level LPR historical data for lag features
-# MEMORY OPTIMIZATION: Only load last 60 days of data (sufficient for 168h lag features)
-lpr_history = None
-if lot_level_lpr_model is not None:
-    lpr_history_path = f'{DATA_DIR}/processed/occupancy_lot_level_lpr_full.csv'
-    if os.path.exists(lpr_history_path):
-        print(f"Loading lot-level LPR history (last 60 days only)...")
-        # Only load recent data to reduce memory usage
-        lpr_history = pd.read_csv(
-            lpr_history_path,
-            parse_dates=['datetime'],
-            usecols=['lot_number', 'datetime', 'lpr_scans', 'date', 'hour']  # Only needed columns
-        )
-        # Filter to last 60 days
-        cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=60)
-        lpr_history = lpr_history[lpr_history['datetime'] >= cutoff_date].copy()
-        print(f"  LPR history loaded: {len(lpr_history):,} records ({lpr_history['lot_number'].nunique()} lots, last 60 days)")
+    if process_backend is not None and len(row_keys) >= PROCESS_POOL_MIN_ROWS:
+        with stage_timer('process_pool'):
+            return process_backend.score(kind, list(row_keys), dts, on_error=on_error,
+                                         overrides=overrides).astype(np.float64)
+    return score_rows_local(kind, row_keys, dts, on_error=on_error, bundle=bundle, overrides=overrides)
+
+def score_rows_bulk(kind, row_keys, dts, bundle=None, overrides=None):
+    """
+    Score a large batch of zone rows in one model call, for offline jobs
+
+    Features come from create_feature_frame (the values build_feature_rows
+    gives, built a zone at a time). The batching scheduler, prediction memo
+    and process pool are skipped; they only pay off for live traffic.
+    """
+    return score_scenarios_bulk(kind, row_keys, dts, [overrides], bundle)[0]
+
+def score_scenarios_bulk(kind, row_keys, dts, scenarios, bundle=None):
+    """
+    Score the same zone rows under several sets of date-feature overrides
+
+    The feature matrix is built once; each scenario is a copy of it with its
+    overrides applied, and all copies are scored in one model call. Returns
+    an array of shape (len(scenarios), len(row_keys)).
+    """
+    bundle = bundle or active_bundle
+    if kind == 'occupancy':
+        engineer, feature_names = components.feature_engineer_occupancy, bundle.occupancy_features
+    elif kind == 'enforcement':
+        engineer, feature_names = components.feature_engineer_enforcement, bundle.enforcement_features
     else:
-        print(f"  WARNING: LPR history not found at {lpr_history_path}")
+        raise ValueError(f"Unknown prediction kind: {kind}")
+    if engineer is None:
+        raise RuntimeError(f"The {kind} model is disabled")
+    if len(row_keys) == 0 or not scenarios:
+        return np.empty((len(scenarios), 0))
+
+    base_df = engineer.create_feature_frame(row_keys, dts, bundle.occupancy_zone_encoder, feature_names)
+    if len(scenarios) == 1:
+        features_df = apply_date_overrides(base_df, scenarios[0])
+    else:
+        features_df = pd.concat([apply_date_overrides(base_df, overrides) for overrides in scenarios],
+                                ignore_index=True)
+    if kind == 'occupancy':
+        predict_fn = lambda: bundle.occupancy_model.predict(features_df)
+    else:
+        predict_fn = lambda: bundle.enforcement_model.predict_proba(features_df)[:, 1]
+    scores = run_model_call(kind, predict_fn, len(features_df)).astype(np.float64)
+    return scores.reshape(len(scenarios), len(row_keys))
 
-# Initialize feature engineers based on enabled models
-feature_engineer_occupancy = None
-feature_engineer_enforcement = None
+def scenario_key(overrides):
+    """Hashable form of date-feature overrides for cache and single-flight keys, () for none"""
+    return tuple(sorted(overrides.items())) if overrides else ()
 
-if OCCUPANCY_ENABLED:
-    # Load ZONE-LEVEL enforcement history for occupancy predictions
-    enforcement_history_zone = pd.read_csv(f'{DATA_DIR}/processed/enforcement_full_extended.csv', parse_dates=['datetime'])
-    print(f"Loaded ZONE-LEVEL enforcement history: {len(enforcement_history_zone):,} records")
-    print(f"  Unique zones: {enforcement_history_zone['Zone'].nunique()}")
+def predict_zone_occupancy(zone, dt, bundle, overrides=None):
+    """
+    Predict occupancy for an aggregated zone (sum of its AMP lots) or a single AMP zone name
 
-    # Create feature engineer for OCCUPANCY predictions
-    feature_engineer_occupancy = FeatureEngineer(
-        calendar_df=calendar_df,
-        games_df=games_df,
-        weather_df=weather_df,
-        zone_capacity_dict=zone_capacity_dict,
-        occupancy_history_2025=occupancy_history_2025,
-        enforcement_history=enforcement_history_zone
+    Returns (predicted_occupancy, capacity)
+    """
+    return zone_occupancy_flight.do(
+        (bundle.version, zone, canonical_time(dt)) + scenario_key(overrides),
+        lambda: _compute_zone_occupancy(zone, dt, bundle, overrides)
     )
-    print("  Occupancy feature engineer initialized!")
 
-if ENFORCEMENT_ENABLED:
-    # Load ZONE-LEVEL enforcement history for enforcement predictions
-    enforcement_history_lot = pd.read_csv(f'{DATA_DIR}/processed/enforcement_full_extended.csv', parse_dates=['datetime'])
-    print(f"Loaded ZONE-LEVEL enforcement history: {len(enforcement_history_lot):,} records")
-    print(f"  Unique zones: {enforcement_history_lot['Zone'].nunique()}")
+def zone_occupancy_inputs(zone):
+    """
+    (AMP zones to score, the capacities their predictions are clipped to, zone capacity)
 
-    # Create feature engineer for ENFORCEMENT predictions
-    feature_engineer_enforcement = FeatureEngineer(
-        calendar_df=calendar_df,
-        games_df=games_df,
-        weather_df=weather_df,
-        zone_capacity_dict=zone_capacity_dict,
-        occupancy_history_2025=occupancy_history_2025,
-        enforcement_history=enforcement_history_lot
+    The batch form of _compute_zone_occupancy: an aggregated zone sums its
+    AMP-covered lots, any other name is scored as an AMP zone itself.
+    """
+    rows = lot_mapping[lot_mapping['Zone_Name'] == zone]
+    if len(rows) == 0:
+        capacity = zone_capacity_dict.get(zone, 0)
+        return [zone], [capacity], capacity
+    lot_numbers = rows['Lot_number'].astype(int)
+    amp_lots = [lot for lot in lot_numbers if lot in lot_to_amp_zone]
+    return ([lot_to_amp_zone[lot] for lot in amp_lots],
+            [lot_capacities.get(lot, 0) for lot in amp_lots],
+            sum(lot_capacities.get(lot, 0) for lot in lot_numbers))
+
+def _compute_zone_occupancy(zone, dt, bundle, overrides=None):
+    zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
+
+    if len(zone_lots) == 0:
+        # Not an aggregated zone - might be a specific AMP zone name
+        capacity = zone_capacity_dict.get(zone, 0)
+
+        try:
+            predicted_occupancy = float(score_rows('occupancy', [zone], [dt], bundle=bundle, overrides=overrides)[0])
+            predicted_occupancy = max(0, min(predicted_occupancy, capacity))
+        except Exception as e:
+            print(f"Warning: Could not predict for zone '{zone}': {e}")
+            predicted_occupancy = 0
+
+        return predicted_occupancy, capacity
+
+    # This is an aggregated zone - score every lot that has AMP data in one batch
+    total_capacity = 0
+    amp_zones = []
+    amp_lot_capacities = []
+
+    for _, row in zone_lots.iterrows():
+        lot_num = int(row['Lot_number'])
+        lot_capacity = lot_capacities.get(lot_num, 0)
+
+        # Capacity counts toward the zone whether or not the lot can be predicted
+        total_capacity += lot_capacity
+
+        if lot_num in lot_to_amp_zone:
+            amp_zones.append(lot_to_amp_zone[lot_num])
+            amp_lot_capacities.append(lot_capacity)
+
+    total_predicted_occupancy = 0
+    if amp_zones:
+        try:
+            predictions = score_rows('occupancy', amp_zones, [dt] * len(amp_zones), on_error='skip', bundle=bundle,
+                                     overrides=overrides)
+            for lot_capacity, lot_occupancy in zip(amp_lot_capacities, predictions):
+                if not np.isnan(lot_occupancy):
+                    total_predicted_occupancy += max(0, min(float(lot_occupancy), lot_capacity))
+        except Exception as e:
+            print(f"Warning: Could not predict occupancy for lots in zone '{zone}': {e}")
+
+    return total_predicted_occupancy, total_capacity
+
+def predict_enforcement_hourly(zone, dt, hours, bundle, overrides=None):
+    """Hourly enforcement risk for each hour of a parking window, scored as one batch"""
+    return enforcement_hourly_flight.do(
+        (bundle.version, zone, canonical_time(dt), hours) + scenario_key(overrides),
+        lambda: _compute_enforcement_hourly(zone, dt, hours, bundle, overrides)
     )
-    print("  Enforcement feature engineer initialized!")
-
-print("\n" + "="*80)
-if OCCUPANCY_ENABLED or ENFORCEMENT_ENABLED:
-    print("Models loaded successfully!")
-    print(f"Feature engineers initialized with 2025 historical data")
-    print(f"  - Zones in history: {occupancy_history_2025['Zone'].nunique()}")
-    print(f"  - Weather data: {len(weather_df)} hourly records")
-else:
-    print("WARNING: All models are disabled!")
-print("="*80)
 
-def get_risk_level(probability):
+def _compute_enforcement_hourly(zone, dt, hours, bundle, overrides=None):
+    if hours <= 0:
+        return []
+
+    hour_dts = [dt + pd.Timedelta(hours=hour_offset) for hour_offset in range(hours)]
+    risks = score_rows('enforcement', [zone] * hours, hour_dts, bundle=bundle, overrides=overrides)
+    return [max(0.0, min(float(risk), 1.0)) for risk in risks]
+
+def estimate_occupancy_time_pattern(capacity, zone_type, dt):
+    """Occupancy estimate of one lot from typical campus parking patterns (no model)"""
+    return float(components.time_pattern.occupancy(capacity, zone_type, [dt])[0])
+
+def estimate_zone_occupancy_time_pattern(zone, dt):
+    """(estimated occupancy, capacity) of a zone from time patterns, summed over its lots"""
+    zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
+    if len(zone_lots) == 0:
+        capacity = zone_capacity_dict.get(zone, 0)
+        return estimate_occupancy_time_pattern(capacity, None, dt), capacity
+
+    capacities = zone_lots['Lot_number'].astype(int).map(lot_capacities).fillna(0).to_numpy()
+    zone_types = zone_lots['zone_type'].to_numpy() if 'zone_type' in zone_lots.columns else None
+    occupancy = components.time_pattern.occupancy(capacities, zone_types, [dt])
+    return float(occupancy.sum()), int(capacities.sum())
+
+def estimate_lot_scans_time_pattern(lot_number, dt):
+    """Average LPR scans of the lot at this day of week and hour over the loaded history"""
+    def scan_rates():
+        table = np.zeros((7, 24))
+        lpr_index = components.lpr_index
+        if lpr_index is not None:
+            lot_rows = lpr_index.rows(lot_number)
+            rates = lot_rows['lpr_scans'].groupby(
+                [lot_rows['datetime'].dt.dayofweek, lot_rows['datetime'].dt.hour]
+            ).mean()
+            for (day_of_week, hour), rate in rates.items():
+                table[day_of_week, hour] = rate
+        return table
+
+    return float(lpr_pattern_cache.get_or_compute(lot_number, scan_rates)[dt.dayofweek, dt.hour])
+
+def heatmap_risk(zone, dt):
+    """Risk from the precomputed heatmap for the date's calendar state, None if unavailable"""
+    if risk_heatmap is None:
+        return None
+    state = calendar_state(components.feature_engineer_enforcement.date_features(pd.Timestamp(dt).normalize()))
+    return risk_heatmap.lookup(zone, state, dt.dayofweek, dt.hour)
+
+def zone_occupancy_tiered(zone, dt, bundle, admitted, overrides=None):
+    """(predicted occupancy, capacity, tier); shed requests use cached forecasts or time patterns"""
+    key = ('occupancy', zone, canonical_time(dt)) + scenario_key(overrides)
+    if admitted:
+        predicted_occupancy, capacity = predict_zone_occupancy(zone, dt, bundle, overrides)
+        forecast_cache.put(key, (predicted_occupancy, capacity))
+        return predicted_occupancy, capacity, TIER_MODEL
+
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached[0], cached[1], TIER_CACHE
+    predicted_occupancy, capacity = estimate_zone_occupancy_time_pattern(zone, dt)
+    return predicted_occupancy, capacity, TIER_TIME_PATTERN
+
+def enforcement_hourly_tiered(zone, dt, hours, bundle, admitted, overrides=None):
+    """
+    (hourly enforcement risks, tier) for a parking window
+
+    Shed requests take each hour from the cached forecast, the risk heatmap or
+    the zone's historical day-of-week/hour ticket rate, in that order; the tier
+    reported is the lowest one used. The heatmap and historical rates do not
+    reflect overrides.
+    """
+    hour_dts = [dt + pd.Timedelta(hours=hour_offset) for hour_offset in range(hours)]
+    if admitted:
+        risks = predict_enforcement_hourly(zone, dt, hours, bundle, overrides)
+        for hour_dt, risk in zip(hour_dts, risks):
+            forecast_cache.put(('enforcement', zone, canonical_time(hour_dt)) + scenario_key(overrides), risk)
+        return risks, TIER_MODEL
+
+    risks, tiers = [], []
+    for hour_dt in hour_dts:
+        risk, tier = forecast_cache.get(('enforcement', zone, canonical_time(hour_dt)) + scenario_key(overrides)), TIER_CACHE
+        if risk is None:
+            risk, tier = heatmap_risk(zone, hour_dt), TIER_HEATMAP
+        if risk is None:
+            risk, tier = components.feature_engineer_enforcement.dow_hour_enforcement_rate(zone, hour_dt), TIER_TIME_PATTERN
+        risks.append(max(0.0, min(float(risk), 1.0)))
+        tiers.append(tier)
+    return risks, worst_tier(tiers)
+
+def collect_single_flight_metrics():
+    """Scrape-time view of the request coalescing counters"""
+    flights = (recommend_flight, zone_occupancy_flight, enforcement_hourly_flight)
+    samples = []
+    for flight in flights:
+        samples.append(({'group': flight.name, 'result': 'executed'}, flight.executed))
+        samples.append(({'group': flight.name, 'result': 'coalesced'}, flight.coalesced))
+    return [('cougarpark_single_flight_calls_total', 'counter',
+             'Prediction calls executed vs coalesced onto an identical in-flight call', samples)]
+
+REGISTRY.register_collector(collect_single_flight_metrics)
+for feature_cache in (date_feature_cache, lot_date_feature_cache, forecast_cache, lpr_pattern_cache):
+    REGISTRY.register_cache(feature_cache.name, feature_cache.stats)
+if prediction_memo is not None:
+    REGISTRY.register_cache('prediction_memo', prediction_memo.stats)
+
+# Opt-in request tracing: Server-Timing header plus a rotating log of slow
+# requests (input, feature vectors, stage timings) that can be replayed with
+# scripts/replay_slow_requests.py
+slow_log_path = TRACING_CONFIG.get('slow_log_path', 'logs/slow_requests.jsonl')
+request_tracer = RequestTracer(
+    enabled=TRACING_CONFIG.get('enabled', False),
+    server_timing=TRACING_CONFIG.get('server_timing', True),
+    slow_request_ms=TRACING_CONFIG.get('slow_request_ms', 500),
+    slow_log_path=os.path.join(PROJECT_ROOT, slow_log_path),
+    max_bytes=TRACING_CONFIG.get('slow_log_max_bytes', 10 * 1024 * 1024),
+    backup_count=TRACING_CONFIG.get('slow_log_backup_count', 5)
+)
+add_stage_listener(record_stage)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    request_tracer.begin()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        # Label by route pattern so zone names in URLs don't explode cardinality
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method)
+        REQUESTS_TOTAL.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+        if response.status_code >= 500:
+            REQUEST_ERRORS.inc(endpoint=endpoint)
+
+    request_tracer.finish(
+        response, request.method, request.full_path.rstrip('?'), request.get_json(silent=True)
+    )
+    return response
+
+def get_risk_level(probability, enforcement_metadata):
     """Convert probability to risk level"""
     if not enforcement_metadata:
         return 'UNKNOWN'
@@ -340,6 +1121,157 @@ def get_recommendation_text(score, availability_level, risk_level):
     else:
         return "AVOID - Very poor availability and/or very high ticket risk"
 
+# Hot reload: a new bundle is loaded and validated in the background while
+# the current one keeps serving, then swapped in with a single assignment
+def validate_bundle(bundle):
+    """Smoke-test a freshly loaded bundle with one prediction per model; raises if any fails"""
+    now = pd.Timestamp.now().floor('h')
+    if bundle.occupancy_model is not None and zone_capacity_dict:
+        zone = next(iter(zone_capacity_dict))
+        score = score_rows_local('occupancy', [zone], [now], bundle=bundle)[0]
+        if not np.isfinite(score):
+            raise ValueError(f"occupancy model returned {score} for {zone}")
+    if bundle.enforcement_model is not None and components.feature_engineer_enforcement is not None:
+        zone = components.feature_engineer_enforcement.enforcement_history['Zone'].iloc[-1]
+        score = score_rows_local('enforcement', [zone], [now], bundle=bundle)[0]
+        if not 0.0 <= score <= 1.0:
+            raise ValueError(f"enforcement model returned {score} for {zone}")
+    lpr_history = components.lpr_history if bundle.lot_level_lpr_model is not None else None
+    if lpr_history is not None and len(lpr_history):
+        lot = lpr_history['lot_number'].iloc[-1]
+        score = score_rows_local('lot_lpr', [lot], [now], bundle=bundle)[0]
+        if not np.isfinite(score):
+            raise ValueError(f"lot-level LPR model returned {score} for lot {lot}")
+
+def swap_bundle(bundle):
+    """Install a validated bundle and point caches and pool workers at it"""
+    global active_bundle
+    active_bundle = bundle
+    notify_invalidation('models', None, None, None)
+    # Pool workers load their models when they start; new ones load this bundle's directory
+    if process_backend is not None:
+        process_backend.restart(worker_env={'COUGARPARK_MODEL_DIR': bundle.model_dir})
+
+model_reloader = ModelReloader(
+    lambda model_dir, version: load_model_bundle(model_dir, OCCUPANCY_ENABLED, ENFORCEMENT_ENABLED, version,
+                                                 model_format=MODEL_FORMAT),
+    validate_bundle,
+    swap_bundle,
+    initial_version=active_bundle.version
+)
+if MODEL_RELOAD_CONFIG.get('watch', False) and not is_pool_worker():
+    model_reloader.watch(MODEL_DIR, MODEL_RELOAD_CONFIG.get('poll_interval_s', 30))
+    print(f"Watching {MODEL_DIR} for new model artifacts")
+
+def build_risk_heatmap():
+    """
+    Enforcement risk of every zone for each hour of next week, per calendar state
+
+    Feature rows are built once per zone and hour; each calendar state only
+    overrides the calendar flags, and each zone is scored in one model call.
+    """
+    bundle = active_bundle
+    engineer = components.feature_engineer_enforcement
+    feature_names = bundle.enforcement_features
+    slots = {name: i for i, name in enumerate(feature_names)}
+
+    zones = sorted(str(zone) for zone in engineer.history_zones('enforcement'))
+    today = pd.Timestamp.now().normalize()
+    week_start = today + pd.Timedelta(days=7 - today.dayofweek)  # next Monday
+    week_hours = pd.date_range(week_start, periods=7 * 24, freq='h')
+
+    risks = np.zeros((len(zones), len(CALENDAR_STATES), 7, 24), dtype=np.float32)
+    for zone_i, zone in enumerate(zones):
+        base_rows = [engineer.create_feature_row(zone, dt, bundle.occupancy_zone_encoder, feature_names)
+                     for dt in week_hours]
+        rows = []
+        for state in CALENDAR_STATES:
+            overrides = [(slots[flag], value) for flag, value in calendar_state_overrides(state).items()
+                         if flag in slots]
+            for base_row in base_rows:
+                row = list(base_row)
+                for slot, value in overrides:
+                    row[slot] = value
+                rows.append(row)
+        X = engineer.rows_to_frame(rows, feature_names)
+        scores = run_model_call('enforcement', lambda: bundle.enforcement_model.predict_proba(X)[:, 1], len(X))
+        risks[zone_i] = scores.reshape(len(CALENDAR_STATES), 7, 24)
+    return zones, risks
+
+# Precomputed risk heatmap for the frontend, rebuilt in the background when
+# the models or the enforcement history change
+risk_heatmap = None
+if HEATMAP_CONFIG.get('enabled', False) and ENFORCEMENT_ENABLED and not is_pool_worker():
+    risk_heatmap = RiskHeatmap(build_risk_heatmap, HEATMAP_CONFIG.get('min_refresh_interval_s', 300))
+    add_invalidation_listener(
+        lambda kind, keys, start, end: kind in ('models', 'enforcement') and risk_heatmap.refresh_async()
+    )
+    heatmap_snapshot = warm_objects.get('risk_heatmap')
+    # A restored heatmap is only reused within the week it was built for
+    if heatmap_snapshot is not None and (
+            pd.Timestamp(heatmap_snapshot['built_at']).to_period('W') == pd.Timestamp.now().to_period('W')):
+        risk_heatmap.restore(heatmap_snapshot)
+    else:
+        risk_heatmap.refresh_async()
+
+# Readiness: /api/ready answers 503 until one warm-up prediction per model has
+# run, so orchestrators only route traffic to warm workers. After a cold start
+# the warm-up thread also writes the warm-start snapshot for the next one.
+readiness = {'ready': False, 'warmup_seconds': None, 'error': None}
+
+def save_warm_start_snapshot():
+    """Snapshot the structures derived at startup (skipped once models have been reloaded)"""
+    if warm_snapshot is None or active_bundle.version != 1:
+        return False
+    # Only what has been loaded so far; the rest loads from the data files as usual
+    engineers = {name: components.peek(f'feature_engineer_{name}') for name in ('occupancy', 'enforcement')}
+    startup_histories = {'occupancy': startup_frames.get('occupancy_history'),
+                         'enforcement': startup_frames.get('enforcement_history')}
+    objects = {
+        'lot_tables': (lot_mapping, zone_capacity_dict, lot_to_amp_zone, lot_capacities),
+        'history_indexes': {name: engineer.export_history_indexes(startup_histories)
+                            for name, engineer in engineers.items() if engineer is not None},
+        'risk_heatmap': risk_heatmap.snapshot() if risk_heatmap is not None else None
+    }
+    if components.is_loaded('amp_coverage'):
+        objects['amp_coverage'] = components.amp_coverage
+    frames = {name: frame for name, frame in startup_frames.items() if frame is not None}
+    return warm_snapshot.save(warm_start_fingerprint, objects, frames)
+
+def warm_up(load_everything=True):
+    """
+    Run one warm-up prediction per model, then mark the process ready
+
+    With load_everything, every dataset and model artifact is loaded first;
+    otherwise only what those predictions need is, and the rest stays lazy.
+    """
+    start = time.perf_counter()
+    try:
+        if load_everything:
+            components.warm()
+            active_bundle.load_all()
+        validate_bundle(active_bundle)
+    except Exception as e:
+        readiness['error'] = str(e)
+        print(f"Warning: warm-up prediction failed, not marking ready: {e}")
+        return
+    readiness['warmup_seconds'] = round(time.perf_counter() - start, 3)
+    readiness['ready'] = True
+    print(f"Warm-up predictions done in {readiness['warmup_seconds']}s, ready for traffic")
+
+    if warm_snapshot is not None and warm_start is None:
+        if risk_heatmap is not None:
+            risk_heatmap.wait(WARM_START_CONFIG.get('heatmap_wait_s', 600))
+        save_warm_start_snapshot()
+
+if not LAZY_CONFIG.get('enabled', True):
+    components.warm()
+if not is_pool_worker():
+    # Ready only after a warm-up prediction per model, whether or not the
+    # rest of the components are warmed as well
+    load_everything = LAZY_CONFIG.get('warm_in_background', True) or not LAZY_CONFIG.get('enabled', True)
+    threading.Thread(target=warm_up, args=(load_everything,), name='warm-up', daemon=True).start()
+
 @app.route('/')
 def home():
     """API documentation homepage"""
@@ -349,12 +1281,19 @@ def home():
         'description': 'Smart parking prediction system for WSU campus',
         'endpoints': {
             '/api/health': 'Health check',
+            '/api/ready': 'Readiness probe (503 until warm-up predictions have run)',
             '/api/occupancy/predict': 'Predict parking occupancy',
             '/api/enforcement/risk': 'Predict ticket risk',
+            '/api/enforcement/heatmap': 'Precomputed ticket risk by zone, calendar state, day of week and hour (ETag)',
             '/api/parking/recommend': 'Get combined parking recommendation',
+            '/api/scenarios/evaluate': 'Compare what-if scenarios (game day, weather, calendar) across zones (POST)',
             '/api/zones/list': 'List all available parking zones',
             '/api/zones/<zone_name>/info': 'Get zone information',
-            '/api/models/info': 'Get model metadata'
+            '/api/lots/nearest': 'Nearest open lots to a location with availability and ticket risk (POST)',
+            '/api/models/info': 'Get model metadata',
+            '/api/models/reload': 'Load, validate and swap in new model artifacts (POST, localhost or token)',
+            '/api/debug/memory': 'Memory used by each history dataset and model',
+            '/metrics': 'Prometheus metrics (latency by endpoint and stage, batch sizes, caches, errors)'
         }
     })
 
@@ -367,9 +1306,26 @@ def health():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/ready')
+def ready():
+    """Readiness probe: 200 once every loaded model has served a warm-up prediction, 503 before"""
+    return jsonify({
+        'ready': readiness['ready'],
+        'warmup_seconds': readiness['warmup_seconds'],
+        'error': readiness['error'],
+        'warm_start': warm_snapshot.stats() if warm_snapshot else None
+    }), 200 if readiness['ready'] else 503
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics in text exposition format"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/status')
 def status():
     """Get API and model status"""
+    # Reported only once loaded; asking for its stats must not load the reference data
+    time_pattern = components.peek('time_pattern')
     return jsonify({
         'status': 'running',
         'active_models': {
@@ -380,17 +1336,64 @@ def status():
             'occupancy': {
                 'enabled': OCCUPANCY_ENABLED,
                 'level': 'zone-level' if OCCUPANCY_ENABLED else None,
-                'loaded': occupancy_model is not None
+                'loaded': active_bundle.peek('occupancy_model') is not None
             },
             'enforcement': {
                 'enabled': ENFORCEMENT_ENABLED,
                 'level': 'lot-level' if ENFORCEMENT_ENABLED else None,
-                'loaded': enforcement_model is not None
+                'loaded': active_bundle.peek('enforcement_model') is not None
             }
         },
+        'inference_batching': {
+            'occupancy': occupancy_scheduler.stats() if occupancy_scheduler else None,
+            'enforcement': enforcement_scheduler.stats() if enforcement_scheduler else None
+        },
+        'process_pool': process_backend.stats() if process_backend else None,
+        'ingestion': dict(history_watcher.stats(), pending_rows={
+            'lpr': lpr_pending.rows, 'enforcement': enforcement_pending.rows
+        }) if history_watcher else None,
+        'model_reload': model_reloader.stats(),
+        'prediction_memo': prediction_memo.stats() if prediction_memo else None,
+        'risk_heatmap': risk_heatmap.stats() if risk_heatmap else None,
+        'admission': admission.stats() if admission else None,
+        'time_pattern': time_pattern.stats() if time_pattern else None,
+        'lpr_store': lpr_store.stats() if lpr_store else None,
+        'components': {'datasets': components.stats(), 'models': active_bundle.load_stats()},
+        'ready': readiness['ready'],
+        'warm_start': warm_snapshot.stats() if warm_snapshot else None,
+        'forecast_cache': forecast_cache.stats(),
+        'request_coalescing': {
+            flight.name: flight.stats()
+            for flight in (recommend_flight, zone_occupancy_flight, enforcement_hourly_flight)
+        },
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/debug/memory')
+def debug_memory():
+    """Resident bytes per history dataset and (pickled) size per model, counting only what is loaded"""
+    bundle = active_bundle
+    calendar_df, games_df, weather_df = components.peek('reference_data') or (None, None, None)
+    report = memory_report(
+        datasets={
+            'occupancy_history_2025': components.peek('occupancy_history'),
+            'enforcement_history': components.peek('enforcement_history'),
+            'lpr_history': components.peek('lpr_history'),
+            'lot_mapping': lot_mapping,
+            'calendar': calendar_df,
+            'games': games_df,
+            'weather': weather_df
+        },
+        models={
+            'occupancy': bundle.peek('occupancy_model'),
+            'occupancy_zone_encoder': bundle.peek('occupancy_zone_encoder'),
+            'lot_level_lpr': bundle.peek('lot_level_lpr_model'),
+            'enforcement': bundle.peek('enforcement_model')
+        }
+    )
+    report['timestamp'] = datetime.now().isoformat()
+    return jsonify(report)
+
 @app.route('/api/occupancy/predict', methods=['POST'])
 def predict_occupancy():
     """
@@ -404,8 +1407,13 @@ def predict_occupancy():
             "temp_f": 65,
             "precipitation": 0.0,
             "is_rainy": false
-        }
+        },
+        "is_game_day": false,  // Optional
+        "is_finals_week": false  // Optional
     }
+
+    weather, is_game_day and is_finals_week replace the date's own values
+    (see parse_date_overrides for every supported input).
     """
     try:
         if not OCCUPANCY_ENABLED:
@@ -418,63 +1426,25 @@ def predict_occupancy():
 
         if not zone or not dt_str:
             return jsonify({'error': 'Missing required fields: zone, datetime'}), 400
+        try:
+            overrides = parse_date_overrides(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         dt = pd.to_datetime(dt_str)
 
-        # Get all lots in this zone from lot_mapping
-        zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
-
-        if len(zone_lots) > 0:
-            # This is an aggregated zone - predict for each lot that has AMP data
-            total_predicted_occupancy = 0
-            total_capacity = 0
-
-            for _, row in zone_lots.iterrows():
-                lot_num = int(row['Lot_number'])
-                lot_capacity = lot_capacities.get(lot_num, 0)
-
-                # Check if this lot has AMP data
-                if lot_num in lot_to_amp_zone:
-                    amp_zone = lot_to_amp_zone[lot_num]
-                    try:
-                        features = feature_engineer_occupancy.create_features(amp_zone, dt, occupancy_zone_encoder)
-                        feature_array = feature_engineer_occupancy.features_to_array(features, occupancy_features)
-
-                        lot_occupancy = float(occupancy_model.predict(feature_array)[0])
-                        lot_occupancy = max(0, min(lot_occupancy, lot_capacity))
-
-                        total_predicted_occupancy += lot_occupancy
-                        total_capacity += lot_capacity
-                    except Exception as e:
-                        print(f"Warning: Could not predict for lot {lot_num} (AMP zone: {amp_zone}): {e}")
-                        # Add capacity even if prediction fails
-                        total_capacity += lot_capacity
-                else:
-                    # No AMP data for this lot, just add capacity
-                    total_capacity += lot_capacity
-
-            predicted_occupancy = total_predicted_occupancy
-            capacity = total_capacity
-        else:
-            # Not an aggregated zone - might be a specific AMP zone name
-            capacity = zone_capacity_dict.get(zone, 0)
-
-            try:
-                features = feature_engineer_occupancy.create_features(zone, dt, occupancy_zone_encoder)
-                feature_array = feature_engineer_occupancy.features_to_array(features, occupancy_features)
-                predicted_occupancy = float(occupancy_model.predict(feature_array)[0])
-                predicted_occupancy = max(0, min(predicted_occupancy, capacity))
-            except Exception as e:
-                print(f"Warning: Could not predict for zone '{zone}': {e}")
-                predicted_occupancy = 0
+        bundle = active_bundle
+        with admit_inference() as admitted:
+            predicted_occupancy, capacity, tier = zone_occupancy_tiered(zone, dt, bundle, admitted, overrides)
 
         available_spaces = max(0, capacity - predicted_occupancy)
 
         availability_level = get_availability_level(predicted_occupancy, capacity)
 
-        return jsonify({
+        response = {
             'zone': zone,
             'datetime': dt_str,
+            'tier': tier,
             'prediction': {
                 'occupancy_count': int(predicted_occupancy),
                 'available_spaces': int(available_spaces),
@@ -483,42 +1453,21 @@ def predict_occupancy():
                 'availability_level': availability_level
             },
             'model_info': {
-                'model_type': occupancy_metadata['model_type'],
-                'test_mae': float(occupancy_metadata['performance']['test_mae'])
+                'model_type': bundle.occupancy_metadata['model_type'],
+                'test_mae': float(bundle.occupancy_metadata['performance']['test_mae'])
             }
-        })
+        }
+        if overrides:
+            response['overrides'] = overrides
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def create_lot_level_features(lot_number, dt, lpr_history_df):
-    """
-    Create features for lot-level LPR predictions
-
-    Returns a pandas DataFrame with a single row containing all features
-    """
-    # Ensure dt is timezone-naive to match lpr_history data
-    if hasattr(dt, 'tz') and dt.tz is not None:
-        dt = dt.tz_localize(None)
-
-    # Get lot info from mapping
-    lot_info = lot_mapping[lot_mapping['Lot_number'] == lot_number]
-    if len(lot_info) == 0:
-        raise ValueError(f"Lot {lot_number} not found in mapping")
-
-    lot_info = lot_info.iloc[0]
-    zone = lot_info['Zone_Name']
-    capacity = float(lot_info['capacity']) if pd.notna(lot_info['capacity']) else 0
-
-    # Temporal features
-    hour = dt.hour
-    day_of_week = dt.dayofweek
-    month = dt.month
-    year = dt.year
-    is_weekend = 1 if day_of_week >= 5 else 0
-
-    # Calendar features from games_df and calendar_df
-    date_normalized = dt.normalize()
+@timed_stage('lot_date_features')
+def compute_lot_date_features(date_normalized):
+    """Game day, academic calendar and weather features of a date for the lot-level model"""
+    calendar_df, games_df, weather_df = components.reference_data
 
     # Game day
     games_df['Date'] = pd.to_datetime(games_df['Date']).dt.normalize()
@@ -572,6 +1521,53 @@ def create_lot_level_features(lot_number, dt, lpr_history_df):
         is_cold = 0
         is_hot = 0
 
+    return {
+        'is_game_day': is_game_day,
+        'is_dead_week': is_dead_week,
+        'is_finals_week': is_finals_week,
+        'is_any_break': is_any_break,
+        'temp_mean_f': temp_mean_f,
+        'precipitation_inches': precipitation_inches,
+        'weather_category': weather_category,
+        'is_rainy': is_rainy,
+        'is_snowy': is_snowy,
+        'is_cold': is_cold,
+        'is_hot': is_hot
+    }
+
+@timed_stage('create_lot_level_features')
+def create_lot_level_features(lot_number, dt, lpr_history_df):
+    """
+    Create features for lot-level LPR predictions
+
+    Returns a pandas DataFrame with a single row containing all features
+    """
+    # Ensure dt is timezone-naive to match lpr_history data
+    if hasattr(dt, 'tz') and dt.tz is not None:
+        dt = dt.tz_localize(None)
+
+    # Get lot info from mapping
+    lot_info = lot_mapping[lot_mapping['Lot_number'] == lot_number]
+    if len(lot_info) == 0:
+        raise ValueError(f"Lot {lot_number} not found in mapping")
+
+    lot_info = lot_info.iloc[0]
+    zone = lot_info['Zone_Name']
+    capacity = float(lot_info['capacity']) if pd.notna(lot_info['capacity']) else 0
+
+    # Temporal features
+    hour = dt.hour
+    day_of_week = dt.dayofweek
+    month = dt.month
+    year = dt.year
+    is_weekend = 1 if day_of_week >= 5 else 0
+
+    # Calendar and weather features only depend on the date
+    date_normalized = dt.normalize()
+    date_features = lot_date_feature_cache.get_or_compute(
+        date_normalized, lambda: compute_lot_date_features(date_normalized)
+    )
+
     # Lag features - look up historical LPR scans
     lag_offsets = [1, 2, 3, 24, 168]  # hours ago
     lag_features = {}
@@ -600,17 +1596,7 @@ def create_lot_level_features(lot_number, dt, lpr_history_df):
         'lot_number': lot_number,
         'Zone': zone,
         'capacity': capacity,
-        'is_game_day': is_game_day,
-        'is_dead_week': is_dead_week,
-        'is_finals_week': is_finals_week,
-        'is_any_break': is_any_break,
-        'temp_mean_f': temp_mean_f,
-        'precipitation_inches': precipitation_inches,
-        'weather_category': weather_category,
-        'is_rainy': is_rainy,
-        'is_snowy': is_snowy,
-        'is_cold': is_cold,
-        'is_hot': is_hot,
+        **date_features,
         **lag_features
     }
 
@@ -630,10 +1616,11 @@ def predict_lot_occupancy():
     }
     """
     try:
-        if lot_level_lpr_model is None:
+        bundle = active_bundle
+        if bundle.lot_level_lpr_model is None:
             return jsonify({'error': 'Lot-level LPR model not available'}), 503
 
-        if lpr_history is None:
+        if components.lpr_history is None:
             return jsonify({'error': 'LPR historical data not loaded'}), 503
 
         data = request.json
@@ -648,208 +1635,242 @@ def predict_lot_occupancy():
         lot_number = int(lot_number)
         dt = pd.to_datetime(dt_str)
 
-        # Create features
-        features_df = create_lot_level_features(lot_number, dt, lpr_history)
-
-        # Ensure feature order matches model
-        features_df = features_df[lot_level_lpr_features]
+        with admit_inference() as admitted:
+            return predict_lot_response(lot_number, dt, dt_str, parking_duration_hours, bundle, admitted)
 
-        # Convert categorical columns to category dtype
-        for col in ['Zone', 'weather_category']:
-            if col in features_df.columns and features_df[col].dtype == 'object':
-                features_df[col] = features_df[col].astype('category')
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
 
-        # Make prediction
-        predicted_scans = float(lot_level_lpr_model.predict(features_df)[0])
+def lot_uses_amp_model(lot_number, zone, location):
+    """Whether a lot's occupancy comes from the AMP occupancy model rather than time patterns"""
+    amp_coverage = components.amp_coverage[1].get(lot_number, 0)
+    is_paid_lot = (zone.startswith('Yellow') or 'Garage' in location or
+                  'GARAGE' in location.upper() or 'Meter' in location or
+                  'HOURLY' in location.upper())
+    return lot_number in lot_to_amp_zone and amp_coverage >= 0.8 and is_paid_lot
+
+def predict_lot_response(lot_number, dt, dt_str, parking_duration_hours, bundle, admitted):
+    """Body of /api/occupancy/predict-lot; shed requests skip the models (see enforcement_hourly_tiered)"""
+    tiers = []
+    scans_key = ('lot_lpr', lot_number, canonical_time(dt))
+    if admitted:
+        # Create features and make prediction
+        features_df = create_lot_level_features(lot_number, dt, components.lpr_index.rows(lot_number))
+        predicted_scans = float(predict_lot_lpr_rows(features_df, bundle)[0])
         predicted_scans = max(0, predicted_scans)  # No negative predictions
+        forecast_cache.put(scans_key, predicted_scans)
+        tiers.append(TIER_MODEL)
+    else:
+        predicted_scans = forecast_cache.get(scans_key)
+        if predicted_scans is not None:
+            tiers.append(TIER_CACHE)
+        else:
+            lot_info = lot_mapping[lot_mapping['Lot_number'] == lot_number]
+            if len(lot_info) == 0:
+                raise ValueError(f"Lot {lot_number} not found in mapping")
+            predicted_scans = estimate_lot_scans_time_pattern(lot_number, dt)
+            tiers.append(TIER_TIME_PATTERN)
+
+    # Get lot info
+    lot_info = lot_mapping[lot_mapping['Lot_number'] == lot_number].iloc[0]
+    zone = lot_info['Zone_Name']
+    zone_type = str(lot_info.get('zone_type', '')) if pd.notna(lot_info.get('zone_type')) else ''
 
-        # Get lot info
-        lot_info = lot_mapping[lot_mapping['Lot_number'] == lot_number].iloc[0]
-        zone = lot_info['Zone_Name']
-        zone_type = str(lot_info.get('zone_type', '')) if pd.notna(lot_info.get('zone_type')) else ''
-
-        # Check if lot is restricted (University Vehicles, ADA, Guest Pass, etc.)
-        if 'University' in zone_type or 'ADA' in zone_type or 'Guest' in zone_type:
-            return jsonify({'error': f'Lot {lot_number} is restricted to {zone_type}'}), 403
-
-        capacity = float(lot_info['capacity']) if pd.notna(lot_info['capacity']) else 0
-        location = str(lot_info.get('location_description', '')) if pd.notna(lot_info.get('location_description')) else ''
-        alternative_location = str(lot_info.get('alternative_location_description', '')) if pd.notna(lot_info.get('alternative_location_description')) else ''
-
-        # Add occupancy prediction
-        occupancy_data = None
-        occupancy_source = None
-
-        # Try AMP-based occupancy first (for PAID lots with AMP sensors AND good coverage)
-        # Only use AMP for paid/hourly lots (Yellow zones, garages, meters) where everyone must pay
-        # For permit lots (Green, Red, Grey), AMP only tracks ~20-40% who pay, use time-pattern instead
-        amp_coverage = lot_amp_coverage.get(lot_number, 0)
-        is_paid_lot = (zone.startswith('Yellow') or 'Garage' in location or
-                      'GARAGE' in location.upper() or 'Meter' in location or
-                      'HOURLY' in location.upper())
-        use_amp = (OCCUPANCY_ENABLED and occupancy_model is not None and
-                   lot_number in lot_to_amp_zone and amp_coverage >= 0.8 and is_paid_lot)
-
-        if use_amp:
-            try:
-                # Use the specific AMP zone name for occupancy model
-                # The occupancy model was trained on 62 specific AMP zone names like "Green 1 Bustad Lot"
-                amp_zone = lot_to_amp_zone[lot_number]
-                features = feature_engineer_occupancy.create_features(amp_zone, dt, occupancy_zone_encoder)
-                feature_array = feature_engineer_occupancy.features_to_array(features, occupancy_features)
-                predicted_occupancy = float(occupancy_model.predict(feature_array)[0])
-                predicted_occupancy = max(0, min(predicted_occupancy, capacity))
-
-                available_spaces = max(0, capacity - predicted_occupancy)
-                percent_full = round((predicted_occupancy / capacity * 100), 1) if capacity > 0 else 0
-                availability_level = get_availability_level(predicted_occupancy, capacity)
-
-                occupancy_data = {
-                    'occupancy_count': round(predicted_occupancy, 1),
-                    'available_spaces': int(available_spaces),
-                    'capacity': int(capacity),
-                    'percent_full': percent_full,
-                    'availability_level': availability_level,
-                    'source': 'amp'
-                }
-                occupancy_source = 'amp'
-            except Exception as e:
-                print(f"Warning: Could not generate AMP occupancy prediction for lot {lot_number}: {e}")
-
-        # Fallback: Estimate occupancy based on typical patterns (for lots without AMP data)
-        if occupancy_data is None and capacity > 0:
-            # Estimate occupancy based on time patterns
-            # Typical university parking patterns:
-            hour = dt.hour
-            day_of_week = dt.dayofweek  # 0=Monday, 6=Sunday
-            is_weekend = day_of_week >= 5
-            month = dt.month
-
-            # Determine if semester is in session
-            # WSU academic calendar: Fall (Aug-Dec), Spring (Jan-May), Summer (Jun-Aug)
-            is_summer = month in [6, 7] or (month == 8 and dt.day < 20)
-            is_winter_break = (month == 12 and dt.day > 15) or (month == 1 and dt.day < 10)
-            is_spring_break = month == 3 and 10 <= dt.day <= 20
-            in_session = not (is_summer or is_winter_break or is_spring_break)
-
-            # Base occupancy rates by time of day and semester status
-            if not in_session:
-                # Summer/breaks: very low occupancy
-                if is_weekend:
-                    base_rate = 0.02  # 2% on weekends
-                elif 8 <= hour <= 17:
-                    base_rate = 0.05  # 5% during day
-                else:
-                    base_rate = 0.01  # 1% off hours
-            elif is_weekend:
-                # Weekends during semester: low occupancy
-                if 9 <= hour <= 17:
-                    base_rate = 0.20  # 20% during day
-                else:
-                    base_rate = 0.10  # 10% off hours
-            else:
-                # Weekdays during semester: high occupancy
-                if 8 <= hour <= 17:
-                    base_rate = 0.55  # 55% during peak hours
-                elif 7 <= hour < 8 or 17 < hour <= 19:
-                    base_rate = 0.35  # 35% shoulder hours
-                else:
-                    base_rate = 0.15  # 15% off hours
-
-            # Adjust based on zone type (permit vs paid)
-            zone_type = lot_info.get('zone_type', 'Permit')
-            if zone_type == 'Paid':
-                base_rate *= 0.8  # Paid lots typically less full
+    # Check if lot is restricted (University Vehicles, ADA, Guest Pass, etc.)
+    if is_restricted_zone_type(zone_type):
+        return jsonify({'error': f'Lot {lot_number} is restricted to {zone_type}'}), 403
 
-            estimated_occupancy = capacity * base_rate
+    capacity = float(lot_info['capacity']) if pd.notna(lot_info['capacity']) else 0
+    location = str(lot_info.get('location_description', '')) if pd.notna(lot_info.get('location_description')) else ''
+    alternative_location = str(lot_info.get('alternative_location_description', '')) if pd.notna(lot_info.get('alternative_location_description')) else ''
+
+    # Add occupancy prediction
+    occupancy_data = None
+    occupancy_source = None
+
+    # Try AMP-based occupancy first (for PAID lots with AMP sensors AND good coverage)
+    # Only use AMP for paid/hourly lots (Yellow zones, garages, meters) where everyone must pay
+    # For permit lots (Green, Red, Grey), AMP only tracks ~20-40% who pay, use time-pattern instead
+    use_amp = (OCCUPANCY_ENABLED and bundle.occupancy_model is not None and
+               lot_uses_amp_model(lot_number, zone, location))
+    amp_key = ('amp_occupancy', lot_number, canonical_time(dt))
+
+    if use_amp and not admitted:
+        # Shed: reuse a recent model forecast, otherwise fall through to time patterns
+        predicted_occupancy = forecast_cache.get(amp_key)
+        tiers.append(TIER_CACHE if predicted_occupancy is not None else TIER_TIME_PATTERN)
+        if predicted_occupancy is not None:
+            occupancy_data = {
+                'occupancy_count': round(predicted_occupancy, 1),
+                'available_spaces': int(max(0, capacity - predicted_occupancy)),
+                'capacity': int(capacity),
+                'percent_full': round((predicted_occupancy / capacity * 100), 1) if capacity > 0 else 0,
+                'availability_level': get_availability_level(predicted_occupancy, capacity),
+                'source': 'amp'
+            }
+            occupancy_source = 'amp'
+    elif use_amp:
+        try:
+            # Use the specific AMP zone name for occupancy model
+            # The occupancy model was trained on 62 specific AMP zone names like "Green 1 Bustad Lot"
+            amp_zone = lot_to_amp_zone[lot_number]
+            feature_array = components.feature_engineer_occupancy.rows_to_frame([
+                components.feature_engineer_occupancy.create_feature_row(
+                    amp_zone, dt, bundle.occupancy_zone_encoder, bundle.occupancy_features
+                )
+            ], bundle.occupancy_features)
+            predicted_occupancy = float(predict_occupancy_rows(feature_array, bundle)[0])
+            predicted_occupancy = max(0, min(predicted_occupancy, capacity))
+            forecast_cache.put(amp_key, predicted_occupancy)
 
-            available_spaces = max(0, capacity - estimated_occupancy)
-            percent_full = round((estimated_occupancy / capacity * 100), 1) if capacity > 0 else 0
-            availability_level = get_availability_level(estimated_occupancy, capacity)
+            available_spaces = max(0, capacity - predicted_occupancy)
+            percent_full = round((predicted_occupancy / capacity * 100), 1) if capacity > 0 else 0
+            availability_level = get_availability_level(predicted_occupancy, capacity)
 
             occupancy_data = {
-                'occupancy_count': round(estimated_occupancy, 1),
+                'occupancy_count': round(predicted_occupancy, 1),
                 'available_spaces': int(available_spaces),
                 'capacity': int(capacity),
                 'percent_full': percent_full,
                 'availability_level': availability_level,
-                'source': 'time_pattern_estimate'
+                'source': 'amp'
             }
-            occupancy_source = 'time_pattern_estimate'
-
-        # Add enforcement prediction if enabled
-        # Calculate cumulative risk: probability of getting a ticket at least once during parking duration
-        enforcement_data = None
-        if ENFORCEMENT_ENABLED and enforcement_model is not None:
-            try:
-                # Calculate probability of NO ticket in each hour, then get inverse
-                probability_no_ticket = 1.0
-                max_hourly_risk = 0.0
-                max_risk_hour = dt
-
-                # Check enforcement risk for each hour during parking duration
-                for hour_offset in range(int(parking_duration_hours)):
-                    current_time = dt + pd.Timedelta(hours=hour_offset)
-                    features = feature_engineer_enforcement.create_features(zone, current_time, occupancy_zone_encoder)
-                    feature_array = feature_engineer_enforcement.features_to_array(features, enforcement_features)
-                    hourly_risk = float(enforcement_model.predict_proba(feature_array)[0][1])
-                    hourly_risk = max(0.0, min(hourly_risk, 1.0))
-
-                    # Track highest single-hour risk for display
-                    if hourly_risk > max_hourly_risk:
-                        max_hourly_risk = hourly_risk
-                        max_risk_hour = current_time
-
-                    # Multiply probability of no ticket: P(no ticket all hours) = (1-p1)*(1-p2)*...
-                    probability_no_ticket *= (1.0 - hourly_risk)
-
-                # Cumulative risk: P(at least one ticket) = 1 - P(no tickets at all)
-                cumulative_risk = 1.0 - probability_no_ticket
-                cumulative_risk = max(0.0, min(cumulative_risk, 1.0))
-
-                risk_level = get_risk_level(cumulative_risk)
-
-                enforcement_data = {
-                    'probability': round(cumulative_risk, 4),
-                    'percentage': round(cumulative_risk * 100, 1),
-                    'level': risk_level,
-                    'message': enforcement_metadata['risk_messages'][risk_level],
-                    'peak_risk_time': max_risk_hour.strftime('%I:%M %p'),
-                    'parking_duration_hours': int(parking_duration_hours)
-                }
-            except Exception as e:
-                print(f"Warning: Could not generate enforcement prediction: {e}")
-                enforcement_data = None
+            occupancy_source = 'amp'
+        except Exception as e:
+            print(f"Warning: Could not generate AMP occupancy prediction for lot {lot_number}: {e}")
+
+    # Fallback: Estimate occupancy based on typical patterns (for lots without AMP data)
+    if occupancy_data is None and capacity > 0:
+        # Estimate occupancy based on time patterns
+        estimated_occupancy = estimate_occupancy_time_pattern(capacity, lot_info.get('zone_type', 'Permit'), dt)
+
+        available_spaces = max(0, capacity - estimated_occupancy)
+        percent_full = round((estimated_occupancy / capacity * 100), 1) if capacity > 0 else 0
+        availability_level = get_availability_level(estimated_occupancy, capacity)
+
+        occupancy_data = {
+            'occupancy_count': round(estimated_occupancy, 1),
+            'available_spaces': int(available_spaces),
+            'capacity': int(capacity),
+            'percent_full': percent_full,
+            'availability_level': availability_level,
+            'source': 'time_pattern_estimate'
+        }
+        occupancy_source = 'time_pattern_estimate'
+
+    # Add enforcement prediction if enabled
+    # Calculate cumulative risk: probability of getting a ticket at least once during parking duration
+    enforcement_data = None
+    if ENFORCEMENT_ENABLED and bundle.enforcement_model is not None:
+        try:
+            # Calculate probability of NO ticket in each hour, then get inverse
+            probability_no_ticket = 1.0
+            max_hourly_risk = 0.0
+            max_risk_hour = dt
+
+            # Check enforcement risk for each hour during parking duration
+            hourly_risks, tier = enforcement_hourly_tiered(zone, dt, int(parking_duration_hours), bundle, admitted)
+            tiers.append(tier)
+            for hour_offset, hourly_risk in enumerate(hourly_risks):
+                current_time = dt + pd.Timedelta(hours=hour_offset)
+
+                # Track highest single-hour risk for display
+                if hourly_risk > max_hourly_risk:
+                    max_hourly_risk = hourly_risk
+                    max_risk_hour = current_time
+
+                # Multiply probability of no ticket: P(no ticket all hours) = (1-p1)*(1-p2)*...
+                probability_no_ticket *= (1.0 - hourly_risk)
+
+            # Cumulative risk: P(at least one ticket) = 1 - P(no tickets at all)
+            cumulative_risk = 1.0 - probability_no_ticket
+            cumulative_risk = max(0.0, min(cumulative_risk, 1.0))
+
+            risk_level = get_risk_level(cumulative_risk, bundle.enforcement_metadata)
 
-        response = {
-            'lot_number': int(lot_number),
-            'zone': zone,
-            'location': location,
-            'alternative_location': alternative_location,
-            'datetime': dt_str,
-            'lpr_activity': {
-                'lpr_scans_predicted': round(predicted_scans, 2),
-                'activity_level': 'high' if predicted_scans > 5 else 'moderate' if predicted_scans > 1 else 'low'
-            },
-            'model_info': {
-                'model_type': lot_level_lpr_metadata['model_type'],
-                'test_mae': float(lot_level_lpr_metadata['performance']['test_mae']),
-                'num_lots': lot_level_lpr_metadata['num_lots']
+            enforcement_data = {
+                'probability': round(cumulative_risk, 4),
+                'percentage': round(cumulative_risk * 100, 1),
+                'level': risk_level,
+                'message': bundle.enforcement_metadata['risk_messages'][risk_level],
+                'peak_risk_time': max_risk_hour.strftime('%I:%M %p'),
+                'parking_duration_hours': int(parking_duration_hours)
             }
+        except Exception as e:
+            print(f"Warning: Could not generate enforcement prediction: {e}")
+            enforcement_data = None
+
+    response = {
+        'lot_number': int(lot_number),
+        'zone': zone,
+        'location': location,
+        'alternative_location': alternative_location,
+        'datetime': dt_str,
+        'tier': worst_tier(tiers),
+        'lpr_activity': {
+            'lpr_scans_predicted': round(predicted_scans, 2),
+            'activity_level': 'high' if predicted_scans > 5 else 'moderate' if predicted_scans > 1 else 'low'
+        },
+        'model_info': {
+            'model_type': bundle.lot_level_lpr_metadata['model_type'],
+            'test_mae': float(bundle.lot_level_lpr_metadata['performance']['test_mae']),
+            'num_lots': bundle.lot_level_lpr_metadata['num_lots']
         }
+    }
 
-        if occupancy_data:
-            response['occupancy'] = occupancy_data
+    if occupancy_data:
+        response['occupancy'] = occupancy_data
 
-        if enforcement_data:
-            response['enforcement'] = enforcement_data
+    if enforcement_data:
+        response['enforcement'] = enforcement_data
 
-        return jsonify(response)
+    return jsonify(response)
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+@app.route('/api/enforcement/heatmap')
+def enforcement_heatmap():
+    """
+    Precomputed enforcement risk for every zone over a representative week
+
+    Query parameters (optional): zone, state (normal, finals or break).
+    Risks are indexed [day_of_week][hour] with Monday = 0. Responses carry an
+    ETag that changes only when the heatmap is rebuilt, so clients can poll
+    with If-None-Match and get 304 Not Modified.
+    """
+    if risk_heatmap is None:
+        return jsonify({'error': 'Risk heatmap is disabled'}), 404
+    snapshot = risk_heatmap.snapshot()
+    if snapshot is None:
+        return jsonify({'error': 'Risk heatmap is still being built', 'status': risk_heatmap.stats()}), 503
+
+    zone = request.args.get('zone')
+    state = request.args.get('state')
+    if zone is not None and zone not in snapshot['zone_index']:
+        return jsonify({'error': f'Unknown zone: {zone}'}), 404
+    if state is not None and state not in CALENDAR_STATES:
+        return jsonify({'error': f'Unknown state: {state}', 'states': list(CALENDAR_STATES)}), 400
+
+    zones = [zone] if zone is not None else snapshot['zones']
+    states = [state] if state is not None else list(CALENDAR_STATES)
+    risks = snapshot['risks']
+    state_index = {name: i for i, name in enumerate(CALENDAR_STATES)}
+
+    response = jsonify({
+        'states': states,
+        'days': DAY_NAMES,
+        'built_at': snapshot['built_at'],
+        'risks': {
+            name: {
+                s: np.round(risks[snapshot['zone_index'][name], state_index[s]].astype(np.float64), 4).tolist()
+                for s in states
+            }
+            for name in zones
+        }
+    })
+    response.set_etag(snapshot['etag'])
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/api/enforcement/risk', methods=['POST'])
 def predict_enforcement_risk():
@@ -860,9 +1881,13 @@ def predict_enforcement_risk():
     {
         "zone": "Green 5",
         "datetime": "2024-11-15T10:30:00",
+        "weather": {"temp_f": 25, "snowfall": 2.0},  // Optional
         "is_game_day": false,  // Optional
         "is_finals_week": false  // Optional
     }
+
+    weather, is_game_day and is_finals_week replace the date's own values
+    (see parse_date_overrides for every supported input).
     """
     try:
         if not ENFORCEMENT_ENABLED:
@@ -875,22 +1900,38 @@ def predict_enforcement_risk():
 
         if not zone or not dt_str:
             return jsonify({'error': 'Missing required fields: zone, datetime'}), 400
+        try:
+            overrides = parse_date_overrides(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         dt = pd.to_datetime(dt_str)
 
-        features = feature_engineer_enforcement.create_features(zone, dt, occupancy_zone_encoder)
-        feature_array = feature_engineer_enforcement.features_to_array(features, enforcement_features)
-
-        risk_probability = float(enforcement_model.predict_proba(feature_array)[0][1])
-        risk_probability = max(0.0, min(risk_probability, 1.0))
+        bundle = active_bundle
+        with admit_inference() as admitted:
+            if admitted:
+                feature_array = apply_date_overrides(components.feature_engineer_enforcement.rows_to_frame([
+                    components.feature_engineer_enforcement.create_feature_row(
+                        zone, dt, bundle.occupancy_zone_encoder, bundle.enforcement_features
+                    )
+                ], bundle.enforcement_features), overrides)
+
+                risk_probability = float(predict_enforcement_rows(feature_array, bundle)[0])
+                risk_probability = max(0.0, min(risk_probability, 1.0))
+                forecast_cache.put(('enforcement', zone, canonical_time(dt)) + scenario_key(overrides), risk_probability)
+                tier = TIER_MODEL
+            else:
+                risks, tier = enforcement_hourly_tiered(zone, dt, 1, bundle, False, overrides)
+                risk_probability = risks[0]
 
-        risk_level = get_risk_level(risk_probability)
+        risk_level = get_risk_level(risk_probability, bundle.enforcement_metadata)
 
-        risk_messages = enforcement_metadata['risk_messages']
+        risk_messages = bundle.enforcement_metadata['risk_messages']
 
-        return jsonify({
+        response = {
             'zone': zone,
             'datetime': dt_str,
+            'tier': tier,
             'risk': {
                 'probability': round(risk_probability, 4),
                 'level': risk_level,
@@ -898,14 +1939,153 @@ def predict_enforcement_risk():
                 'percentage': round(risk_probability * 100, 1)
             },
             'model_info': {
-                'model_type': enforcement_metadata['model_type'],
-                'test_roc_auc': float(enforcement_metadata['performance']['test_roc_auc'])
+                'model_type': bundle.enforcement_metadata['model_type'],
+                'test_roc_auc': float(bundle.enforcement_metadata['performance']['test_roc_auc'])
             }
-        })
+        }
+        if overrides:
+            response['overrides'] = overrides
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def recommendation_for(availability_level, risk_level):
+    """(score, text) from whichever of the occupancy and enforcement models are enabled"""
+    if OCCUPANCY_ENABLED and ENFORCEMENT_ENABLED:
+        # Both models enabled - use combined logic
+        score = get_recommendation_score(availability_level, risk_level)
+        recommendation = get_recommendation_text(score, availability_level, risk_level)
+    elif OCCUPANCY_ENABLED:
+        # Only occupancy enabled - base recommendation on availability
+        availability_scores = {'EXCELLENT': 100, 'GOOD': 80, 'MODERATE': 60, 'LOW': 40, 'VERY_LOW': 20, 'UNKNOWN': 50}
+        score = availability_scores.get(availability_level, 50)
+        if score >= 80:
+            recommendation = "EXCELLENT AVAILABILITY - Plenty of spaces likely available"
+        elif score >= 60:
+            recommendation = "GOOD AVAILABILITY - Should find parking with moderate search"
+        elif score >= 40:
+            recommendation = "LIMITED AVAILABILITY - May take some time to find parking"
+        else:
+            recommendation = "LOW AVAILABILITY - Very limited parking expected"
+    elif ENFORCEMENT_ENABLED:
+        # Only enforcement enabled - base recommendation on risk
+        risk_scores = {'VERY_LOW': 100, 'LOW': 75, 'MODERATE': 50, 'HIGH': 25, 'VERY_HIGH': 0, 'UNKNOWN': 50}
+        score = risk_scores.get(risk_level, 50)
+        if score >= 75:
+            recommendation = "LOW TICKET RISK - Safe to park here"
+        elif score >= 50:
+            recommendation = "MODERATE TICKET RISK - Exercise caution"
+        elif score >= 25:
+            recommendation = "HIGH TICKET RISK - Consider alternative parking"
+        else:
+            recommendation = "VERY HIGH TICKET RISK - Not recommended"
+    else:
+        score = 0
+        recommendation = "No models available"
+    return score, recommendation
+
+def build_parking_recommendation(zone, dt, duration_hours, bundle, admitted=True, overrides=None):
+    """
+    Combined occupancy + enforcement recommendation for a zone and start time
+
+    Returns the response body without the request's own datetime string, so
+    identical concurrent requests can share one result. overrides (from
+    parse_date_overrides) replace the date's game day, calendar and weather features.
+    """
+    tiers = []
+    response = {
+        'zone': zone,
+        'active_models': {
+            'occupancy': OCCUPANCY_ENABLED,
+            'enforcement': ENFORCEMENT_ENABLED
+        }
+    }
+
+    # Predict occupancy if model is enabled
+    occupancy_data = None
+    availability_level = 'UNKNOWN'
+
+    if OCCUPANCY_ENABLED:
+        predicted_occupancy, capacity, tier = zone_occupancy_tiered(zone, dt, bundle, admitted, overrides)
+        tiers.append(tier)
+
+        available_spaces = max(0, capacity - predicted_occupancy)
+
+        availability_level = get_availability_level(predicted_occupancy, capacity)
+
+        occupancy_data = {
+            'occupancy_count': int(predicted_occupancy),
+            'available_spaces': int(available_spaces),
+            'capacity': int(capacity),
+            'percent_full': round((predicted_occupancy / capacity * 100) if capacity > 0 else 0, 1),
+            'availability_level': availability_level
+        }
+        response['occupancy'] = occupancy_data
+    else:
+        response['occupancy'] = None
+
+    # Predict enforcement risk if model is enabled
+    enforcement_data = None
+    risk_level = 'UNKNOWN'
+
+    if ENFORCEMENT_ENABLED:
+        # Calculate cumulative enforcement risk across parking duration
+        # Enforcement model predicts HOURLY risk (trained on hourly data)
+        # Call model once per hour, then compound probabilities
+        hourly_risks, tier = enforcement_hourly_tiered(zone, dt, duration_hours, bundle, admitted, overrides)
+        tiers.append(tier)
+
+        # Compound probability: P(ticket) = 1 - P(no enforcement in all hours)
+        no_enforcement_prob = 1.0
+        for risk in hourly_risks:
+            no_enforcement_prob *= (1 - risk)
+
+        risk_probability = 1 - no_enforcement_prob
+        risk_probability = max(0.0, min(risk_probability, 1.0))
+
+        risk_level = get_risk_level(risk_probability, bundle.enforcement_metadata)
+        risk_messages = bundle.enforcement_metadata['risk_messages']
+
+        enforcement_data = {
+            'probability': round(risk_probability, 4),
+            'level': risk_level,
+            'message': risk_messages[risk_level],
+            'percentage': round(risk_probability * 100, 1),
+            'duration_hours': duration_hours,
+            'hourly_risks': [round(r * 100, 2) for r in hourly_risks]
+        }
+        response['enforcement'] = enforcement_data
+    else:
+        response['enforcement'] = None
+
+    score, recommendation = recommendation_for(availability_level, risk_level)
+
+    response['recommendation'] = {
+        'score': score,
+        'text': recommendation,
+        'should_park': score >= 50
+    }
+
+    # Add lot information
+    zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
+    lots = []
+    for _, row in zone_lots.head(5).iterrows():
+        # Prefer alternative_location_description, fallback to location_description or Zone_Name
+        location = row.get('alternative_location_description')
+        if pd.isna(location) or not location:
+            location = row.get('location_description', row.get('Zone_Name', 'Unknown'))
+
+        lots.append({
+            'lot_number': int(row['Lot_number']),
+            'location': location
+        })
+
+    response['lots'] = lots[:5]
+    response['tier'] = worst_tier(tiers)
+
+    return response
+
 @app.route('/api/parking/recommend', methods=['POST'])
 def recommend_parking():
     """
@@ -924,6 +2104,9 @@ def recommend_parking():
         "is_game_day": false,  // Optional
         "is_finals_week": false  // Optional
     }
+
+    weather, is_game_day and is_finals_week replace the date's own values
+    (see parse_date_overrides for every supported input).
     """
     try:
         data = request.json
@@ -934,196 +2117,231 @@ def recommend_parking():
 
         if not zone or not dt_str:
             return jsonify({'error': 'Missing required fields: zone, datetime'}), 400
+        try:
+            overrides = parse_date_overrides(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         if not OCCUPANCY_ENABLED and not ENFORCEMENT_ENABLED:
             return jsonify({'error': 'All models are disabled'}), 503
 
         dt = pd.to_datetime(dt_str)
 
-        # Initialize response
-        response = {
-            'zone': zone,
-            'datetime': dt_str,
-            'active_models': {
-                'occupancy': OCCUPANCY_ENABLED,
-                'enforcement': ENFORCEMENT_ENABLED
-            }
-        }
-
-        # Predict occupancy if model is enabled
-        occupancy_data = None
-        availability_level = 'UNKNOWN'
-
-        if OCCUPANCY_ENABLED:
-            # Get all lots in this zone from lot_mapping
-            zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
-
-            if len(zone_lots) > 0:
-                # This is an aggregated zone - predict for each lot that has AMP data
-                total_predicted_occupancy = 0
-                total_capacity = 0
-
-                for _, row in zone_lots.iterrows():
-                    lot_num = int(row['Lot_number'])
-                    lot_capacity = lot_capacities.get(lot_num, 0)
-
-                    # Check if this lot has AMP data
-                    if lot_num in lot_to_amp_zone:
-                        amp_zone = lot_to_amp_zone[lot_num]
-                        try:
-                            features = feature_engineer_occupancy.create_features(amp_zone, dt, occupancy_zone_encoder)
-                            occupancy_feature_array = feature_engineer_occupancy.features_to_array(features, occupancy_features)
-
-                            lot_occupancy = float(occupancy_model.predict(occupancy_feature_array)[0])
-                            lot_occupancy = max(0, min(lot_occupancy, lot_capacity))
-
-                            total_predicted_occupancy += lot_occupancy
-                            total_capacity += lot_capacity
-                        except Exception as e:
-                            print(f"Warning: Could not predict occupancy for lot {lot_num} (AMP zone: {amp_zone}): {e}")
-                            # Add capacity even if prediction fails
-                            total_capacity += lot_capacity
-                    else:
-                        # No AMP data for this lot, just add capacity
-                        total_capacity += lot_capacity
+        bundle = active_bundle
+        with admit_inference() as admitted:
+            key = ('recommend', bundle.version, zone, canonical_time(dt), duration_hours, admitted) + scenario_key(overrides)
+            response = dict(recommend_flight.do(
+                key, lambda: build_parking_recommendation(zone, dt, duration_hours, bundle, admitted, overrides)
+            ))
+        response['datetime'] = dt_str
+        if overrides:
+            response['overrides'] = overrides
 
-                predicted_occupancy = total_predicted_occupancy
-                capacity = total_capacity
-            else:
-                # Not an aggregated zone - might be a specific AMP zone name
-                capacity = zone_capacity_dict.get(zone, 0)
-
-                try:
-                    features = feature_engineer_occupancy.create_features(zone, dt, occupancy_zone_encoder)
-                    occupancy_feature_array = feature_engineer_occupancy.features_to_array(features, occupancy_features)
-                    predicted_occupancy = float(occupancy_model.predict(occupancy_feature_array)[0])
-                    predicted_occupancy = max(0, min(predicted_occupancy, capacity))
-                except Exception as e:
-                    print(f"Warning: Could not predict for zone '{zone}': {e}")
-                    predicted_occupancy = 0
-
-            available_spaces = max(0, capacity - predicted_occupancy)
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-            availability_level = get_availability_level(predicted_occupancy, capacity)
+def evaluate_scenarios(zones, dt, duration_hours, scenarios, bundle):
+    """
+    Recommendation results of every zone under each set of date-feature overrides
 
-            occupancy_data = {
-                'occupancy_count': int(predicted_occupancy),
-                'available_spaces': int(available_spaces),
-                'capacity': int(capacity),
-                'percent_full': round((predicted_occupancy / capacity * 100) if capacity > 0 else 0, 1),
-                'availability_level': availability_level
-            }
-            response['occupancy'] = occupancy_data
-        else:
-            response['occupancy'] = None
-
-        # Predict enforcement risk if model is enabled
-        enforcement_data = None
-        risk_level = 'UNKNOWN'
-
-        if ENFORCEMENT_ENABLED:
-            # Calculate cumulative enforcement risk across parking duration
-            # Enforcement model predicts HOURLY risk (trained on hourly data)
-            # Call model once per hour, then compound probabilities
-            hourly_risks = []
-            for hour_offset in range(duration_hours):
-                hour_dt = dt + pd.Timedelta(hours=hour_offset)
-                hour_features = feature_engineer_enforcement.create_features(zone, hour_dt, occupancy_zone_encoder)
-                enforcement_feature_array = feature_engineer_enforcement.features_to_array(hour_features, enforcement_features)
-                hour_risk = float(enforcement_model.predict_proba(enforcement_feature_array)[0][1])
-                hourly_risks.append(max(0.0, min(hour_risk, 1.0)))
-
-            # Compound probability: P(ticket) = 1 - P(no enforcement in all hours)
-            no_enforcement_prob = 1.0
-            for risk in hourly_risks:
-                no_enforcement_prob *= (1 - risk)
-
-            risk_probability = 1 - no_enforcement_prob
-            risk_probability = max(0.0, min(risk_probability, 1.0))
-
-            risk_level = get_risk_level(risk_probability)
-            risk_messages = enforcement_metadata['risk_messages']
+    Returns one list per scenario of {'zone', 'occupancy', 'enforcement',
+    'recommendation'} dicts with the values /api/parking/recommend gives for
+    the same overrides. Each model's features are built once for all zones
+    (every AMP zone at dt, every zone for each hour of the window) and scored
+    for all scenarios in a single model call.
+    """
+    n_scenarios, n_zones = len(scenarios), len(zones)
+    occupancy = capacities = risks = None
+
+    if OCCUPANCY_ENABLED:
+        inputs = [zone_occupancy_inputs(zone) for zone in zones]
+        capacities = np.array([capacity for _, _, capacity in inputs], dtype=float)
+        amp_zones = [amp_zone for amp, _, _ in inputs for amp_zone in amp]
+        amp_caps = np.array([cap for _, caps, _ in inputs for cap in caps], dtype=float)
+        amp_owner = np.repeat(np.arange(n_zones), [len(amp) for amp, _, _ in inputs])
+        codes, unique = pd.factorize(pd.Index(amp_zones, dtype=object))
+        scores = score_scenarios_bulk('occupancy', list(unique), [dt] * len(unique), scenarios, bundle)[:, codes]
+        # Each lot clipped to its own capacity, then summed per zone
+        occupancy = np.zeros((n_scenarios, n_zones))
+        np.add.at(occupancy.T, amp_owner, np.clip(np.nan_to_num(scores), 0, amp_caps).T)
+
+    if ENFORCEMENT_ENABLED:
+        hour_dts = [dt + pd.Timedelta(hours=hour_offset) for hour_offset in range(duration_hours)]
+        scores = score_scenarios_bulk('enforcement', np.repeat(np.asarray(zones, dtype=object), duration_hours),
+                                      hour_dts * n_zones, scenarios, bundle)
+        risks = np.clip(scores, 0.0, 1.0).reshape(n_scenarios, n_zones, duration_hours)
+
+    results = []
+    for s in range(n_scenarios):
+        zone_results = []
+        for z, zone in enumerate(zones):
+            availability_level, risk_level = 'UNKNOWN', 'UNKNOWN'
+            result = {'zone': zone, 'occupancy': None, 'enforcement': None}
+            if occupancy is not None:
+                predicted_occupancy, capacity = float(occupancy[s, z]), capacities[z]
+                availability_level = get_availability_level(predicted_occupancy, capacity)
+                result['occupancy'] = {
+                    'occupancy_count': int(predicted_occupancy),
+                    'available_spaces': int(max(0, capacity - predicted_occupancy)),
+                    'capacity': int(capacity),
+                    'percent_full': round((predicted_occupancy / capacity * 100) if capacity > 0 else 0, 1),
+                    'availability_level': availability_level
+                }
+            if risks is not None:
+                hourly_risks = [float(risk) for risk in risks[s, z]]
+                no_enforcement_prob = 1.0
+                for risk in hourly_risks:
+                    no_enforcement_prob *= (1 - risk)
+                risk_probability = max(0.0, min(1 - no_enforcement_prob, 1.0))
+                risk_level = get_risk_level(risk_probability, bundle.enforcement_metadata)
+                result['enforcement'] = {
+                    'probability': round(risk_probability, 4),
+                    'level': risk_level,
+                    'percentage': round(risk_probability * 100, 1),
+                    'hourly_risks': [round(r * 100, 2) for r in hourly_risks]
+                }
+            score, text = recommendation_for(availability_level, risk_level)
+            result['recommendation'] = {'score': score, 'text': text, 'should_park': score >= 50}
+            zone_results.append(result)
+        results.append(zone_results)
+    return results
+
+def scenario_summary(zone_results, baseline=None):
+    """Campus-wide averages of one scenario, and per-zone and average changes from the baseline"""
+    def averages(results):
+        percent_full = [r['occupancy']['percent_full'] for r in results if r['occupancy']]
+        probability = [r['enforcement']['probability'] for r in results if r['enforcement']]
+        return {
+            'mean_percent_full': round(float(np.mean(percent_full)), 1) if percent_full else None,
+            'mean_ticket_probability': round(float(np.mean(probability)), 4) if probability else None,
+            'mean_recommendation_score': round(float(np.mean([r['recommendation']['score'] for r in results])), 1),
+            'zones_to_park': sum(r['recommendation']['should_park'] for r in results)
+        }
 
-            enforcement_data = {
-                'probability': round(risk_probability, 4),
-                'level': risk_level,
-                'message': risk_messages[risk_level],
-                'percentage': round(risk_probability * 100, 1),
-                'duration_hours': duration_hours,
-                'hourly_risks': [round(r * 100, 2) for r in hourly_risks]
-            }
-            response['enforcement'] = enforcement_data
-        else:
-            response['enforcement'] = None
-
-        # Calculate recommendation based on available models
-        if OCCUPANCY_ENABLED and ENFORCEMENT_ENABLED:
-            # Both models enabled - use combined logic
-            score = get_recommendation_score(availability_level, risk_level)
-            recommendation = get_recommendation_text(score, availability_level, risk_level)
-        elif OCCUPANCY_ENABLED:
-            # Only occupancy enabled - base recommendation on availability
-            availability_scores = {'EXCELLENT': 100, 'GOOD': 80, 'MODERATE': 60, 'LOW': 40, 'VERY_LOW': 20, 'UNKNOWN': 50}
-            score = availability_scores.get(availability_level, 50)
-            if score >= 80:
-                recommendation = "EXCELLENT AVAILABILITY - Plenty of spaces likely available"
-            elif score >= 60:
-                recommendation = "GOOD AVAILABILITY - Should find parking with moderate search"
-            elif score >= 40:
-                recommendation = "LIMITED AVAILABILITY - May take some time to find parking"
-            else:
-                recommendation = "LOW AVAILABILITY - Very limited parking expected"
-        elif ENFORCEMENT_ENABLED:
-            # Only enforcement enabled - base recommendation on risk
-            risk_scores = {'VERY_LOW': 100, 'LOW': 75, 'MODERATE': 50, 'HIGH': 25, 'VERY_HIGH': 0, 'UNKNOWN': 50}
-            score = risk_scores.get(risk_level, 50)
-            if score >= 75:
-                recommendation = "LOW TICKET RISK - Safe to park here"
-            elif score >= 50:
-                recommendation = "MODERATE TICKET RISK - Exercise caution"
-            elif score >= 25:
-                recommendation = "HIGH TICKET RISK - Consider alternative parking"
-            else:
-                recommendation = "VERY HIGH TICKET RISK - Not recommended"
-        else:
-            score = 0
-            recommendation = "No models available"
+    summary = averages(zone_results)
+    best = max(zone_results, key=lambda r: (r['recommendation']['score'],
+                                            (r['occupancy'] or {}).get('available_spaces', 0)))
+    summary['best_zone'] = best['zone']
+    if baseline is not None:
+        base = averages(baseline)
+        summary['vs_baseline'] = {name: (round(value - base[name], 4) if value is not None else None)
+                                  for name, value in summary.items() if name in base}
+        for result, base_result in zip(zone_results, baseline):
+            change = {'recommendation_score': result['recommendation']['score'] - base_result['recommendation']['score']}
+            if result['occupancy']:
+                change['occupancy_count'] = result['occupancy']['occupancy_count'] - base_result['occupancy']['occupancy_count']
+                change['percent_full'] = round(result['occupancy']['percent_full'] - base_result['occupancy']['percent_full'], 1)
+            if result['enforcement']:
+                change['probability'] = round(result['enforcement']['probability'] - base_result['enforcement']['probability'], 4)
+            result['vs_baseline'] = change
+    return summary
+
+@app.route('/api/scenarios/evaluate', methods=['POST'])
+def evaluate_scenarios_endpoint():
+    """
+    Compare what-if scenarios for one time across many zones
 
-        response['recommendation'] = {
-            'score': score,
-            'text': recommendation,
-            'should_park': score >= 50
-        }
+    Request body:
+    {
+        "datetime": "2024-11-15T10:30:00",
+        "duration_hours": 2,  // Optional, defaults to 1
+        "zones": ["Green 2", "Yellow 1"],  // Optional, defaults to every zone in /api/zones/list
+        "scenarios": [
+            {"name": "game day", "is_game_day": true},
+            {"name": "game day + snow", "is_game_day": true,
+             "weather": {"temp_f": 25, "snowfall": 2.0}}
+        ],
+        "include_baseline": true  // Optional, adds the date as it is (no overrides) first
+    }
 
-        # Add lot information
-        zone_lots = lot_mapping[lot_mapping['Zone_Name'] == zone]
-        lots = []
-        for _, row in zone_lots.head(5).iterrows():
-            # Prefer alternative_location_description, fallback to location_description or Zone_Name
-            location = row.get('alternative_location_description')
-            if pd.isna(location) or not location:
-                location = row.get('location_description', row.get('Zone_Name', 'Unknown'))
+    Each scenario takes the inputs of /api/parking/recommend (see
+    parse_date_overrides). Features are built once per model and every
+    scenario is scored in the same model call. Scenarios always use the
+    models, so the endpoint answers 503 when the server is shedding load.
+    """
+    try:
+        bundle = active_bundle
+        data = request.json or {}
 
-            lots.append({
-                'lot_number': int(row['Lot_number']),
-                'location': location
+        dt_str = data.get('datetime')
+        if not dt_str:
+            return jsonify({'error': 'Missing required field: datetime'}), 400
+        if not OCCUPANCY_ENABLED and not ENFORCEMENT_ENABLED:
+            return jsonify({'error': 'All models are disabled'}), 503
+        dt = pd.to_datetime(dt_str)
+        if dt.tz is not None:
+            dt = dt.tz_localize(None)
+        duration_hours = max(1, min(int(data.get('duration_hours', 1)), 24))
+
+        zones = list(dict.fromkeys(data['zones'])) if data.get('zones') else recommendable_zones()
+        unknown = [zone for zone in zones if zone not in zone_capacity_dict]
+        if unknown:
+            return jsonify({'error': f"Unknown zones: {', '.join(map(str, unknown))}"}), 400
+        max_zones = SCENARIO_CONFIG.get('max_zones', 200)
+        if len(zones) > max_zones:
+            return jsonify({'error': f'At most {max_zones} zones per request'}), 400
+
+        names, scenarios = [], []
+        if data.get('include_baseline', True):
+            names.append('baseline')
+            scenarios.append({})
+        for i, spec in enumerate(data.get('scenarios') or []):
+            if not isinstance(spec, dict):
+                return jsonify({'error': f'Scenario {i} must be an object'}), 400
+            try:
+                scenarios.append(parse_date_overrides(spec))
+            except ValueError as e:
+                return jsonify({'error': f"Scenario {i}: {e}"}), 400
+            names.append(str(spec.get('name') or f'scenario {i + 1}'))
+        if not scenarios:
+            return jsonify({'error': 'No scenarios to evaluate'}), 400
+        max_scenarios = SCENARIO_CONFIG.get('max_scenarios', 50)
+        if len(scenarios) > max_scenarios:
+            return jsonify({'error': f'At most {max_scenarios} scenarios per request'}), 400
+
+        start = time.perf_counter()
+        with admit_inference() as admitted:
+            if not admitted:
+                return jsonify({'error': 'Server is shedding load, retry shortly'}), 503
+            results = evaluate_scenarios(zones, dt, duration_hours, scenarios, bundle)
+
+        baseline = results[0] if data.get('include_baseline', True) else None
+        scenario_results = []
+        for name, overrides, zone_results in zip(names, scenarios, results):
+            summary = scenario_summary(zone_results, None if zone_results is baseline else baseline)
+            scenario_results.append({
+                'name': name,
+                'overrides': overrides,
+                'summary': summary,
+                'zones': zone_results
             })
 
-        response['lots'] = lots[:5]
+        return jsonify({
+            'datetime': dt_str,
+            'duration_hours': duration_hours,
+            'total_zones': len(zones),
+            'total_scenarios': len(scenarios),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            'scenarios': scenario_results
+        })
 
-        return jsonify(response)
-        
     except Exception as e:
+        import traceback
+        traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+def recommendable_zones():
+    """Zones offered to drivers, i.e. every known zone but the restricted ones"""
+    excluded_zones = {'Authorized Vehicles Only', 'Buisness Parking'}
+    return sorted([z for z in zone_capacity_dict.keys() if z not in excluded_zones])
+
 @app.route('/api/zones/list')
 def list_zones():
     """List all available parking zones (excluding restricted zones)"""
     try:
-        # Exclude restricted zones from recommendations
-        excluded_zones = {'Authorized Vehicles Only', 'Buisness Parking'}
-
-        zones = sorted([z for z in zone_capacity_dict.keys() if z not in excluded_zones])
+        zones = recommendable_zones()
 
         zone_info = []
         for zone in zones:
@@ -1153,7 +2371,7 @@ def list_lots():
             zone_type = str(row.get('zone_type', 'Unknown')) if pd.notna(row.get('zone_type')) else 'Unknown'
 
             # Skip restricted lots (University Vehicles, ADA, Guest Pass, etc.)
-            if 'University' in zone_type or 'ADA' in zone_type or 'Guest' in zone_type:
+            if is_restricted_zone_type(zone_type):
                 continue
 
             lot_info = {
@@ -1186,6 +2404,348 @@ def list_lots():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/lots/nearest', methods=['POST'])
+def nearest_lots():
+    """
+    Nearest open lots to a location, with predicted availability and ticket risk
+
+    Request body:
+    {
+        "latitude": 46.7298,
+        "longitude": -117.1617,
+        "radius_m": 400,  // Lots within this distance, or
+        "k": 5,  // the k nearest (default when neither is given)
+        "datetime": "2024-11-15T10:30:00",  // Optional, defaults to now
+        "duration_hours": 2,  // Optional, defaults to 1
+        "zones": ["Green 2", "Yellow 1"],  // Optional, only lots in these zones
+        "sort_by": "distance"  // Optional: "distance", "availability" or "risk"
+    }
+
+    Lots are selected by distance first; only those are scored, with one
+    occupancy batch for the AMP-covered lots and one enforcement batch for
+    every zone and hour involved.
+    """
+    try:
+        bundle = active_bundle
+        data = request.json or {}
+
+        try:
+            latitude, longitude = float(data['latitude']), float(data['longitude'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'Missing or invalid fields: latitude, longitude'}), 400
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return jsonify({'error': 'latitude/longitude out of range'}), 400
+
+        sort_by = data.get('sort_by', 'distance')
+        if sort_by not in ('distance', 'availability', 'risk'):
+            return jsonify({'error': "sort_by must be 'distance', 'availability' or 'risk'"}), 400
+        duration_hours = max(1, min(int(data.get('duration_hours', 1)), 24))
+        dt_str = data.get('datetime')
+        dt = pd.to_datetime(dt_str) if dt_str else pd.Timestamp.now().floor('min')
+        if dt.tz is not None:
+            dt = dt.tz_localize(None)
+        zones = set(data['zones']) if data.get('zones') else None
+
+        # Distance filtering happens here, before anything is scored
+        index = components.lot_index
+        radius_m = data.get('radius_m')
+        if radius_m is not None:
+            radius_m = min(float(radius_m), NEAREST_LOTS_CONFIG.get('max_radius_m', 5000))
+            lots, distances = index.within(latitude, longitude, radius_m)
+            k = None
+        else:
+            k = max(1, min(int(data.get('k', NEAREST_LOTS_CONFIG.get('default_k', 5))),
+                           NEAREST_LOTS_CONFIG.get('max_k', 50)))
+            # With a zone filter every lot is ranked, so k lots of those zones can be found
+            lots, distances = index.nearest(latitude, longitude, index.lots if zones else k)
+
+        lot_rows = lot_mapping.drop_duplicates('Lot_number').set_index('Lot_number').loc[lots]
+        if zones is not None:
+            keep = lot_rows['Zone_Name'].isin(zones).to_numpy()
+            lot_rows, lots, distances = lot_rows[keep], lots[keep], distances[keep]
+            if k is not None:
+                lot_rows, lots, distances = lot_rows.iloc[:k], lots[:k], distances[:k]
+
+        with admit_inference() as admitted:
+            results, tier = score_nearby_lots(lot_rows, dt, duration_hours, bundle, admitted)
+
+        for result, distance in zip(results, distances):
+            result['distance_m'] = round(float(distance), 1)
+        if sort_by == 'availability':
+            results.sort(key=lambda r: (-(r['occupancy'] or {}).get('available_spaces', -1), r['distance_m']))
+        elif sort_by == 'risk':
+            results.sort(key=lambda r: ((r['enforcement'] or {}).get('probability', 2.0), r['distance_m']))
+
+        return jsonify({
+            'latitude': latitude,
+            'longitude': longitude,
+            'radius_m': radius_m,
+            'k': k,
+            'datetime': dt.isoformat(),
+            'duration_hours': duration_hours,
+            'sort_by': sort_by,
+            'tier': tier,
+            'total_lots': len(results),
+            'lots': results
+        })
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+def score_nearby_lots(lot_rows, dt, duration_hours, bundle, admitted):
+    """
+    (per-lot result dicts, tier) for the lots of a nearest-lots query, in lot_rows order
+
+    Occupancy follows /api/occupancy/predict-lot: the AMP occupancy model for
+    paid lots it covers well, time patterns otherwise. Ticket risk is the
+    cumulative risk over the parking window in the lot's zone.
+    """
+    tiers = []
+    lots = lot_rows.index.to_numpy()
+    zones = lot_rows['Zone_Name'].astype(str).to_numpy()
+    locations = lot_rows['location_description'].fillna('').astype(str).to_numpy()
+    capacities = lot_rows['capacity'].fillna(0).astype(float).to_numpy()
+    zone_types = lot_rows['zone_type'].to_numpy() if 'zone_type' in lot_rows.columns else None
+
+    # Occupancy: time patterns for every lot in one vectorized call, then the
+    # AMP-covered lots scored together in one model batch
+    occupancy = components.time_pattern.occupancy(capacities, zone_types, [dt]) if len(lots) else np.empty(0)
+    sources = np.full(len(lots), 'time_pattern_estimate', dtype=object)
+    use_amp = np.array([
+        OCCUPANCY_ENABLED and bundle.occupancy_model is not None and lot_uses_amp_model(int(lot), zone, location)
+        for lot, zone, location in zip(lots, zones, locations)
+    ], dtype=bool)
+    amp_keys = [('amp_occupancy', int(lot), canonical_time(dt)) for lot in lots]
+    if use_amp.any():
+        amp_i = np.flatnonzero(use_amp)
+        if admitted:
+            try:
+                scores = score_rows('occupancy', [lot_to_amp_zone[int(lots[i])] for i in amp_i],
+                                    [dt] * len(amp_i), bundle=bundle)
+                for i, score in zip(amp_i, scores):
+                    occupancy[i] = max(0.0, min(float(score), capacities[i]))
+                    sources[i] = 'amp'
+                    forecast_cache.put(amp_keys[i], occupancy[i])
+                tiers.append(TIER_MODEL)
+            except Exception as e:
+                print(f"Warning: Could not score AMP occupancy for nearby lots: {e}")
+        else:
+            for i in amp_i:
+                cached = forecast_cache.get(amp_keys[i])
+                if cached is not None:
+                    occupancy[i], sources[i] = cached, 'amp'
+                tiers.append(TIER_CACHE if cached is not None else TIER_TIME_PATTERN)
+
+    # Ticket risk: every (zone, hour) of the parking window in one batch
+    zone_risks = {}
+    if ENFORCEMENT_ENABLED and bundle.enforcement_model is not None and len(lots):
+        unique_zones = list(dict.fromkeys(zones))
+        hour_dts = [dt + pd.Timedelta(hours=h) for h in range(duration_hours)]
+        try:
+            if admitted:
+                scores = score_rows('enforcement', [z for z in unique_zones for _ in hour_dts],
+                                    hour_dts * len(unique_zones), bundle=bundle)
+                scores = np.clip(scores, 0.0, 1.0).reshape(len(unique_zones), duration_hours)
+                for zone, risks in zip(unique_zones, scores):
+                    for hour_dt, risk in zip(hour_dts, risks):
+                        forecast_cache.put(('enforcement', zone, canonical_time(hour_dt)), float(risk))
+                    zone_risks[zone] = risks
+                tiers.append(TIER_MODEL)
+            else:
+                for zone in unique_zones:
+                    risks, tier = enforcement_hourly_tiered(zone, dt, duration_hours, bundle, False)
+                    zone_risks[zone] = np.asarray(risks)
+                    tiers.append(tier)
+        except Exception as e:
+            print(f"Warning: Could not generate enforcement predictions for nearby lots: {e}")
+            zone_risks = {}
+
+    results = []
+    for i, lot in enumerate(lots):
+        row = lot_rows.iloc[i]
+        result = {
+            'lot_number': int(lot),
+            'zone': zones[i],
+            'zone_type': str(row['zone_type']) if pd.notna(row.get('zone_type')) else 'Unknown',
+            'location': locations[i],
+            'capacity': int(capacities[i]),
+            'latitude': float(row['latitude']) if pd.notna(row.get('latitude')) else None,
+            'longitude': float(row['longitude']) if pd.notna(row.get('longitude')) else None,
+            'occupancy': None,
+            'enforcement': None
+        }
+        if capacities[i] > 0:
+            result['occupancy'] = {
+                'occupancy_count': round(float(occupancy[i]), 1),
+                'available_spaces': int(max(0, capacities[i] - occupancy[i])),
+                'percent_full': round(float(occupancy[i]) / capacities[i] * 100, 1),
+                'availability_level': get_availability_level(occupancy[i], capacities[i]),
+                'source': sources[i]
+            }
+        risks = zone_risks.get(zones[i])
+        if risks is not None:
+            # P(at least one ticket) = 1 - P(no ticket in any hour)
+            cumulative_risk = max(0.0, min(1.0 - float(np.prod(1.0 - risks)), 1.0))
+            risk_level = get_risk_level(cumulative_risk, bundle.enforcement_metadata)
+            result['enforcement'] = {
+                'probability': round(cumulative_risk, 4),
+                'percentage': round(cumulative_risk * 100, 1),
+                'level': risk_level
+            }
+        results.append(result)
+
+    return results, worst_tier(tiers)
+
+FORECAST_COLUMNS = ['enforcement_zone', 'capacity', 'occupancy_count', 'available_spaces', 'percent_full',
+                    'availability_level', 'occupancy_source', 'enforcement_probability', 'risk_level',
+                    'recommendation_score', 'error']
+
+def forecast_rows(frame, bundle=None):
+    """
+    Occupancy and ticket-risk forecasts for a batch of (zone or lot, datetime, duration) rows
+
+    frame has a 'datetime' column, a 'zone' and/or 'lot_number' column (rows
+    with a lot number are lot rows) and optionally 'duration_hours' (default
+    1, at most 24). Zone occupancy follows /api/parking/recommend (the zone's
+    AMP lots summed), lot occupancy follows /api/lots/nearest (the AMP model
+    for paid lots it covers well, time patterns otherwise). Ticket risk is
+    cumulative over the parking window, in the lot's zone for lot rows.
+
+    Every distinct (zone, hour) is scored once, in one occupancy and one
+    enforcement model call for the whole batch. Returns a DataFrame of
+    FORECAST_COLUMNS aligned with frame; rows that cannot be forecast carry
+    an error message instead.
+    """
+    bundle = bundle or active_bundle
+    n = len(frame)
+    dts = pd.DatetimeIndex(pd.to_datetime(frame['datetime'], errors='coerce'))
+    if dts.tz is not None:
+        dts = dts.tz_localize(None)
+    durations = np.ones(n, dtype=np.int64)
+    if 'duration_hours' in frame.columns:
+        durations = pd.to_numeric(frame['duration_hours'], errors='coerce').fillna(1).clip(1, 24).astype(np.int64).to_numpy()
+    zones_in = frame['zone'].to_numpy(dtype=object) if 'zone' in frame.columns else np.full(n, None, dtype=object)
+    lots_in = (pd.to_numeric(frame['lot_number'], errors='coerce').to_numpy() if 'lot_number' in frame.columns
+               else np.full(n, np.nan))
+
+    out = pd.DataFrame({
+        'enforcement_zone': np.full(n, None, dtype=object),
+        'capacity': np.full(n, np.nan),
+        'occupancy_count': np.full(n, np.nan),
+        'available_spaces': np.full(n, np.nan),
+        'percent_full': np.full(n, np.nan),
+        'availability_level': np.full(n, None, dtype=object),
+        'occupancy_source': np.full(n, None, dtype=object),
+        'enforcement_probability': np.full(n, np.nan),
+        'risk_level': np.full(n, None, dtype=object),
+        'recommendation_score': np.full(n, np.nan),
+        'error': np.full(n, None, dtype=object)
+    }, index=frame.index)
+    errors = out['error'].to_numpy()
+    capacities = np.full(n, np.nan)
+    sources = np.full(n, None, dtype=object)
+    risk_zones = np.full(n, None, dtype=object)
+
+    lot_table = lot_mapping.drop_duplicates('Lot_number').set_index('Lot_number')
+    zone_lots = {}
+    # Occupancy model rows: (output row, AMP zone, capacity its prediction is clipped to)
+    occupancy_rows, occupancy_keys, occupancy_caps = [], [], []
+    pattern_rows, pattern_types = [], []
+
+    for i in range(n):
+        if pd.isna(dts[i]):
+            errors[i] = 'Invalid datetime'
+            continue
+        if not pd.isna(lots_in[i]):
+            lot = int(lots_in[i])
+            if lot not in lot_table.index:
+                errors[i] = f'Lot {lot} not found in mapping'
+                continue
+            info = lot_table.loc[lot]
+            zone_type = str(info['zone_type']) if pd.notna(info.get('zone_type')) else ''
+            if is_restricted_zone_type(zone_type):
+                errors[i] = f'Lot {lot} is restricted to {zone_type}'
+                continue
+            zone = str(info['Zone_Name'])
+            location = str(info['location_description']) if pd.notna(info.get('location_description')) else ''
+            capacities[i] = float(info['capacity']) if pd.notna(info.get('capacity')) else 0.0
+            if OCCUPANCY_ENABLED and bundle.occupancy_model is not None and lot_uses_amp_model(lot, zone, location):
+                occupancy_rows.append(i)
+                occupancy_keys.append(lot_to_amp_zone[lot])
+                occupancy_caps.append(capacities[i])
+                sources[i] = 'amp'
+            else:
+                pattern_rows.append(i)
+                pattern_types.append(zone_type)
+                sources[i] = 'time_pattern_estimate'
+        elif zones_in[i] is not None and not pd.isna(zones_in[i]):
+            zone = str(zones_in[i])
+            if OCCUPANCY_ENABLED:
+                if zone not in zone_lots:
+                    zone_lots[zone] = zone_occupancy_inputs(zone)
+                amp_zones, amp_caps, capacities[i] = zone_lots[zone]
+                occupancy_rows.extend([i] * len(amp_zones))
+                occupancy_keys.extend(amp_zones)
+                occupancy_caps.extend(amp_caps)
+                sources[i] = 'model'
+        else:
+            errors[i] = 'Missing zone or lot_number'
+            continue
+        risk_zones[i] = zone
+
+    occupancy = np.zeros(n)
+    if occupancy_rows:
+        occupancy_rows = np.asarray(occupancy_rows)
+        codes, unique = pd.MultiIndex.from_arrays([occupancy_keys, dts[occupancy_rows]]).factorize()
+        scores = score_rows_bulk('occupancy', unique.get_level_values(0), unique.get_level_values(1), bundle)[codes]
+        np.add.at(occupancy, occupancy_rows, np.clip(np.nan_to_num(scores), 0, np.asarray(occupancy_caps, dtype=float)))
+    if pattern_rows:
+        pattern_rows = np.asarray(pattern_rows)
+        occupancy[pattern_rows] = components.time_pattern.occupancy(
+            capacities[pattern_rows], pattern_types, dts[pattern_rows])
+
+    has_occupancy = pd.notna(sources)
+    out['occupancy_source'] = sources
+    out['capacity'] = capacities
+    # Rounded as the endpoints round (Python's round, not np.round, which differs on ties)
+    out.loc[has_occupancy, 'occupancy_count'] = [round(float(o), 1) for o in occupancy[has_occupancy]]
+    out.loc[has_occupancy, 'available_spaces'] = np.floor(np.maximum(0, capacities - occupancy)[has_occupancy])
+    out.loc[has_occupancy, 'percent_full'] = [
+        round(float(o) / c * 100, 1) if c > 0 else 0.0 for o, c in zip(occupancy[has_occupancy], capacities[has_occupancy])
+    ]
+    out.loc[has_occupancy, 'availability_level'] = [
+        get_availability_level(o, c) for o, c in zip(occupancy[has_occupancy], capacities[has_occupancy])
+    ]
+
+    # Ticket risk: every (zone, hour) of every parking window, scored once
+    out['enforcement_zone'] = risk_zones
+    risk_rows = np.flatnonzero(pd.notna(risk_zones))
+    if ENFORCEMENT_ENABLED and bundle.enforcement_model is not None and len(risk_rows):
+        windows = durations[risk_rows]
+        window_rows = np.repeat(risk_rows, windows)
+        offsets = np.arange(windows.sum()) - np.repeat(np.cumsum(windows) - windows, windows)
+        hour_dts = dts[window_rows] + pd.to_timedelta(offsets, unit='h')
+        codes, unique = pd.MultiIndex.from_arrays([risk_zones[window_rows], hour_dts]).factorize()
+        risks = np.clip(score_rows_bulk('enforcement', unique.get_level_values(0), unique.get_level_values(1),
+                                        bundle), 0.0, 1.0)[codes]
+        # P(at least one ticket) = 1 - P(no ticket in any hour)
+        no_ticket = np.multiply.reduceat(1.0 - risks, np.cumsum(windows) - windows)
+        probabilities = np.clip(1.0 - no_ticket, 0.0, 1.0)
+        out.iloc[risk_rows, out.columns.get_loc('enforcement_probability')] = [round(float(p), 4) for p in probabilities]
+        out.iloc[risk_rows, out.columns.get_loc('risk_level')] = [
+            get_risk_level(p, bundle.enforcement_metadata) for p in probabilities
+        ]
+
+    if OCCUPANCY_ENABLED and ENFORCEMENT_ENABLED:
+        both = out['availability_level'].notna() & out['risk_level'].notna()
+        out.loc[both, 'recommendation_score'] = [
+            get_recommendation_score(a, r) for a, r in zip(out.loc[both, 'availability_level'], out.loc[both, 'risk_level'])
+        ]
+    out['error'] = errors
+    return out[FORECAST_COLUMNS]
+
 @app.route('/api/zones/<zone_name>/info')
 def get_zone_info(zone_name):
     """Get detailed information about a specific zone"""
@@ -1217,11 +2777,16 @@ def get_zone_info(zone_name):
 @app.route('/api/models/info')
 def get_models_info():
     """Get information about the loaded models"""
+    bundle = active_bundle
+    occupancy_metadata = bundle.occupancy_metadata
+    enforcement_metadata = bundle.enforcement_metadata
     response = {
         'active_models': {
             'occupancy': OCCUPANCY_ENABLED,
             'enforcement': ENFORCEMENT_ENABLED
-        }
+        },
+        'bundle': bundle.describe(),
+        'reload': model_reloader.stats()
     }
 
     if OCCUPANCY_ENABLED and occupancy_metadata:
@@ -1256,6 +2821,39 @@ def get_models_info():
 
     return jsonify(response)
 
+@app.route('/api/models/reload', methods=['POST'])
+def reload_models():
+    """
+    Load, validate and swap in model artifacts without a restart
+
+    Request body (optional):
+    {
+        "model_dir": "v2"  // defaults to the current bundle's directory
+    }
+
+    model_dir must be inside the configured model directory (relative paths
+    are taken from there), so a request cannot load artifacts from elsewhere.
+
+    Allowed from localhost, or with an X-Reload-Token header matching
+    model_reload.token in config.json. Returns 202 while the reload runs in
+    the background; poll /api/models/info for its outcome.
+    """
+    token = MODEL_RELOAD_CONFIG.get('token')
+    if request.remote_addr not in ('127.0.0.1', '::1') and not (token and request.headers.get('X-Reload-Token') == token):
+        return jsonify({'error': 'Model reload is only allowed from localhost or with a valid token'}), 403
+
+    data = request.get_json(silent=True) or {}
+    model_root = os.path.realpath(MODEL_DIR)
+    model_dir = os.path.realpath(os.path.join(model_root, str(data.get('model_dir') or active_bundle.model_dir)))
+    if os.path.commonpath([model_root, model_dir]) != model_root:
+        return jsonify({'error': f'model_dir must be inside {MODEL_DIR}'}), 400
+    if not os.path.isdir(model_dir):
+        return jsonify({'error': f'Model directory not found: {model_dir}'}), 400
+
+    if not model_reloader.start(model_dir):
+        return jsonify({'error': 'A model reload is already in progress', 'reload': model_reloader.stats()}), 409
+    return jsonify({'reload': model_reloader.stats()}), 202
+
 @app.route('/api/feedback/submit', methods=['POST'])
 def submit_feedback():
     """
@@ -1337,6 +2935,8 @@ if __name__ == '__main__':
     print("CougarPark API Server Starting...")
     print("="*80)
 
+    occupancy_metadata = active_bundle.occupancy_metadata
+    enforcement_metadata = active_bundle.enforcement_metadata
     if OCCUPANCY_ENABLED and occupancy_metadata:
         print(f"\nOccupancy Model: {occupancy_metadata['model_type']}")
         print(f"  Test MAE: {occupancy_metadata['performance']['test_mae']:.3f} cars")
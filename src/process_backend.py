@@ -0,0 +1,203 @@
+"""Process-pool backend for batched feature engineering and scoring"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+
+# Set in a worker's environment so that importing parking_api there does not
+# try to start a pool (or schedulers, watchers, warm-up) of its own
+WORKER_ENV_FLAG = 'COUGARPARK_POOL_WORKER'
+
+# Workers inherit os.environ as it is when they are spawned; the flag is only
+# set for that moment, so starts from different threads must not overlap
+_spawn_lock = threading.Lock()
+
+_api = None  # parking_api module loaded inside each worker process
+
+
+def is_pool_worker():
+    """True when running inside one of the pool's worker processes"""
+    return os.environ.get(WORKER_ENV_FLAG) == '1'
+
+
+def scorer_api():
+    """
+    parking_api for an offline scoring process (scripts/backtest.py, scripts/batch_score.py)
+
+    Imported once per process, flagged as a worker so it loads without the
+    serving extras (schedulers, pool, heatmap, warm-up). Also usable as a
+    ProcessPoolExecutor initializer.
+    """
+    global _api
+    if _api is None:
+        os.environ[WORKER_ENV_FLAG] = '1'
+        import parking_api
+        _api = parking_api
+    return _api
+
+
+def add_scorer_arguments(parser):
+    """--data-dir and --model-dir options of an offline scorer (see apply_scorer_arguments)"""
+    parser.add_argument('--data-dir', default=None, help='Data directory (default: as the API resolves it)')
+    parser.add_argument('--model-dir', default=None, help='Model directory (default: as the API resolves it)')
+
+
+def apply_scorer_arguments(args):
+    """Point parking_api at the parsed directories; call before any scoring process starts"""
+    # Scoring processes inherit these, and parking_api reads them when it is imported
+    if args.data_dir:
+        os.environ['COUGARPARK_DATA_DIR'] = os.path.abspath(args.data_dir)
+    if args.model_dir:
+        os.environ['COUGARPARK_MODEL_DIR'] = os.path.abspath(args.model_dir)
+
+
+def _init_worker(started=None):
+    """Load models, data and feature engineers once per worker"""
+    global _api
+
+    # Hold every worker here until all of them exist: no task can finish, so
+    # the executor spawns one process per warm-up task while the flag is set
+    if started is not None:
+        started.wait()
+
+    # When the API runs as a script, spawn re-imports it as __mp_main__ before
+    # this initializer runs; reuse that copy instead of loading everything twice
+    main_module = sys.modules.get('__mp_main__')
+    if main_module is not None and hasattr(main_module, 'score_rows_local'):
+        _api = main_module
+    else:
+        import parking_api
+        _api = parking_api
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _score_chunk(kind, keys, key_codes, timestamps_ns, on_error, overrides=None, history_mark=0):
+    """Worker task: rebuild the (key, datetime) rows from compact arrays and score them"""
+    import pandas as pd
+
+    # Apply history records the parent ingested since this worker last looked
+    if history_mark:
+        _api.sync_history(history_mark)
+
+    row_keys = [keys[code] for code in key_codes]
+    dts = pd.to_datetime(timestamps_ns)
+    scores = _api.score_rows_local(kind, row_keys, dts, on_error=on_error, overrides=overrides)
+    return np.asarray(scores, dtype=np.float32)
+
+
+class ProcessPoolBackend:
+    """
+    Pool of pre-warmed worker processes that build features and score batches
+
+    Feature construction is pure Python/pandas and holds the GIL, so batches are
+    split into chunks and sent to separate processes. Each task ships a list of
+    distinct zone/lot keys, int32 codes into it and int64 nanosecond timestamps,
+    and gets back a float32 array of scores. task_timeout_s bounds a whole
+    batch, not each of its chunks.
+    """
+
+    def __init__(self, workers=None, task_timeout_s=30.0, chunk_size=256, worker_env=None):
+        self.workers = int(workers or os.cpu_count() or 1)
+        # Extra environment for the workers only, e.g. the model directory to load
+        self.worker_env = dict(worker_env or {})
+        self.task_timeout_s = float(task_timeout_s)
+        self.chunk_size = max(1, int(chunk_size))
+
+        self.tasks_submitted = 0
+        self.tasks_timed_out = 0
+        self.rows_scored = 0
+        # Newest history update in the parent (see DropDirectoryWatcher); workers
+        # catch up to it before scoring instead of being restarted
+        self.history_mark = 0
+
+        self._executor = None
+        self.start()
+
+    def start(self):
+        """Start the workers and block until every one has loaded its models"""
+        # Children read the flag from the environment they inherit at spawn
+        # time, before they import anything. The parent keeps calling
+        # is_pool_worker() after this (admission, watchers, warm-up), so the
+        # flag is removed again as soon as every worker process exists.
+        context = multiprocessing.get_context('spawn')
+        started = context.Barrier(self.workers)
+        worker_env = dict(self.worker_env, **{WORKER_ENV_FLAG: '1'})
+        with _spawn_lock:
+            previous = {name: os.environ.get(name) for name in worker_env}
+            os.environ.update(worker_env)
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(started,)
+                )
+                warm = [self._executor.submit(_warm_up) for _ in range(self.workers)]
+            finally:
+                for name, value in previous.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+        return {f.result() for f in warm}
+
+    def restart(self, worker_env=None):
+        """Replace all workers, e.g. after the models change on disk (worker_env updates their environment)"""
+        # The new workers are warm before the old pool is retired; tasks already
+        # running on the old workers finish there instead of being cancelled
+        old_executor = self._executor
+        if worker_env:
+            self.worker_env.update(worker_env)
+        self.start()
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def score(self, kind, row_keys, dts, on_error='raise', overrides=None):
+        """Score (key, datetime) rows across the pool, returns a float32 array in input order"""
+        keys = list(dict.fromkeys(row_keys))
+        key_index = {key: i for i, key in enumerate(keys)}
+        key_codes = np.fromiter((key_index[k] for k in row_keys), dtype=np.int32, count=len(row_keys))
+        timestamps_ns = np.asarray(dts, dtype='datetime64[ns]').astype(np.int64)
+
+        futures = []
+        for start in range(0, len(key_codes), self.chunk_size):
+            stop = start + self.chunk_size
+            futures.append(self._executor.submit(
+                _score_chunk, kind, keys, key_codes[start:stop], timestamps_ns[start:stop], on_error, overrides,
+                self.history_mark
+            ))
+        self.tasks_submitted += len(futures)
+
+        # One deadline for the whole batch, however many chunks it was split into
+        _, not_done = wait(futures, timeout=self.task_timeout_s)
+        if not_done:
+            self.tasks_timed_out += len(not_done)
+            for future in not_done:
+                future.cancel()
+            raise TimeoutError(f"Process pool batch exceeded {self.task_timeout_s}s")
+
+        results = [future.result() for future in futures]
+        self.rows_scored += len(key_codes)
+        return np.concatenate(results) if results else np.empty(0, dtype=np.float32)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'chunk_size': self.chunk_size,
+            'task_timeout_s': self.task_timeout_s,
+            'tasks_submitted': self.tasks_submitted,
+            'tasks_timed_out': self.tasks_timed_out,
+            'rows_scored': self.rows_scored
+        }
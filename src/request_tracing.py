@@ -0,0 +1,142 @@
+"""Opt-in per-request tracing: Server-Timing headers and slow-request capture"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+# Stages rolled up into each Server-Timing entry. Stages nest (the history
+# filters run inside create_features, lot_date_features inside
+# create_lot_level_features), so only top-level stages are summed.
+SERVER_TIMING_GROUPS = {
+    'feature_build': ('create_features', 'create_lot_level_features', 'features_to_array'),
+    'model': ('model_inference',),
+    'pool': ('process_pool',),
+    'serialization': ('json_serialization',)
+}
+
+_current_trace = contextvars.ContextVar('cougarpark_request_trace', default=None)
+
+
+class RequestTrace:
+    """Stage timings and model inputs collected while handling one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}  # stage -> total seconds
+        self.features = []  # {'model': name, 'columns': [...], 'rows': [[...], ...]}
+
+    def add_stage(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_features(self, model_name, features_df):
+        self.features.append({
+            'model': model_name,
+            'columns': [str(c) for c in features_df.columns],
+            'rows': features_df.astype(object).values.tolist()
+        })
+
+    def stage_ms(self):
+        return {stage: round(seconds * 1000.0, 3) for stage, seconds in sorted(self.stages.items())}
+
+    def server_timing(self, total_seconds):
+        """Server-Timing header value (durations in milliseconds)"""
+        entries = []
+        for name, stages in SERVER_TIMING_GROUPS.items():
+            seconds = sum(self.stages.get(stage, 0.0) for stage in stages)
+            if seconds > 0:
+                entries.append(f'{name};dur={seconds * 1000.0:.2f}')
+        entries.append(f'total;dur={total_seconds * 1000.0:.2f}')
+        return ', '.join(entries)
+
+
+def current_trace():
+    """Trace of the request being handled on this thread, or None when tracing is off"""
+    return _current_trace.get()
+
+
+def record_stage(stage, seconds):
+    """Stage listener for metrics.stage_timer: adds the timing to the active trace"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+
+
+def record_features(model_name, features_df):
+    """Keep the exact feature rows sent to a model, if this request is traced"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_features(model_name, features_df)
+
+
+class RequestTracer:
+    """
+    Starts a trace per request and, when it finishes, adds a Server-Timing
+    header and writes requests slower than slow_request_ms to a rotating log
+    of JSON lines (input, feature vectors and stage timings) for replay.
+    """
+
+    def __init__(self, enabled=False, server_timing=True, slow_request_ms=None,
+                 slow_log_path=None, max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.enabled = enabled
+        self.server_timing = server_timing
+        self.slow_request_ms = slow_request_ms
+        self.slow_requests_logged = 0
+        self._local = threading.local()
+
+        self._slow_log = None
+        if enabled and slow_log_path and slow_request_ms is not None:
+            os.makedirs(os.path.dirname(slow_log_path) or '.', exist_ok=True)
+            self._slow_log = logging.getLogger('cougarpark.slow_requests')
+            self._slow_log.setLevel(logging.INFO)
+            self._slow_log.propagate = False
+            handler = RotatingFileHandler(slow_log_path, maxBytes=max_bytes, backupCount=backup_count)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._slow_log.addHandler(handler)
+
+    def begin(self):
+        if not self.enabled:
+            return None
+        trace = RequestTrace()
+        self._local.token = _current_trace.set(trace)
+        return trace
+
+    def finish(self, response, method, path, body):
+        """Close the active trace; returns it so callers (e.g. replay) can inspect it"""
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+
+        token = getattr(self._local, 'token', None)
+        if token is not None:
+            _current_trace.reset(token)
+            self._local.token = None
+        self._local.last_trace = trace
+
+        total_seconds = time.perf_counter() - trace.start
+        if self.server_timing:
+            response.headers['Server-Timing'] = trace.server_timing(total_seconds)
+
+        total_ms = total_seconds * 1000.0
+        if self._slow_log is not None and total_ms >= self.slow_request_ms:
+            self.slow_requests_logged += 1
+            self._slow_log.info(json.dumps({
+                'timestamp': datetime.now().isoformat(),
+                'method': method,
+                'path': path,
+                'body': body,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 3),
+                'stages_ms': trace.stage_ms(),
+                'features': trace.features
+            }, default=str))
+
+        return trace
+
+    def last_trace(self):
+        """Most recent finished trace on this thread"""
+        return getattr(self._local, 'last_trace', None)
@@ -0,0 +1,150 @@
+"""Precomputed enforcement risk heatmap (zone x calendar state x day of week x hour)"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+CALENDAR_FLAGS = ['is_dead_week', 'is_finals_week', 'is_spring_break',
+                  'is_thanksgiving_break', 'is_winter_break', 'is_any_break']
+
+# Feature overrides for each calendar state; flags not listed are set to 0
+CALENDAR_STATES = {
+    'normal': {},
+    'finals': {'is_finals_week': 1},
+    'break': {'is_spring_break': 1, 'is_any_break': 1}
+}
+
+
+def calendar_state(date_features):
+    """Heatmap calendar state of a date, from its calendar feature flags"""
+    if date_features.get('is_finals_week'):
+        return 'finals'
+    if date_features.get('is_any_break'):
+        return 'break'
+    return 'normal'
+
+
+def calendar_state_overrides(state):
+    overrides = {flag: 0 for flag in CALENDAR_FLAGS}
+    overrides.update(CALENDAR_STATES[state])
+    return overrides
+
+
+class RiskHeatmap:
+    """
+    Enforcement risk for every zone over a representative week, per calendar state
+
+    build_fn() returns (zones, risks) where risks is a float32 array shaped
+    (len(zones), len(CALENDAR_STATES), 7, 24). Builds run in a background
+    thread and the finished snapshot replaces the previous one in a single
+    assignment, so readers always see a complete heatmap. Refresh requests that
+    arrive during a build, or sooner than min_refresh_interval_s after the last
+    one, are folded into one follow-up build.
+    """
+
+    def __init__(self, build_fn, min_refresh_interval_s=300.0):
+        self.build_fn = build_fn
+        self.min_refresh_interval_s = float(min_refresh_interval_s)
+        self.states = list(CALENDAR_STATES)
+
+        self.builds = 0
+        self.build_failures = 0
+        self.last_error = None
+
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending = False
+        self._last_build_started = 0.0
+
+    def refresh_async(self):
+        """Schedule a rebuild (coalesced with any build already running or queued)"""
+        with self._lock:
+            self._pending = True
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='risk-heatmap', daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    # Cleared under the lock, so a refresh_async from now on starts a new thread
+                    self._thread = None
+                    return
+                self._pending = False
+            delay = self._last_build_started + self.min_refresh_interval_s - time.monotonic()
+            if self.builds and delay > 0:
+                time.sleep(delay)
+            self.build()
+
+    def build(self):
+        """Build the heatmap in the calling thread; returns True on success"""
+        self._last_build_started = time.monotonic()
+        start = time.perf_counter()
+        try:
+            zones, risks = self.build_fn()
+        except Exception as e:
+            self.build_failures += 1
+            self.last_error = str(e)
+            print(f"Warning: risk heatmap build failed: {e}")
+            return False
+
+        risks = np.ascontiguousarray(np.clip(risks, 0.0, 1.0), dtype=np.float32)
+        etag = hashlib.sha1(risks.tobytes() + '\n'.join(zones).encode('utf-8')).hexdigest()[:20]
+        self._snapshot = {
+            'zones': list(zones),
+            'zone_index': {zone: i for i, zone in enumerate(zones)},
+            'risks': risks,
+            'etag': etag,
+            'built_at': datetime.now().isoformat(),
+            'build_seconds': round(time.perf_counter() - start, 3)
+        }
+        self.builds += 1
+        self.last_error = None
+        print(f"Risk heatmap built for {len(zones)} zones in {self._snapshot['build_seconds']}s")
+        return True
+
+    def restore(self, snapshot):
+        """Install a snapshot saved by an earlier process (see snapshot()) without rebuilding"""
+        self._snapshot = snapshot
+        print(f"Risk heatmap restored for {len(snapshot['zones'])} zones (built {snapshot['built_at']})")
+
+    def snapshot(self):
+        """Current heatmap dict (zones, risks array, etag, ...) or None before the first build"""
+        return self._snapshot
+
+    def lookup(self, zone, state, day_of_week, hour):
+        """Risk for one cell, None when the zone or state is not in the heatmap"""
+        snapshot = self._snapshot
+        if snapshot is None or state not in CALENDAR_STATES:
+            return None
+        zone_i = snapshot['zone_index'].get(zone)
+        if zone_i is None:
+            return None
+        return float(snapshot['risks'][zone_i, self.states.index(state), day_of_week, hour])
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'ready': snapshot is not None,
+            'zones': len(snapshot['zones']) if snapshot else 0,
+            'etag': snapshot['etag'] if snapshot else None,
+            'built_at': snapshot['built_at'] if snapshot else None,
+            'build_seconds': snapshot['build_seconds'] if snapshot else None,
+            'builds': self.builds,
+            'build_failures': self.build_failures,
+            'last_error': self.last_error,
+            'refresh_pending': self._pending
+        }
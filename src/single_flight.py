@@ -0,0 +1,75 @@
+"""Single-flight deduplication of identical in-flight computations"""
+
+import threading
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run a computation once per key while concurrent duplicates share its result
+
+    The first caller for a key computes; anyone asking for the same key before
+    it finishes blocks and receives the same result (or exception). Nothing is
+    retained after the call completes, so this works with or without a cache.
+    Shared results must be treated as read-only by callers.
+    """
+
+    def __init__(self, name='single_flight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        self.executed = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key, fn):
+        """Return fn(), computed at most once across concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self):
+        """Counters for executed vs coalesced calls"""
+        total = self.executed + self.coalesced
+        return {
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'in_flight': len(self._calls),
+            'coalesced_ratio': round(self.coalesced / total, 4) if total else 0.0
+        }
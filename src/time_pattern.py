@@ -0,0 +1,133 @@
+"""Calendar-aware time-pattern occupancy estimates for lots without a model"""
+
+import numpy as np
+import pandas as pd
+
+# Session state of a date, from the academic calendar
+SESSION_STATES = ['in_session', 'summer', 'break']
+IN_SESSION, SUMMER, BREAK = range(len(SESSION_STATES))
+
+BREAK_EVENTS = ['Spring_Break', 'Thanksgiving_Break', 'Winter_Break']
+
+# Index 1 is used for 'Paid' lots, anything else (Permit, missing, ...) uses 0
+ZONE_TYPES = ['Permit', 'Paid']
+PAID_OCCUPANCY_FACTOR = 0.8  # Paid lots typically less full
+
+# Share of capacity occupied: (weekday rates, weekend rates), each a list of
+# (first hour, last hour, rate) bands over a default rate
+SESSION_RATES = {
+    # Weekdays during semester: high occupancy (55% peak, 35% shoulder, 15% off hours);
+    # weekends during semester: low occupancy (20% during day, 10% off hours)
+    'in_session': (([(8, 17, 0.55), (7, 7, 0.35), (18, 19, 0.35)], 0.15),
+                   ([(9, 17, 0.20)], 0.10)),
+    # Summer session and breaks: very low occupancy (5% during day, 1% off hours, 2% weekends)
+    'summer': (([(8, 17, 0.05)], 0.01), ([], 0.02)),
+    'break': (([(8, 17, 0.05)], 0.01), ([], 0.02))
+}
+
+
+def build_rate_table(session_rates=SESSION_RATES, paid_factor=PAID_OCCUPANCY_FACTOR):
+    """Occupancy rate array indexed by (session state, day of week, hour, zone type)"""
+    table = np.zeros((len(SESSION_STATES), 7, 24, len(ZONE_TYPES)))
+    for state, (weekday, weekend) in session_rates.items():
+        for days, (bands, default) in ((slice(0, 5), weekday), (slice(5, 7), weekend)):
+            hourly = np.full(24, default)
+            for first, last, rate in bands:
+                hourly[first:last + 1] = rate
+            table[SESSION_STATES.index(state), days, :, 0] = hourly
+    table[..., 1] = table[..., 0] * paid_factor
+    return table
+
+
+def zone_type_codes(zone_types):
+    return (np.asarray(zone_types, dtype=object) == 'Paid').astype(np.intp)
+
+
+def _naive_index(dts):
+    index = pd.DatetimeIndex(np.ravel(np.asarray(dts, dtype=object)))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index
+
+
+class TimePatternEstimator:
+    """
+    Occupancy estimates from typical campus parking patterns (no model)
+
+    Session state comes from a day-by-day index over the academic calendar:
+    break events mark 'break', Summer semesters 'summer', other semesters
+    'in_session', and days between semesters count as breaks. Dates outside
+    the calendar use the same month and day of its last fully covered year.
+    Every method takes arrays of timestamps and broadcasts against arrays of
+    lots, e.g. capacities[:, None] with dts[None, :] for lots x hours.
+    """
+
+    def __init__(self, calendar_df, rate_table=None):
+        self.rate_table = build_rate_table() if rate_table is None else rate_table
+        self._build_session_index(calendar_df)
+
+    def _build_session_index(self, calendar_df):
+        starts = pd.to_datetime(calendar_df['Start_Date']).values.astype('datetime64[D]').astype(np.int64)
+        ends = pd.to_datetime(calendar_df['End_Date']).values.astype('datetime64[D]').astype(np.int64)
+        event_types = calendar_df['Event_Type'].to_numpy()
+        semesters = calendar_df['Semester'].to_numpy() if 'Semester' in calendar_df.columns else None
+
+        self.first_day = int(starts.min())
+        self.last_day = int(ends.max())
+        has_semesters = (event_types == 'Semester').any()
+        codes = np.full(self.last_day - self.first_day + 1, BREAK if has_semesters else IN_SESSION, dtype=np.int8)
+
+        # Semesters first, so breaks inside them take precedence
+        for i in np.flatnonzero(event_types == 'Semester'):
+            state = SUMMER if semesters is not None and semesters[i] == 'Summer' else IN_SESSION
+            codes[starts[i] - self.first_day:ends[i] - self.first_day + 1] = state
+        for i in np.flatnonzero(np.isin(event_types, BREAK_EVENTS)):
+            codes[starts[i] - self.first_day:ends[i] - self.first_day + 1] = BREAK
+        self.session_codes = codes
+
+        first = pd.Timestamp(self.first_day, unit='D')
+        last = pd.Timestamp(self.last_day, unit='D')
+        self.reference_year = last.year if (last.month, last.day) == (12, 31) else last.year - 1
+        if self.reference_year < first.year or (self.reference_year == first.year and (first.month, first.day) != (1, 1)):
+            self.reference_year = None
+
+    def _calendar_days(self, index):
+        days = index.values.astype('datetime64[D]').astype(np.int64)
+        outside = (days < self.first_day) | (days > self.last_day)
+        if outside.any() and self.reference_year is not None:
+            # Same month and day in the reference year (Feb 29 -> Feb 28 in common years)
+            months, month_days = index.month[outside], index.day[outside].to_numpy().copy()
+            if not pd.Timestamp(self.reference_year, 12, 31).is_leap_year:
+                month_days[(months == 2) & (month_days == 29)] = 28
+            shifted = pd.to_datetime(pd.DataFrame({
+                'year': np.full(len(months), self.reference_year), 'month': months, 'day': month_days
+            }))
+            days[outside] = shifted.values.astype('datetime64[D]').astype(np.int64)
+        return np.clip(days, self.first_day, self.last_day)
+
+    def session_states(self, dts):
+        """Session state code (index into SESSION_STATES) of each timestamp"""
+        index = _naive_index(dts)
+        codes = self.session_codes[self._calendar_days(index) - self.first_day]
+        return codes.reshape(np.shape(dts))
+
+    def rates(self, zone_types, dts):
+        """Share of capacity occupied for zone types broadcast against timestamps"""
+        index = _naive_index(dts)
+        shape = np.shape(dts)
+        states = self.session_codes[self._calendar_days(index) - self.first_day].reshape(shape)
+        days_of_week = index.dayofweek.to_numpy().reshape(shape)
+        hours = index.hour.to_numpy().reshape(shape)
+        return self.rate_table[states, days_of_week, hours, zone_type_codes(zone_types)]
+
+    def occupancy(self, capacities, zone_types, dts):
+        """Estimated occupied spaces, broadcasting capacities and zone types against timestamps"""
+        return np.asarray(capacities, dtype=np.float64) * self.rates(zone_types, dts)
+
+    def stats(self):
+        return {
+            'calendar_start': str(pd.Timestamp(self.first_day, unit='D').date()),
+            'calendar_end': str(pd.Timestamp(self.last_day, unit='D').date()),
+            'reference_year': self.reference_year,
+            'session_days': {state: int((self.session_codes == i).sum()) for i, state in enumerate(SESSION_STATES)}
+        }
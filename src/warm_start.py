@@ -0,0 +1,158 @@
+"""Warm-start snapshot of the structures derived from data files and models at startup"""
+
+import json
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def file_fingerprint(paths):
+    """(file name, size, mtime) of every path that exists"""
+    entries = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            entries.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return entries
+
+
+def _normalize(fingerprint):
+    # Tuples and lists compare equal once both have been through JSON
+    return json.loads(json.dumps(fingerprint, default=str))
+
+
+class WarmStartSnapshot:
+    """
+    Directory holding one snapshot, valid only for the fingerprint it was saved with
+
+    Small structures (dicts, lookup tables, index positions) are pickled
+    together. Each history frame is stored column by column as .npy files that
+    are memory-mapped on load, so a start from the snapshot touches only the
+    pages it reads and pool workers on the same host share them. Categorical
+    columns are stored as codes with their categories pickled.
+    """
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        self.loaded = False
+        self.load_seconds = None
+        self.saved_at = None
+        self.save_seconds = None
+        self.last_error = None
+        self.miss_reason = None
+
+    def load(self, fingerprint):
+        """(objects, frames) when a snapshot with this fingerprint exists, else None"""
+        manifest_path = os.path.join(self.snapshot_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            self.miss_reason = 'missing'
+            return None
+
+        start = time.perf_counter()
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') != SNAPSHOT_VERSION:
+                self.miss_reason = 'version'
+                return None
+            if manifest.get('fingerprint') != _normalize(fingerprint):
+                self.miss_reason = 'fingerprint'
+                return None
+
+            with open(os.path.join(self.snapshot_dir, 'objects.pkl'), 'rb') as f:
+                objects = pickle.load(f)
+            frames = {name: self._load_frame(name, spec) for name, spec in manifest['frames'].items()}
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError) as e:
+            self.miss_reason = 'unreadable'
+            self.last_error = str(e)
+            print(f"Warning: could not load warm-start snapshot from {self.snapshot_dir}: {e}")
+            return None
+
+        self.loaded = True
+        self.miss_reason = None
+        self.saved_at = manifest.get('saved_at')
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        return objects, frames
+
+    def _load_frame(self, name, spec):
+        columns = {}
+        for col in spec['columns']:
+            values = np.load(os.path.join(self.snapshot_dir, f"{name}.{col}.npy"), mmap_mode='c')
+            if col in spec['categories']:
+                values = pd.Categorical.from_codes(values, categories=spec['categories'][col])
+            columns[col] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def save(self, fingerprint, objects, frames):
+        """
+        Write a new snapshot next to the current one, then swap it in
+
+        objects must be picklable; frames maps name -> DataFrame of numeric,
+        datetime or categorical columns.
+        """
+        start = time.perf_counter()
+        tmp_dir = f'{self.snapshot_dir}.{os.getpid()}.tmp'
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            with open(os.path.join(tmp_dir, 'objects.pkl'), 'wb') as f:
+                pickle.dump(objects, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            frame_specs = {}
+            for name, frame in frames.items():
+                spec = {'columns': list(frame.columns), 'categories': {}}
+                for col in frame.columns:
+                    series = frame[col]
+                    if isinstance(series.dtype, pd.CategoricalDtype):
+                        spec['categories'][col] = list(series.cat.categories)
+                        values = series.cat.codes.to_numpy()
+                    else:
+                        values = series.to_numpy()
+                    np.save(os.path.join(tmp_dir, f"{name}.{col}.npy"), values, allow_pickle=False)
+                frame_specs[name] = spec
+
+            manifest = {
+                'version': SNAPSHOT_VERSION,
+                'fingerprint': _normalize(fingerprint),
+                'saved_at': datetime.now().isoformat(),
+                'frames': frame_specs
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+                f.write(json.dumps(manifest, indent=2, default=str) + '\n')
+
+            # Readers only ever open a complete directory; the old one is
+            # removed after the new one is in place
+            old_dir = f'{self.snapshot_dir}.{os.getpid()}.old'
+            if os.path.exists(self.snapshot_dir):
+                os.replace(self.snapshot_dir, old_dir)
+            os.replace(tmp_dir, self.snapshot_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        except (OSError, TypeError, ValueError, pickle.PicklingError) as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            self.last_error = str(e)
+            print(f"Warning: could not save warm-start snapshot to {self.snapshot_dir}: {e}")
+            return False
+
+        self.saved_at = manifest['saved_at']
+        self.save_seconds = round(time.perf_counter() - start, 3)
+        print(f"Warm-start snapshot saved to {self.snapshot_dir} in {self.save_seconds}s")
+        return True
+
+    def stats(self):
+        return {
+            'snapshot_dir': self.snapshot_dir,
+            'loaded': self.loaded,
+            'miss_reason': self.miss_reason,
+            'load_seconds': self.load_seconds,
+            'saved_at': self.saved_at,
+            'save_seconds': self.save_seconds,
+            'last_error': self.last_error
+        }